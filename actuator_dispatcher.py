@@ -0,0 +1,283 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from latency_metrics import LatencyHistogram
+
+# Batas laju default per perangkat: (token per detik, kapasitas burst)
+DEFAULT_RATE_LIMIT = (2.0, 4)
+
+# Batas waktu default satu perangkat dalam perintah grup (detik)
+GROUP_TIMEOUT = 3.0
+
+# Jumlah panggilan perangkat paralel untuk perintah grup
+GROUP_WORKERS = 64
+
+
+class _TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now):
+        """Ambil satu token; kembalikan 0 jika berhasil, atau detik sampai token tersedia"""
+        self._refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class _Command:
+    __slots__ = ("device", "action", "args", "submitted_ns", "origin_ns", "merged")
+
+    def __init__(self, device, action, args, origin_ns):
+        self.device = device
+        self.action = action
+        self.args = args
+        self.submitted_ns = time.perf_counter_ns()
+        self.origin_ns = origin_ns
+        self.merged = 0
+
+    @property
+    def key(self):
+        return self.action, self.args
+
+
+class ActuatorDispatcher:
+    """Antrean perintah aktuator dengan de-duplikasi dan batas laju per perangkat
+
+    `submit` tidak pernah memanggil perangkat secara langsung: perintah
+    masuk antrean FIFO per perangkat dan dijalankan oleh satu thread worker.
+    Perintah yang sama dengan perintah terakhir perangkat itu (masih antre
+    atau baru dijalankan dalam `dedup_window` detik) digabung. Latensi
+    submit sampai perangkat selesai (ack) dicatat per aksi.
+    """
+
+    def __init__(self, devices, dedup_window=1.0, rate_limits=None, latency=None):
+        self.devices = devices
+        self.dedup_window = dedup_window
+        self.rate_limits = rate_limits or {}
+        self.latency = latency
+        self.queues = {}
+        self.buckets = {}
+        self.last_executed = {}
+        self.ack_latency = {}
+        self.stats_counts = {"submitted": 0, "merged": 0, "rate_limited": 0, "executed": 0,
+                             "errors": 0}
+        # Panggilan grup yang melewati timeout tetapi masih menempati thread GROUP_WORKERS
+        self.hung_calls = 0
+        self._schedule = []
+        self._scheduled = set()
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._running = True
+        self._idle = threading.Event()
+        self._idle.set()
+        self._group_pool = ThreadPoolExecutor(max_workers=GROUP_WORKERS, thread_name_prefix="actuator-group")
+        self._group_collector = ThreadPoolExecutor(max_workers=1, thread_name_prefix="actuator-collector")
+        self._thread = threading.Thread(target=self._run, name="actuator-dispatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, device, action, *args, origin_ns=None):
+        """Masukkan perintah `devices.<action>(*args)` untuk perangkat; tidak memblokir
+
+        `origin_ns` (perf_counter_ns saat sensor dibaca) opsional untuk
+        mencatat latensi sensor-ke-aktuator. Mengembalikan False jika
+        perintah digabung dengan perintah yang sama.
+        """
+        with self._condition:
+            self.stats_counts["submitted"] += 1
+            queue = self.queues.setdefault(device, deque())
+            key = (action, args)
+            last = queue[-1] if queue else None
+            if last is not None and last.key == key:
+                last.merged += 1
+                self.stats_counts["merged"] += 1
+                return False
+            if last is None:
+                executed = self.last_executed.get(device)
+                if (executed is not None and executed[0] == key
+                        and time.monotonic() - executed[1] < self.dedup_window):
+                    self.stats_counts["merged"] += 1
+                    return False
+
+            queue.append(_Command(device, action, args, origin_ns))
+            self._idle.clear()
+            if device not in self._scheduled:
+                self._push(device, time.monotonic())
+            self._condition.notify()
+            return True
+
+    def _push(self, device, due):
+        self._scheduled.add(device)
+        heapq.heappush(self._schedule, (due, next(self._seq), device))
+
+    def _bucket(self, device):
+        bucket = self.buckets.get(device)
+        if bucket is None:
+            rate, burst = self.rate_limits.get(device, DEFAULT_RATE_LIMIT)
+            bucket = self.buckets[device] = _TokenBucket(rate, burst)
+        return bucket
+
+    def _next_command(self):
+        """Tunggu sampai ada perangkat yang jatuh tempo dan punya token"""
+        with self._condition:
+            while self._running:
+                if not self._schedule:
+                    self._idle.set()
+                    self._condition.wait()
+                    continue
+                due, _, device = self._schedule[0]
+                now = time.monotonic()
+                if due > now:
+                    self._condition.wait(due - now)
+                    continue
+                heapq.heappop(self._schedule)
+                wait = self._bucket(device).take(now)
+                if wait > 0:
+                    self.stats_counts["rate_limited"] += 1
+                    heapq.heappush(self._schedule, (now + wait, next(self._seq), device))
+                    continue
+                command = self.queues[device].popleft()
+                self.last_executed[device] = (command.key, now)
+                if self.queues[device]:
+                    heapq.heappush(self._schedule, (now, next(self._seq), device))
+                else:
+                    self._scheduled.discard(device)
+                return command
+            return None
+
+    def _run(self):
+        while True:
+            command = self._next_command()
+            if command is None:
+                return
+            try:
+                getattr(self.devices, command.action)(*command.args)
+                status = "executed"
+            except Exception as e:
+                status = "errors"
+                print(f"Error dalam perintah aktuator {command.device}.{command.action}: {str(e)}")
+            ack_ns = time.perf_counter_ns()
+
+            with self._condition:
+                self.stats_counts[status] += 1
+                histogram = self.ack_latency.get(command.action)
+                if histogram is None:
+                    histogram = self.ack_latency[command.action] = LatencyHistogram()
+            histogram.record_ns(ack_ns - command.submitted_ns)
+            if self.latency is not None:
+                self.latency.record("actuator_ack", ack_ns - command.submitted_ns)
+                if command.origin_ns is not None and command.action == "trigger_alarm":
+                    self.latency.record("sensor_to_alarm", ack_ns - command.origin_ns)
+
+    def submit_group(self, action, targets, timeout=GROUP_TIMEOUT, label=None):
+        """Jalankan `devices.<action>(target)` untuk banyak perangkat sekaligus; tidak memblokir
+
+        Semua panggilan berjalan paralel sehingga durasi grup kira-kira sama
+        dengan perangkat paling lambat. Perangkat yang belum selesai dalam
+        `timeout` detik dicatat sebagai timeout; panggilan yang sudah berjalan
+        tidak bisa dibatalkan, jadi dihitung di `hung_calls` sampai selesai.
+        Status gabungan dikembalikan lewat Future; pemanggil yang perlu
+        hasilnya memasang `add_done_callback`.
+        """
+        targets = list(targets)
+        method = getattr(self.devices, action, None)
+        with self._condition:
+            self.stats_counts["submitted"] += len(targets)
+        return self._group_collector.submit(
+            self._run_group, label or action, action, method, targets, timeout, time.perf_counter_ns())
+
+    def _call_device(self, method, target):
+        start_ns = time.perf_counter_ns()
+        method(target)
+        return time.perf_counter_ns() - start_ns
+
+    def _release_hung(self, future):
+        with self._condition:
+            self.hung_calls -= 1
+
+    def _run_group(self, label, action, method, targets, timeout, submitted_ns):
+        results = {}
+        hung = 0
+        if method is None:
+            results = {target: {"status": "unsupported", "ms": 0.0} for target in targets}
+        else:
+            futures = {self._group_pool.submit(self._call_device, method, target): target
+                       for target in targets}
+            wait(futures, timeout=timeout)
+            for future, target in futures.items():
+                if not future.done():
+                    if not future.cancel() and not future.done():
+                        # Sudah berjalan: thread worker tetap terpakai sampai perangkat kembali
+                        with self._condition:
+                            self.hung_calls += 1
+                        future.add_done_callback(self._release_hung)
+                        hung += 1
+                    results[target] = {"status": "timeout", "ms": timeout * 1000.0}
+                elif future.exception() is not None:
+                    print(f"Error dalam perintah aktuator {target}.{action}: {str(future.exception())}")
+                    results[target] = {"status": "error", "ms": 0.0}
+                else:
+                    results[target] = {"status": "ok", "ms": future.result() / 1e6}
+        total_ns = time.perf_counter_ns() - submitted_ns
+
+        counts = {"ok": 0, "error": 0, "timeout": 0, "unsupported": 0}
+        for result in results.values():
+            counts[result["status"]] += 1
+        slowest = max(results, key=lambda target: results[target]["ms"], default=None)
+        status = {
+            "label": label,
+            "action": action,
+            "targets": len(targets),
+            "succeeded": counts["ok"],
+            "failed": counts["error"],
+            "timed_out": counts["timeout"],
+            "unsupported": counts["unsupported"],
+            "hung": hung,
+            "total_ms": total_ns / 1e6,
+            "slowest": slowest,
+            "slowest_ms": results[slowest]["ms"] if slowest is not None else 0.0,
+            "results": results
+        }
+
+        with self._condition:
+            self.stats_counts["executed"] += counts["ok"]
+            self.stats_counts["errors"] += len(targets) - counts["ok"]
+            histogram = self.ack_latency.get(action)
+            if histogram is None:
+                histogram = self.ack_latency[action] = LatencyHistogram()
+        histogram.record_ns(total_ns)
+        if self.latency is not None:
+            self.latency.record("actuator_ack", total_ns)
+        return status
+
+    def flush(self, timeout=None):
+        """Tunggu sampai semua perintah yang antre selesai dijalankan"""
+        return self._idle.wait(timeout)
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        self._thread.join(timeout=2.0)
+        self._group_collector.shutdown(wait=False)
+        self._group_pool.shutdown(wait=False)
+
+    def stats(self):
+        with self._condition:
+            stats = dict(self.stats_counts)
+            stats["pending"] = sum(len(queue) for queue in self.queues.values())
+            stats["hung_calls"] = self.hung_calls
+        stats["ack_ms"] = {action: histogram.summary() for action, histogram in self.ack_latency.items()}
+        return stats
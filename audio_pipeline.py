@@ -0,0 +1,340 @@
+import threading
+import time
+import wave
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+CHUNK_SIZE = 1024  # 64 ms pada 16 kHz
+N_MELS = 32
+
+# Pita frekuensi untuk energi per pita (Hz)
+BANDS = [
+    ("rendah", 0, 300),
+    ("suara", 300, 3400),
+    ("tinggi", 3400, 8000),
+]
+
+# Konversi dBFS ke perkiraan dB SPL (kalibrasi mikrofon default)
+SPL_OFFSET_DB = 100.0
+
+# Gate energi: chunk diproses penuh bila melebihi noise floor + margin (dB)
+GATE_MARGIN_DB = 10.0
+
+# Kategori suara, sesuai tabel analisis audio
+SOUND_TYPES = ["Normal", "Percakapan", "Langkah Kaki", "Tabrakan", "Teriakan"]
+THREAT_SOUNDS = {"Tabrakan", "Teriakan"}
+
+
+def _severity(event):
+    """Urutan kejadian: suara ancaman lebih dulu, lalu level tertinggi"""
+    return event["type"] in THREAT_SOUNDS, event["level_db"]
+
+
+def mel_filterbank(sample_rate, n_fft, n_mels=N_MELS):
+    """Matriks filter mel segitiga (n_mels, n_fft // 2 + 1)"""
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    edges = mel_to_hz(np.linspace(0, hz_to_mel(sample_rate / 2), n_mels + 2))
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (freqs[None, :] - lower) / (center - lower)
+    falling = (upper - freqs[None, :]) / (upper - center)
+    return np.clip(np.minimum(rising, falling), 0, None).astype(np.float32)
+
+
+class AudioFeatureExtractor:
+    """Ekstraksi fitur audio secara batch untuk banyak chunk sekaligus
+
+    Tahap murah (RMS/dBFS, zero-crossing, crest factor) dihitung untuk semua
+    chunk; FFT, energi pita, log-mel dan klasifikasi hanya untuk chunk yang
+    lolos gate energi.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, chunk_size=CHUNK_SIZE, n_mels=N_MELS):
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.window = np.hanning(chunk_size).astype(np.float32)
+        self.freqs = np.fft.rfftfreq(chunk_size, 1.0 / sample_rate).astype(np.float32)
+        self.band_matrix = np.array([
+            (self.freqs >= low) & (self.freqs < high) for name, low, high in BANDS
+        ], dtype=np.float32)
+        self.mel_matrix = mel_filterbank(sample_rate, chunk_size, n_mels)
+
+    def cheap_features(self, chunks):
+        """Fitur murah untuk batch (B, N): dBFS, zero-crossing rate, crest factor"""
+        rms = np.sqrt(np.mean(np.square(chunks), axis=1))
+        dbfs = 20.0 * np.log10(np.maximum(rms, 1e-10))
+        zcr = np.mean(np.signbit(chunks[:, 1:]) != np.signbit(chunks[:, :-1]), axis=1)
+        crest = np.max(np.abs(chunks), axis=1) / np.maximum(rms, 1e-10)
+        return dbfs, zcr, crest
+
+    def spectral_features(self, chunks):
+        """Fitur spektral untuk batch (B, N): centroid, energi pita (dB), log-mel"""
+        power = np.square(np.abs(np.fft.rfft(chunks * self.window, axis=1))).astype(np.float32)
+        total = np.maximum(power.sum(axis=1), 1e-12)
+        centroid = (power @ self.freqs) / total
+        bands_db = 10.0 * np.log10(np.maximum(power @ self.band_matrix.T, 1e-12))
+        log_mel = np.log(power @ self.mel_matrix.T + 1e-10)
+        return centroid, bands_db, log_mel
+
+    def classify(self, dbfs, crest, centroid, bands_db):
+        """Klasifikasi heuristik per chunk ke SOUND_TYPES (vektor indeks)"""
+        voice_dominant = bands_db[:, 1] >= np.maximum(bands_db[:, 0], bands_db[:, 2])
+        impulsive = crest > 6.0
+        loud = dbfs > -20.0
+        types = np.full(len(dbfs), SOUND_TYPES.index("Percakapan"))
+        types[impulsive] = SOUND_TYPES.index("Langkah Kaki")
+        types[impulsive & loud] = SOUND_TYPES.index("Tabrakan")
+        types[voice_dominant & loud & ~impulsive & (centroid > 1000)] = SOUND_TYPES.index("Teriakan")
+        return types
+
+
+class SyntheticAudioSource:
+    """Sumber audio sintetis: derau latar dengan sesekali langkah, benturan atau teriakan"""
+
+    def __init__(self, sample_rate=SAMPLE_RATE, event_probability=0.02, seed=None):
+        self.sample_rate = sample_rate
+        self.event_probability = event_probability
+        self.rng = np.random.default_rng(seed)
+        self.phase = 0
+
+    def read_into(self, out):
+        out[:] = self.rng.normal(0.0, 0.002, len(out))
+        if self.rng.random() < self.event_probability:
+            kind = self.rng.integers(3)
+            if kind == 0:  # Langkah kaki: impuls pelan
+                out[self.rng.integers(len(out))] += 0.05
+            elif kind == 1:  # Benturan: impuls keras pita lebar
+                start = self.rng.integers(len(out) - 32)
+                out[start:start + 32] += self.rng.normal(0, 0.6, 32)
+            else:  # Teriakan: nada tinggi keras
+                t = (np.arange(len(out)) + self.phase) / self.sample_rate
+                out += 0.5 * np.sin(2 * np.pi * 1800 * t)
+        self.phase += len(out)
+        return True
+
+    def close(self):
+        pass
+
+
+class WavFileSource:
+    """Sumber audio dari file WAV PCM 16-bit (kanal pertama), diulang saat habis"""
+
+    def __init__(self, path, sample_rate=SAMPLE_RATE, loop=True):
+        self.path = path
+        self.loop = loop
+        self.wav = wave.open(path, "rb")
+        if self.wav.getsampwidth() != 2:
+            raise RuntimeError(f"Hanya WAV PCM 16-bit yang didukung: {path}")
+        if self.wav.getframerate() != sample_rate:
+            raise RuntimeError(f"Sample rate {path} harus {sample_rate} Hz")
+        self.channels = self.wav.getnchannels()
+
+    def read_into(self, out):
+        data = self.wav.readframes(len(out))
+        if len(data) < len(out) * 2 * self.channels:
+            if not self.loop:
+                return False
+            self.wav.rewind()
+            data = self.wav.readframes(len(out))
+        samples = np.frombuffer(data, dtype="<i2")[::self.channels]
+        out[:len(samples)] = samples
+        out[:len(samples)] /= 32768.0
+        out[len(samples):] = 0.0
+        return True
+
+    def close(self):
+        self.wav.close()
+
+
+class AudioPipeline:
+    """Akuisisi audio banyak mikrofon ke satu ring dan fitur batch per pemrosesan
+
+    Satu thread pembaca mengisi ring (mikrofon, slot, sampel) per periode
+    chunk; `process()` mengambil semua chunk baru dari semua mikrofon sebagai
+    satu matriks dan menghitung fiturnya sekaligus. Mikrofon tanpa sumber
+    nyata tidak diakuisisi (lihat `skipped`) kecuali `synthetic=True`.
+    """
+
+    def __init__(self, microphones, sources=None, synthetic=False, sample_rate=SAMPLE_RATE,
+                 chunk_size=CHUNK_SIZE, ring_chunks=64, level_capacity=4096, spl_offset=SPL_OFFSET_DB):
+        # Mikrofon tanpa sumber nyata dilewati, kecuali sumber sintetis diminta (benchmark/pengujian)
+        sources = sources or {}
+        self.microphones = []
+        self.sources = []
+        self.skipped = []
+        for k, microphone in enumerate(microphones):
+            path = sources.get(microphone)
+            source = None
+            if path:
+                try:
+                    source = WavFileSource(path, sample_rate)
+                except (OSError, RuntimeError, wave.Error) as e:
+                    print(f"Error dalam membuka sumber audio: {str(e)}")
+            if source is None and synthetic:
+                source = SyntheticAudioSource(sample_rate, seed=k)
+            if source is None:
+                self.skipped.append(microphone)
+                continue
+            self.microphones.append(microphone)
+            self.sources.append(source)
+        self.synthetic = np.array([isinstance(source, SyntheticAudioSource) for source in self.sources],
+                                  dtype=bool)
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.spl_offset = spl_offset
+        self.extractor = AudioFeatureExtractor(sample_rate, chunk_size)
+        self.ring = np.zeros((len(self.microphones), ring_chunks, chunk_size), dtype=np.float32)
+        self.ring_times = np.zeros(ring_chunks, dtype=np.float64)
+        self.write_seq = 0
+        self.read_seq = 0
+        self.dropped = 0
+        self.noise_floor = np.full(len(self.microphones), -60.0, dtype=np.float32)
+
+        # Riwayat level (dB) maksimum antar mikrofon per chunk untuk grafik
+        self.level_times = np.zeros(level_capacity, dtype=np.float64)
+        self.levels = np.zeros(level_capacity, dtype=np.float32)
+        self.level_count = 0
+
+        self.chunks_seen = 0
+        self.chunks_analyzed = 0
+        self.latest = {}
+        self.peaks = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._read_loop, name="audio-reader", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        for source in self.sources:
+            source.close()
+
+    def _read_loop(self):
+        interval = self.chunk_size / self.sample_rate
+        next_due = time.perf_counter()
+        while not self._stop_event.is_set():
+            self.read_chunk()
+            next_due += interval
+            delay = next_due - time.perf_counter()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            else:
+                next_due = time.perf_counter()
+
+    def read_chunk(self):
+        """Baca satu chunk dari setiap mikrofon langsung ke slot ring"""
+        capacity = self.ring.shape[1]
+        slot = self.write_seq % capacity
+        with self._lock:
+            if self.write_seq - self.read_seq >= capacity:
+                self.read_seq += 1
+                self.dropped += 1
+        for k, source in enumerate(self.sources):
+            try:
+                if not source.read_into(self.ring[k, slot]):
+                    self.ring[k, slot] = 0.0
+            except Exception as e:
+                print(f"Error pada mikrofon {self.microphones[k]}: {str(e)}")
+                self.ring[k, slot] = 0.0
+        with self._lock:
+            self.ring_times[slot] = time.time()
+            self.write_seq += 1
+
+    def process(self, sink=None):
+        """Hitung fitur semua chunk baru; kembalikan daftar kejadian suara yang lolos gate
+
+        `sink(mikrofon, chunk, timestamp)` opsional menerima setiap chunk mentah,
+        misalnya untuk pre-roll perekam kejadian.
+        """
+        with self._lock:
+            start, end = self.read_seq, self.write_seq
+            self.read_seq = end
+        if end <= start or not self.microphones:
+            return []
+        capacity = self.ring.shape[1]
+        slots = np.arange(start, end) % capacity
+        mics = len(self.microphones)
+        chunks = self.ring[:, slots].reshape(mics * len(slots), self.chunk_size)
+        times = np.tile(self.ring_times[slots], mics)
+        mic_index = np.repeat(np.arange(mics), len(slots))
+        self.chunks_seen += len(chunks)
+        if sink is not None:
+            for chunk, k, timestamp in zip(chunks, mic_index, times):
+                sink(self.microphones[k], chunk, timestamp)
+
+        dbfs, zcr, crest = self.extractor.cheap_features(chunks)
+        self.record_levels(self.ring_times[slots], dbfs.reshape(mics, len(slots)).max(axis=0))
+
+        # Noise floor adaptif per mikrofon dari chunk yang tenang
+        per_mic = dbfs.reshape(mics, len(slots))
+        quiet = per_mic.min(axis=1)
+        self.noise_floor += 0.05 * (np.minimum(quiet, self.noise_floor + 3.0) - self.noise_floor)
+        for k, microphone in enumerate(self.microphones):
+            self.latest[microphone] = {"level_db": float(per_mic[k, -1] + self.spl_offset),
+                                       "timestamp": float(self.ring_times[slots[-1]])}
+
+        gate = dbfs > self.noise_floor[mic_index] + GATE_MARGIN_DB
+        if not gate.any():
+            return []
+        self.chunks_analyzed += int(gate.sum())
+        centroid, bands_db, log_mel = self.extractor.spectral_features(chunks[gate])
+        types = self.extractor.classify(dbfs[gate], crest[gate], centroid, bands_db)
+
+        events = []
+        for i, k in enumerate(mic_index[gate]):
+            event = {
+                "microphone": self.microphones[k],
+                "synthetic": bool(self.synthetic[k]),
+                "timestamp": float(times[gate][i]),
+                "type": SOUND_TYPES[types[i]],
+                "level_db": float(dbfs[gate][i] + self.spl_offset),
+                "centroid_hz": float(centroid[i]),
+                "bands_db": dict(zip([band[0] for band in BANDS], bands_db[i].tolist())),
+                "log_mel": log_mel[i]
+            }
+            events.append(event)
+            peak = self.peaks.get(event["microphone"])
+            if peak is None or _severity(event) > _severity(peak):
+                self.peaks[event["microphone"]] = event
+        return events
+
+    def record_levels(self, timestamps, levels):
+        capacity = len(self.levels)
+        index = np.arange(self.level_count, self.level_count + len(levels)) % capacity
+        self.level_times[index] = timestamps
+        self.levels[index] = levels + self.spl_offset
+        self.level_count += len(levels)
+
+    def level_history(self, points):
+        """(timestamp, level dB) terbaru, paling banyak `points` titik"""
+        count = min(points, self.level_count, len(self.levels))
+        index = np.arange(self.level_count - count, self.level_count) % len(self.levels)
+        return self.level_times[index], self.levels[index]
+
+    def take_summary(self):
+        """Ringkasan per mikrofon sejak panggilan terakhir: level terbaru dan kejadian terkuat"""
+        summary = {
+            microphone: dict(latest, event=self.peaks.get(microphone))
+            for microphone, latest in self.latest.items()
+        }
+        self.peaks = {}
+        return summary
+
+    def stats(self):
+        return {
+            "chunks_seen": self.chunks_seen,
+            "chunks_analyzed": self.chunks_analyzed,
+            "gate_rate": self.chunks_analyzed / self.chunks_seen if self.chunks_seen else 0.0,
+            "dropped": self.dropped
+        }
@@ -0,0 +1,191 @@
+"""Benchmark end-to-end pipeline deteksi tanpa tampilan (headless)
+
+Contoh:
+    python bench_pipeline.py --rate 200 --events 5000 --zones 16 --output bench/pipeline.json
+    python bench_pipeline.py --events 5000 --baseline bench/pipeline.json
+"""
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import json
+import random
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+from detection_history import DetectionHistory
+from latency_metrics import LatencyHistogram
+
+
+class HighRateSecurityDevices:
+    """Pengganti SecurityDevices berlaju tinggi untuk benchmark"""
+
+    def __init__(self, zones=4, alarm_probability=0.1, seed=42):
+        self.zones = [f"Zona {i + 1}" for i in range(zones)]
+        self.alarm_probability = alarm_probability
+        self.random = random.Random(seed)
+        self.read_count = 0
+        self.last_read_ns = time.perf_counter_ns()
+        self.alarm_latency = LatencyHistogram()
+        self.alarm_count = 0
+
+    def get_all_sensor_readings(self):
+        self.last_read_ns = time.perf_counter_ns()
+        zone = self.zones[self.read_count % len(self.zones)]
+        self.read_count += 1
+        alarm = self.random.random() < self.alarm_probability
+        return {
+            "zone": zone,
+            "pir": self.random.uniform(0.71, 1.0) if alarm else self.random.uniform(0.0, 0.7),
+            "magnetic": self.random.uniform(0.0, 0.8),
+            "vibration": self.random.uniform(0.0, 80.0)
+        }
+
+    def get_all_actuator_status(self):
+        return {"alarm": False}
+
+    def trigger_alarm(self):
+        self.alarm_latency.record_ns(time.perf_counter_ns() - self.last_read_ns)
+        self.alarm_count += 1
+
+    def reset_alarm(self):
+        pass
+
+
+def build_window(devices, history_dir):
+    """Bangun SecuritySystem dengan perangkat palsu dan semua timer dimatikan"""
+    import home_security_system
+
+    original_devices = home_security_system.SecurityDevices
+    home_security_system.SecurityDevices = lambda: devices
+    try:
+        window = home_security_system.SecuritySystem()
+    finally:
+        home_security_system.SecurityDevices = original_devices
+
+    # Benchmark menggerakkan pipeline sendiri, bukan lewat QTimer
+    for value in vars(window).values():
+        if isinstance(value, QTimer):
+            value.stop()
+    window.resourceSampler.stop()
+    if window.cameraPipeline is not None:
+        window.cameraPipeline.stop()
+    if window.audioPipeline is not None:
+        window.audioPipeline.stop()
+    if window.watchdog is not None:
+        window.watchdog.stop()
+
+    window.history = window.engine.history = DetectionHistory(base_dir=history_dir)
+    return window
+
+
+def run_benchmark(rate, events, zones, alarm_probability, seed=42):
+    """Jalankan pipeline pada laju tertentu dan kumpulkan metrik"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    devices = HighRateSecurityDevices(zones, alarm_probability, seed)
+
+    with tempfile.TemporaryDirectory() as history_dir:
+        window = build_window(devices, history_dir)
+
+        # Latensi sensor -> log diukur saat baris log masuk ke QListWidget
+        log_latency = LatencyHistogram()
+        window.logList.model().rowsInserted.connect(
+            lambda *args: log_latency.record_ns(time.perf_counter_ns() - devices.last_read_ns))
+        window.latency.reset()
+
+        interval = 1.0 / rate if rate > 0 else 0.0
+        start = time.perf_counter()
+        for i in range(events):
+            if interval:
+                delay = start + i * interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            window.simulateActivity()
+            window.updateSecurity()
+            if i % 100 == 0:
+                app.processEvents()
+        elapsed = time.perf_counter() - start
+        # Alarm dijalankan worker dispatcher, tunggu antreannya kosong
+        window.engine.actuators.flush(timeout=5.0)
+
+        stages = window.latency.summary()
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "rate": rate,
+            "events": events,
+            "zones": zones,
+            "alarm_probability": alarm_probability,
+            "seed": seed
+        },
+        "throughput_per_s": events / elapsed if elapsed else 0.0,
+        "elapsed_s": elapsed,
+        "sensor_to_log_ms": log_latency.summary(),
+        "sensor_to_alarm_ms": devices.alarm_latency.summary(),
+        "alarm_count": devices.alarm_count,
+        "actuators": window.engine.actuators.stats(),
+        "stages_ms": stages,
+        # ru_maxrss dalam KiB di Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    }
+
+
+def compare_with_baseline(result, baseline, tolerance):
+    """Bandingkan hasil dengan baseline, kembalikan daftar regresi"""
+    checks = [
+        ("throughput_per_s", result["throughput_per_s"], baseline["throughput_per_s"], True),
+        ("sensor_to_log p50", result["sensor_to_log_ms"]["p50"], baseline["sensor_to_log_ms"]["p50"], False),
+        ("sensor_to_log p99", result["sensor_to_log_ms"]["p99"], baseline["sensor_to_log_ms"]["p99"], False),
+        ("sensor_to_alarm p50", result["sensor_to_alarm_ms"]["p50"], baseline["sensor_to_alarm_ms"]["p50"], False),
+        ("sensor_to_alarm p99", result["sensor_to_alarm_ms"]["p99"], baseline["sensor_to_alarm_ms"]["p99"], False),
+        ("peak_rss_mb", result["peak_rss_mb"], baseline["peak_rss_mb"], False),
+    ]
+    regressions = []
+    print(f"{'Metrik':<22}{'Baseline':>12}{'Sekarang':>12}{'Selisih':>10}")
+    for name, current, previous, higher_is_better in checks:
+        change = (current - previous) / previous * 100 if previous else 0.0
+        print(f"{name:<22}{previous:>12.3f}{current:>12.3f}{change:>9.1f}%")
+        worse = -change if higher_is_better else change
+        if worse > tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline deteksi keamanan")
+    parser.add_argument("--rate", type=float, default=0, help="Pembacaan per detik (0 = secepat mungkin)")
+    parser.add_argument("--events", type=int, default=2000, help="Jumlah pembacaan sensor")
+    parser.add_argument("--zones", type=int, default=4, help="Jumlah zona simulasi")
+    parser.add_argument("--alarm-probability", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Simpan hasil sebagai JSON")
+    parser.add_argument("--baseline", help="File JSON baseline untuk dibandingkan")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="Toleransi regresi (%%)")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.rate, args.events, args.zones, args.alarm_probability, args.seed)
+    print(json.dumps(result, indent=2))
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(result, baseline, args.tolerance)
+        if regressions:
+            print(f"Regresi terdeteksi: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
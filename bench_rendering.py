@@ -0,0 +1,174 @@
+"""Micro-benchmark rendering grafik dan tabel tanpa tampilan (offscreen)
+
+Contoh:
+    python bench_rendering.py --sizes 100,1000,10000 --output bench/rendering.json
+    python bench_rendering.py --baseline bench/rendering.json
+"""
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from PyQt5.QtWidgets import QApplication, QTableWidgetItem
+
+from bench_pipeline import HighRateSecurityDevices, build_window
+
+CHART_METHODS = [
+    "updateObjectDetectionCharts",
+    "updateAnomalyCharts",
+    "updateAudioCharts",
+    "updatePerformanceCharts"
+]
+
+# Grafik berukuran tetap (points diabaikan), cukup diukur sekali pada ukuran pertama
+FIXED_CHART_METHODS = [
+    "updateBehaviorCharts"
+]
+
+TABLES = [
+    "objectDetectionTable",
+    "behaviorTable",
+    "anomalyTable",
+    "audioTable",
+    "performanceTable"
+]
+
+
+def time_call(fn, repeat):
+    """Median waktu eksekusi (ms) dari beberapa pengulangan"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def fill_security_table(window, rows):
+    """Isi tabel evaluasi keamanan dengan sejumlah baris untuk export"""
+    table = window.securityTable
+    table.setRowCount(rows)
+    for i in range(rows):
+        for j in range(table.columnCount()):
+            table.setItem(i, j, QTableWidgetItem(f"R{i}C{j}"))
+
+
+def run_benchmark(sizes, repeat, max_chart_points, max_table_rows):
+    """Ukur setiap operasi rendering pada berbagai ukuran data"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = {}
+
+    def record(name, size, fn):
+        results.setdefault(name, {})[str(size)] = time_call(fn, repeat)
+        app.processEvents()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)  # Laporan dan riwayat ditulis ke direktori sementara
+        try:
+            window = build_window(HighRateSecurityDevices(), os.path.join(workdir, "history"))
+            table_columns = window.tableDataColumns()
+
+            for method in FIXED_CHART_METHODS:
+                record(method, sizes[0], getattr(window, method))
+
+            for size in sizes:
+                if size <= max_chart_points:
+                    for method in CHART_METHODS:
+                        record(method, size, lambda m=method: getattr(window, m)(points=size))
+
+                if size <= max_table_rows:
+                    for name in TABLES:
+                        table = getattr(window, name)
+                        table.setRowCount(size)
+                        record(f"fillTableData:{name}", size,
+                               lambda t=table: window.fillTableData(t, table_columns[t]))
+
+                    record("updateTableTimestamps", size, window.updateTableTimestamps)
+
+                    fill_security_table(window, size)
+                    record("exportSecurityReport", size, window.buildSecurityReport)
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "sizes": sizes,
+            "repeat": repeat,
+            "max_chart_points": max_chart_points,
+            "max_table_rows": max_table_rows
+        },
+        "results_ms": results
+    }
+
+
+def print_table(results, sizes, baseline=None):
+    """Cetak tabel perbandingan (ms), dengan rasio terhadap baseline jika ada"""
+    header = f"{'Operasi':<42}" + "".join(f"{size:>16}" for size in sizes)
+    print(header)
+    print("-" * len(header))
+    for name, by_size in results.items():
+        cells = []
+        for size in sizes:
+            value = by_size.get(str(size))
+            if value is None:
+                cells.append(f"{'-':>16}")
+                continue
+            text = f"{value:.1f}"
+            previous = (baseline or {}).get(name, {}).get(str(size))
+            if previous:
+                text += f" ({value / previous:.2f}x)"
+            cells.append(f"{text:>16}")
+        print(f"{name:<42}" + "".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rendering grafik dan tabel")
+    parser.add_argument("--sizes", default="100,1000,10000,100000,1000000",
+                        help="Daftar ukuran data dipisah koma")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-chart-points", type=int, default=1000000)
+    parser.add_argument("--max-table-rows", type=int, default=100000,
+                        help="Batas baris tabel (QTableWidget dengan 10^6 baris butuh memori besar)")
+    parser.add_argument("--output", help="Simpan hasil sebagai JSON")
+    parser.add_argument("--baseline", help="File JSON baseline untuk dibandingkan")
+    parser.add_argument("--tolerance", type=float, default=20.0, help="Toleransi regresi (%%)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    result = run_benchmark(sizes, args.repeat, args.max_chart_points, args.max_table_rows)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results_ms"]
+
+    print_table(result["results_ms"], sizes, baseline)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    if baseline:
+        regressions = [
+            f"{name}@{size}"
+            for name, by_size in result["results_ms"].items()
+            for size, value in by_size.items()
+            if baseline.get(name, {}).get(size)
+            and value > baseline[name][size] * (1 + args.tolerance / 100)
+        ]
+        if regressions:
+            print(f"Regresi terdeteksi: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
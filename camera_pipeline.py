@@ -0,0 +1,275 @@
+import threading
+import time
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+
+class FrameRing:
+    """Ring frame kamera yang dialokasikan sekali, frame terlama dibuang saat penuh
+
+    Worker menulis langsung ke slot (`acquire_slot` lalu `commit`), sehingga
+    tidak ada alokasi array per frame. Konsumen membaca berurutan lewat
+    `pop`, tampilan cukup mengambil `latest`.
+    """
+
+    def __init__(self, capacity, height, width, channels=3):
+        if capacity < 2:
+            raise ValueError("Kapasitas ring frame minimal 2")
+        self.capacity = capacity
+        self.frames = np.zeros((capacity, height, width, channels), dtype=np.uint8)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.write_seq = 0
+        self.read_seq = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    @property
+    def shape(self):
+        return self.frames.shape[1:]
+
+    def acquire_slot(self):
+        """Slot berikutnya untuk ditulis worker; frame belum terbaca tertua dibuang"""
+        with self._lock:
+            if self.write_seq - self.read_seq >= self.capacity:
+                self.read_seq += 1
+                self.dropped += 1
+            return self.frames[self.write_seq % self.capacity]
+
+    def commit(self, timestamp):
+        """Publikasikan slot yang baru ditulis"""
+        with self._lock:
+            self.timestamps[self.write_seq % self.capacity] = timestamp
+            self.write_seq += 1
+
+    def latest(self):
+        """(seq, timestamp, view) frame terbaru, atau None jika belum ada"""
+        with self._lock:
+            if self.write_seq == 0:
+                return None
+            seq = self.write_seq - 1
+            index = seq % self.capacity
+            return seq, float(self.timestamps[index]), self.frames[index]
+
+    def pop(self):
+        """(seq, timestamp, view) frame belum terbaca tertua, atau None"""
+        with self._lock:
+            if self.read_seq >= self.write_seq:
+                return None
+            seq = self.read_seq
+            self.read_seq += 1
+            index = seq % self.capacity
+            return seq, float(self.timestamps[index]), self.frames[index]
+
+    def valid(self, seq):
+        """True jika slot untuk seq belum dipakai ulang oleh worker"""
+        # Slot seq ditimpa saat worker mengambil slot untuk seq + capacity
+        return self.write_seq + 1 - seq <= self.capacity
+
+
+class SyntheticFrameSource:
+    """Sumber frame sintetis untuk pengujian: latar statis dengan objek bergerak"""
+
+    def __init__(self, width, height, fps=15, seed=None):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        rng = np.random.default_rng(seed)
+        gradient = np.linspace(40, 120, width, dtype=np.float32)
+        self.background = np.empty((height, width, 3), dtype=np.uint8)
+        self.background[:] = gradient[None, :, None].astype(np.uint8)
+        self.background += rng.integers(0, 8, self.background.shape, dtype=np.uint8)
+        self.size = max(8, min(width, height) // 6)
+        self.position = rng.uniform(0, [width - self.size, height - self.size])
+        self.velocity = rng.uniform(-4, 4, 2)
+
+    def read_into(self, out):
+        """Tulis frame berikutnya ke array out, kembalikan False jika sumber habis"""
+        np.copyto(out, self.background)
+        self.position += self.velocity
+        limits = np.array([self.width - self.size, self.height - self.size], dtype=np.float64)
+        bounce = (self.position < 0) | (self.position > limits)
+        self.velocity[bounce] *= -1
+        np.clip(self.position, 0, limits, out=self.position)
+        x, y = self.position.astype(int)
+        out[y:y + self.size, x:x + self.size] = (220, 60, 60)
+        return True
+
+    def close(self):
+        pass
+
+
+class VideoFileSource:
+    """Sumber frame dari file video lokal (butuh OpenCV), diulang saat habis"""
+
+    def __init__(self, path, width, height, loop=True):
+        if cv2 is None:
+            raise RuntimeError("OpenCV (cv2) tidak terpasang, sumber video tidak tersedia")
+        self.path = path
+        self.width = width
+        self.height = height
+        self.loop = loop
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise RuntimeError(f"Tidak dapat membuka video: {path}")
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 15
+
+    def read_into(self, out):
+        ok, frame = self.capture.read()
+        if not ok and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.capture.read()
+        if not ok:
+            return False
+        if frame.shape[:2] != (self.height, self.width):
+            frame = cv2.resize(frame, (self.width, self.height), interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=out)
+        return True
+
+    def close(self):
+        self.capture.release()
+
+
+class CameraWorker(threading.Thread):
+    """Thread akuisisi untuk satu kamera: baca sumber ke FrameRing sesuai fps"""
+
+    def __init__(self, camera, source, ring, fps=None):
+        super().__init__(name=f"camera-{camera}", daemon=True)
+        self.camera = camera
+        self.source = source
+        self.ring = ring
+        self.fps = fps or source.fps
+        self.frames = 0
+        self.errors = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        interval = 1.0 / self.fps if self.fps else 0.0
+        next_due = time.perf_counter()
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    slot = self.ring.acquire_slot()
+                    if not self.source.read_into(slot):
+                        break
+                    self.ring.commit(time.time())
+                    self.frames += 1
+                except Exception as e:
+                    self.errors += 1
+                    print(f"Error pada kamera {self.camera}: {str(e)}")
+                    self._stop_event.wait(1.0)
+
+                next_due += interval
+                delay = next_due - time.perf_counter()
+                if delay > 0:
+                    self._stop_event.wait(delay)
+                else:
+                    # Tertinggal, jangan mengejar dengan burst frame
+                    next_due = time.perf_counter()
+        finally:
+            self.source.close()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class CameraPipeline:
+    """Worker dan ring frame per kamera, plus thumbnail untuk grid tampilan
+
+    `sources` memetakan id kamera ke path video. Worker hanya dibuat untuk
+    kamera yang sumbernya dapat dibuka; kamera lain dicatat di `skipped`,
+    kecuali `synthetic=True` (benchmark/pengujian) yang memakai sumber sintetis.
+    """
+
+    def __init__(self, cameras, width=640, height=360, fps=15, ring_capacity=8, sources=None,
+                 synthetic=False):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.synthetic = synthetic
+        self.rings = {}
+        self.workers = {}
+        self.skipped = []
+        self.thumbnails = {}
+        self.thumbnail_seq = {}
+        sources = sources or {}
+        for k, camera in enumerate(cameras):
+            source = self.create_source(sources.get(camera), k)
+            if source is None:
+                self.skipped.append(camera)
+                continue
+            ring = FrameRing(ring_capacity, height, width)
+            self.rings[camera] = ring
+            self.workers[camera] = CameraWorker(camera, source, ring, fps)
+
+    def create_source(self, path, seed):
+        """Sumber video untuk path, sumber sintetis jika diminta, selain itu None"""
+        if path:
+            try:
+                return VideoFileSource(path, self.width, self.height)
+            except RuntimeError as e:
+                print(f"Error dalam membuka sumber kamera: {str(e)}")
+        if self.synthetic:
+            return SyntheticFrameSource(self.width, self.height, self.fps, seed=seed)
+        return None
+
+    def start(self):
+        for worker in self.workers.values():
+            worker.start()
+
+    def stop(self):
+        for worker in self.workers.values():
+            worker.stop()
+        for worker in self.workers.values():
+            worker.join(timeout=2.0)
+
+    def latest_frames(self, seen):
+        """(kamera, frame) terbaru yang belum diproses; `seen` {kamera: seq} diperbarui
+
+        Frame berupa view ke ring; worker bisa menimpanya setelah kapasitas
+        ring terlewati, jadi pemrosesan sebaiknya segera mengecilkan frame.
+        """
+        for camera, ring in self.rings.items():
+            latest = ring.latest()
+            if latest is None or latest[0] == seen.get(camera):
+                continue
+            seen[camera] = latest[0]
+            yield camera, latest[2]
+
+    def thumbnail(self, camera, max_width, max_height):
+        """Thumbnail frame terbaru, atau None jika tidak ada frame baru
+
+        Downscale memakai stride bilangan bulat ke buffer per kamera yang
+        dipakai ulang; pemanggil harus selesai memakai hasilnya sebelum
+        meminta thumbnail berikutnya untuk kamera yang sama.
+        """
+        ring = self.rings.get(camera)
+        latest = ring.latest() if ring is not None else None
+        if latest is None or latest[0] == self.thumbnail_seq.get(camera):
+            return None
+        seq, timestamp, frame = latest
+
+        step = max(1, -(-self.width // max_width), -(-self.height // max_height))
+        source = frame[::step, ::step]
+        thumb = self.thumbnails.get(camera)
+        if thumb is None or thumb.shape != source.shape:
+            thumb = self.thumbnails[camera] = np.empty(source.shape, dtype=np.uint8)
+        np.copyto(thumb, source)
+        self.thumbnail_seq[camera] = seq
+        return thumb
+
+    def stats(self):
+        """Statistik akuisisi per kamera"""
+        return {
+            camera: {
+                "frames": worker.frames,
+                "dropped": self.rings[camera].dropped,
+                "errors": worker.errors,
+                "alive": worker.is_alive()
+            }
+            for camera, worker in self.workers.items()
+        }
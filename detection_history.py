@@ -0,0 +1,95 @@
+import csv
+import os
+import threading
+from datetime import datetime, timedelta
+
+HISTORY_COLUMNS = ["timestamp", "zone", "event_type", "sensor", "value", "message"]
+
+
+class DetectionHistory:
+    """Penyimpanan riwayat deteksi dalam partisi CSV harian (append-only)"""
+
+    def __init__(self, base_dir="data/history"):
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def partition_path(self, day):
+        """Path file partisi untuk satu hari"""
+        return os.path.join(self.base_dir, f"{day.strftime('%Y-%m-%d')}.csv")
+
+    def record(self, event_type, zone="-", sensor="-", value=None, message="", timestamp=None):
+        """Catat satu kejadian ke riwayat"""
+        self.record_many([(event_type, zone, sensor, value, message)], timestamp)
+
+    def record_readings(self, readings, zone="-", timestamp=None):
+        """Catat semua pembacaan sensor numerik dalam satu kali tulis"""
+        rows = [
+            ("pembacaan", zone, sensor, value, "")
+            for sensor, value in readings.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        ]
+        self.record_many(rows, timestamp)
+
+    def record_many(self, rows, timestamp=None):
+        """Catat beberapa kejadian dengan timestamp yang sama"""
+        if not rows:
+            return
+        try:
+            timestamp = timestamp or datetime.now()
+            ts_text = timestamp.isoformat(timespec="milliseconds")
+            path = self.partition_path(timestamp)
+            with self._lock:
+                is_new = not os.path.exists(path)
+                with open(path, "a", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    if is_new:
+                        writer.writerow(HISTORY_COLUMNS)
+                    for event_type, zone, sensor, value, message in rows:
+                        writer.writerow([
+                            ts_text, zone, event_type, sensor,
+                            "" if value is None else f"{float(value):.4f}",
+                            message
+                        ])
+        except Exception as e:
+            print(f"Error dalam pencatatan riwayat: {str(e)}")
+
+    def partitions(self, start, end):
+        """Daftar file partisi yang beririsan dengan rentang waktu"""
+        paths = []
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day <= end:
+            path = self.partition_path(day)
+            if os.path.exists(path):
+                paths.append(path)
+            day += timedelta(days=1)
+        return paths
+
+    def iter_rows(self, start, end, zones=None, event_types=None):
+        """Iterasi baris riwayat dengan filter waktu, zona dan jenis kejadian
+
+        Partisi di luar rentang tidak dibuka sama sekali, dan karena baris
+        ditulis berurutan waktu, pembacaan berhenti begitu melewati `end`.
+        """
+        start_text = start.isoformat(timespec="milliseconds")
+        end_text = end.isoformat(timespec="milliseconds")
+        zones = set(zones) if zones else None
+        event_types = set(event_types) if event_types else None
+
+        for path in self.partitions(start, end):
+            with open(path, newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader, None)  # Lewati header
+                for row in reader:
+                    if len(row) != len(HISTORY_COLUMNS):
+                        continue
+                    ts_text = row[0]
+                    if ts_text < start_text:
+                        continue
+                    if ts_text > end_text:
+                        break
+                    if zones is not None and row[1] not in zones:
+                        continue
+                    if event_types is not None and row[2] not in event_types:
+                        continue
+                    yield row
@@ -0,0 +1,182 @@
+import bisect
+import itertools
+import json
+from collections import deque
+
+# Urutan level ancaman dari detect_intrusion
+THREAT_LEVELS = ["Rendah", "Sedang", "Tinggi", "Kritis"]
+
+# Zona atau jenis kejadian "*" cocok dengan apa saja
+WILDCARD = "*"
+
+# Pola bawaan: (nama, [(zona, jenis kejadian), ...], jendela detik, level)
+DEFAULT_PATTERNS = [
+    ("Pintu belakang lalu gerakan di dalam", [("Belakang", "pintu_terbuka"), ("Dalam", "gerakan")], 30.0, "Tinggi"),
+    ("Pintu depan lalu gerakan di dalam", [("Depan", "pintu_terbuka"), ("Dalam", "gerakan")], 30.0, "Tinggi"),
+    ("Getaran lalu pintu terbuka", [(WILDCARD, "getaran"), (WILDCARD, "pintu_terbuka")], 20.0, "Tinggi"),
+    ("Gerakan luar, pintu, lalu gerakan dalam",
+     [(WILDCARD, "deteksi_gerakan"), (WILDCARD, "pintu_terbuka"), ("Dalam", "gerakan")], 60.0, "Kritis"),
+]
+
+
+class SequencePattern:
+    """Pola berurutan "A lalu B (lalu C ...) dalam `within` detik" """
+
+    def __init__(self, name, steps, within, level="Tinggi"):
+        if len(steps) < 2:
+            raise ValueError(f"Pola {name} membutuhkan minimal dua langkah")
+        self.name = name
+        self.steps = [tuple(step) for step in steps]
+        self.within = float(within)
+        self.level = level
+
+    @classmethod
+    def from_dict(cls, data):
+        steps = [(step.get("zone", WILDCARD), step.get("type", WILDCARD)) for step in data["steps"]]
+        return cls(data["name"], steps, data["within"], data.get("level", "Tinggi"))
+
+
+class _TimeIndex:
+    """Kejadian terurut (timestamp, nomor kejadian) untuk satu (zona, jenis); pemangkasan tanpa geser array
+
+    Nomor kejadian membedakan kejadian dengan timestamp sama, sehingga satu
+    kejadian tidak bisa memenuhi dua langkah pola sekaligus.
+    """
+
+    def __init__(self):
+        self.times = []
+        self.start = 0
+
+    def add(self, key):
+        if not self.times or key >= self.times[-1]:
+            self.times.append(key)
+        else:
+            bisect.insort(self.times, key, lo=self.start)
+
+    def latest_before(self, limit, earliest):
+        """Kejadian terakhir yang lebih awal dari `limit` dengan timestamp >= earliest, atau None"""
+        i = bisect.bisect_left(self.times, limit, lo=self.start) - 1
+        if i >= self.start and self.times[i][0] >= earliest:
+            return self.times[i]
+        return None
+
+    def trim(self, cutoff):
+        self.start = bisect.bisect_left(self.times, (cutoff,), lo=self.start)
+        # Buang prefix sekaligus setelah cukup banyak agar amortisasi O(1)
+        if self.start > 1024 and self.start * 2 > len(self.times):
+            del self.times[:self.start]
+            self.start = 0
+
+    def __len__(self):
+        return len(self.times) - self.start
+
+
+class EventCorrelator:
+    """Pencocokan pola kejadian lintas zona secara inkremental
+
+    Kejadian disimpan per (zona, jenis) dalam indeks waktu terurut. Saat
+    kejadian baru tiba, hanya pola yang langkah terakhirnya cocok yang
+    diperiksa: setiap langkah sebelumnya dicari mundur dengan bisect
+    (kejadian terakhir yang lebih awal dari langkah berikutnya, masih di
+    dalam jendela), sehingga biaya per pola O(langkah x log n) tanpa
+    memindai ulang riwayat. Hanya indeks yang menerima kejadian yang
+    dipangkas; entri lama di indeks lain diabaikan lewat batas jendela.
+    Setiap pola yang terpenuhi menaikkan level `detect_intrusion` satu kali.
+    """
+
+    def __init__(self, patterns=None):
+        self.patterns = []
+        self.by_last_step = {}
+        self.indexes = {}
+        self.matches = deque(maxlen=100)
+        self.last_match = {}
+        self.max_window = 0.0
+        self.latest = 0.0
+        self._event_ids = itertools.count()
+        for pattern in patterns if patterns is not None else DEFAULT_PATTERNS:
+            self.add_pattern(pattern if isinstance(pattern, SequencePattern) else SequencePattern(*pattern))
+
+    @classmethod
+    def from_file(cls, path):
+        """Muat pola dari file JSON: [{"name", "steps": [{"zone", "type"}], "within", "level"}]"""
+        with open(path, encoding="utf-8") as f:
+            return cls([SequencePattern.from_dict(item) for item in json.load(f)])
+
+    def add_pattern(self, pattern):
+        self.patterns.append(pattern)
+        self.by_last_step.setdefault(pattern.steps[-1], []).append(pattern)
+        self.max_window = max(self.max_window, pattern.within)
+
+    def _index(self, key):
+        index = self.indexes.get(key)
+        if index is None:
+            index = self.indexes[key] = _TimeIndex()
+        return index
+
+    def add(self, zone, event_type, timestamp):
+        """Masukkan satu kejadian; kembalikan daftar pola yang baru terpenuhi"""
+        keys = [(zone, event_type), (WILDCARD, event_type), (zone, WILDCARD), (WILDCARD, WILDCARD)]
+        event = (timestamp, next(self._event_ids))
+        self.latest = max(self.latest, timestamp)
+        cutoff = self.latest - self.max_window
+        for key in keys:
+            index = self._index(key)
+            index.add(event)
+            index.trim(cutoff)
+
+        found = []
+        for key in keys:
+            for pattern in self.by_last_step.get(key, ()):
+                # Satu laporan per pola dan zona selama jendelanya masih berlaku
+                previous = self.last_match.get((pattern.name, zone))
+                if previous is not None and timestamp <= previous["expires"]:
+                    continue
+                match = self._match(pattern, zone, event)
+                if match is None:
+                    continue
+                self.last_match[(pattern.name, zone)] = match
+                self.matches.append(match)
+                found.append(match)
+        return found
+
+    def _match(self, pattern, zone, event):
+        timestamp = event[0]
+        earliest = timestamp - pattern.within
+        times = [timestamp]
+        limit = event
+        for step in reversed(pattern.steps[:-1]):
+            index = self.indexes.get(step)
+            found = index.latest_before(limit, earliest) if index is not None else None
+            if found is None:
+                return None
+            times.append(found[0])
+            limit = found
+        times.reverse()
+        return {
+            "pattern": pattern.name,
+            "level": pattern.level,
+            "zone": zone,
+            "start": times[0],
+            "end": timestamp,
+            "expires": timestamp + pattern.within,
+            "reported": False,
+            "steps": [f"{step_zone}/{step_type}" for step_zone, step_type in pattern.steps]
+        }
+
+    def active_match(self, now):
+        """Pola terpenuhi yang belum dilaporkan dan belum kedaluwarsa, level tertinggi lebih dulu"""
+        active = [match for match in self.matches if not match["reported"] and match["expires"] >= now]
+        return max(active, key=lambda match: THREAT_LEVELS.index(match["level"]), default=None)
+
+    def escalate(self, intrusion_result, now):
+        """Naikkan hasil detect_intrusion sekali per pola berurutan yang terpenuhi"""
+        match = self.active_match(now)
+        if match is None:
+            return intrusion_result
+        match["reported"] = True
+        level = intrusion_result.get("threat_level", THREAT_LEVELS[0])
+        current = THREAT_LEVELS.index(level) if level in THREAT_LEVELS else 0
+        if intrusion_result.get("detected") and current >= THREAT_LEVELS.index(match["level"]):
+            return intrusion_result
+        return dict(intrusion_result, detected=True, location=match["zone"],
+                    threat_level=match["level"], sequence=match["pattern"])
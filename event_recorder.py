@@ -0,0 +1,214 @@
+import json
+import os
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+# Label klip yang mencakup semua zona (alarm tanpa lokasi)
+ALL_ZONES = "semua"
+
+# Panjang maksimum satu file klip (detik); picu ulang terus-menerus dipecah menjadi beberapa bagian
+MAX_CLIP_LENGTH = 60.0
+
+
+class _ZoneBuffer:
+    """Pre-roll satu zona: deque (timestamp, data) per jenis data"""
+
+    def __init__(self):
+        self.sensors = deque()
+        self.audio = deque()
+        self.frames = deque()
+
+    def streams(self):
+        return (self.sensors, self.audio, self.frames)
+
+
+class _Recording:
+    """Klip yang sedang mengumpulkan post-roll"""
+
+    def __init__(self, zone, reason, trigger_time, end_time, buffers, start_time=None, part=0):
+        self.zone = zone
+        self.reason = reason
+        self.trigger_time = trigger_time
+        self.end_time = end_time
+        self.start_time = trigger_time if start_time is None else start_time
+        self.part = part
+        self.sensors = [item for buffer in buffers for item in buffer.sensors]
+        self.audio = [item for buffer in buffers for item in buffer.audio]
+        self.frames = [item for buffer in buffers for item in buffer.frames]
+
+    def covers(self, zone):
+        return self.zone == ALL_ZONES or self.zone == zone
+
+    def continuation(self, now):
+        """Bagian berikutnya dari klip yang sama, tanpa pre-roll"""
+        return _Recording(self.zone, self.reason, self.trigger_time, self.end_time, [],
+                          start_time=now, part=self.part + 1)
+
+
+class EventRecorder:
+    """Perekam klip kejadian dengan pre-roll di memori
+
+    Data sensor, audio dan frame per zona disimpan di memori selama
+    `pre_roll` detik terakhir. Saat `trigger` dipanggil (alarm atau deteksi
+    berkeyakinan tinggi), pre-roll ditambah `post_roll` detik berikutnya
+    ditulis sebagai file .npz terkompresi oleh thread latar; tanpa kejadian
+    tidak ada yang ditulis ke disk. Klip yang terus dipicu ulang ditulis
+    per bagian `max_length` detik agar memori tidak tumbuh tanpa batas.
+    """
+
+    def __init__(self, output_dir="recordings", pre_roll=10.0, post_roll=5.0,
+                 frame_interval=0.5, frame_step=2, max_length=MAX_CLIP_LENGTH):
+        self.output_dir = output_dir
+        self.pre_roll = pre_roll
+        self.post_roll = post_roll
+        self.max_length = max_length
+        self.frame_interval = frame_interval
+        self.frame_step = frame_step
+        self.buffers = {}
+        self.active = []
+        self.last_frame = {}
+        self.saved = queue.SimpleQueue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-recorder")
+
+    def _buffer(self, zone):
+        buffer = self.buffers.get(zone)
+        if buffer is None:
+            buffer = self.buffers[zone] = _ZoneBuffer()
+        return buffer
+
+    def _append(self, zone, stream_name, item):
+        # Setiap jenis data ikut menyelesaikan klip, tidak hanya tick sensor
+        self.poll(item[0])
+        stream = getattr(self._buffer(zone), stream_name)
+        stream.append(item)
+        # Setiap jenis data dipangkas terhadap waktunya sendiri
+        oldest = item[0] - self.pre_roll
+        while stream[0][0] < oldest:
+            stream.popleft()
+        for recording in self.active:
+            if recording.covers(zone):
+                getattr(recording, stream_name).append(item)
+
+    def add_sensor(self, zone, readings, timestamp):
+        """Simpan pembacaan numerik sensor satu zona"""
+        values = {name: float(value) for name, value in readings.items()
+                  if isinstance(value, (int, float)) and not isinstance(value, bool)}
+        self._append(zone, "sensors", (timestamp, values))
+
+    def add_audio(self, zone, chunk, timestamp):
+        """Simpan satu chunk audio float (-1..1) sebagai int16"""
+        pcm = (np.clip(chunk, -1.0, 1.0) * 32767).astype(np.int16)
+        self._append(zone, "audio", (timestamp, pcm))
+
+    def add_frame(self, zone, camera, frame, timestamp):
+        """Simpan frame kamera yang diperkecil, dibatasi satu per frame_interval"""
+        if timestamp - self.last_frame.get(camera, 0.0) < self.frame_interval:
+            return
+        self.last_frame[camera] = timestamp
+        small = np.ascontiguousarray(frame[::self.frame_step, ::self.frame_step])
+        self._append(zone, "frames", (timestamp, camera, small))
+
+    def trigger(self, zone=None, reason="alarm", timestamp=None):
+        """Mulai klip untuk zona (None = semua zona); picu ulang memperpanjang post-roll"""
+        zone = zone or ALL_ZONES
+        if timestamp is None:
+            timestamp = max((stream[-1][0] for buffer in self.buffers.values()
+                             for stream in buffer.streams() if stream), default=0.0)
+        for recording in self.active:
+            if recording.covers(zone):
+                recording.end_time = max(recording.end_time, timestamp + self.post_roll)
+                return recording
+        buffers = (list(self.buffers.values()) if zone == ALL_ZONES
+                   else [self.buffers[zone]] if zone in self.buffers else [])
+        recording = _Recording(zone, reason, timestamp, timestamp + self.post_roll, buffers)
+        self.active.append(recording)
+        return recording
+
+    def poll(self, now):
+        """Serahkan klip yang post-roll-nya selesai ke thread penulis
+
+        Klip yang masih berjalan tetapi sudah `max_length` detik ditulis
+        sebagai satu bagian dan rekaman berlanjut di bagian berikutnya.
+        """
+        if not self.active:
+            return
+        active = []
+        for recording in self.active:
+            if recording.end_time <= now:
+                self._executor.submit(self._write, recording)
+            elif now - recording.start_time >= self.max_length:
+                self._executor.submit(self._write, recording)
+                active.append(recording.continuation(now))
+            else:
+                active.append(recording)
+        self.active = active
+
+    def flush(self):
+        """Tulis semua klip aktif sekarang juga dan tunggu sampai selesai"""
+        self.poll(float("inf"))
+        self._executor.submit(lambda: None).result()
+
+    def _write(self, recording):
+        try:
+            started = datetime.fromtimestamp(recording.trigger_time)
+            directory = os.path.join(self.output_dir, started.strftime("%Y-%m-%d"))
+            os.makedirs(directory, exist_ok=True)
+            zone_label = "".join(c if c.isalnum() else "_" for c in recording.zone)
+            part_label = f"_{recording.part + 1:03d}" if recording.part else ""
+            filepath = os.path.join(
+                directory, f"{started.strftime('%H%M%S')}_{zone_label}_{recording.reason}{part_label}.npz")
+
+            sensors = sorted(recording.sensors, key=lambda item: item[0])
+            sensor_names = sorted({name for _, values in sensors for name in values})
+            sensor_values = np.array([[values.get(name, np.nan) for name in sensor_names]
+                                      for _, values in sensors], dtype=np.float32)
+            audio = sorted(recording.audio, key=lambda item: item[0])
+            frames = sorted(recording.frames, key=lambda item: item[0])
+            cameras = sorted({camera for _, camera, _ in frames})
+
+            # Frame dikelompokkan per kamera karena resolusi bisa berbeda
+            frame_arrays = {}
+            for k, camera in enumerate(cameras):
+                camera_frames = [(t, frame) for t, name, frame in frames if name == camera]
+                frame_arrays[f"frame_times_{k}"] = np.array([t for t, _ in camera_frames])
+                frame_arrays[f"frames_{k}"] = np.stack([frame for _, frame in camera_frames])
+
+            np.savez_compressed(
+                filepath,
+                metadata=json.dumps({
+                    "zone": recording.zone,
+                    "reason": recording.reason,
+                    "trigger_time": recording.trigger_time,
+                    "start_time": recording.start_time,
+                    "part": recording.part,
+                    "pre_roll": self.pre_roll,
+                    "post_roll": self.post_roll,
+                    "sensor_names": sensor_names,
+                    "cameras": cameras
+                }),
+                sensor_times=np.array([t for t, _ in sensors], dtype=np.float64),
+                sensor_values=sensor_values.reshape(len(sensors), len(sensor_names)),
+                audio_times=np.array([t for t, _ in audio], dtype=np.float64),
+                audio=np.stack([pcm for _, pcm in audio]) if audio else np.zeros((0, 0), np.int16),
+                **frame_arrays
+            )
+            self.saved.put((filepath, recording.zone, recording.reason))
+        except Exception as e:
+            print(f"Error dalam menulis klip kejadian: {str(e)}")
+
+    def drain_saved(self):
+        """Klip yang selesai ditulis sejak panggilan terakhir: [(path, zona, alasan)]"""
+        saved = []
+        while True:
+            try:
+                saved.append(self.saved.get_nowait())
+            except queue.Empty:
+                return saved
+
+    def close(self):
+        self.flush()
+        self._executor.shutdown(wait=True)
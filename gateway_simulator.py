@@ -0,0 +1,103 @@
+"""Simulator node sensor: kirim pembacaan ke gateway dengan protokol biner batch
+
+Contoh:
+    python gateway_simulator.py --address tcp://127.0.0.1:7700 --rate 50000 --zones 64
+    python gateway_simulator.py --address unix:///tmp/homesecurity.sock --batch 1024
+"""
+import argparse
+import socket
+import sys
+import time
+
+import numpy as np
+
+from sensor_gateway import SENSOR_NAMES, SENSOR_RECORD_DTYPE, encode_frame, parse_address
+
+# Rentang nilai acak per sensor, sesuai urutan SENSOR_NAMES
+SENSOR_RANGES = np.array([
+    [0.0, 1.0],     # pir
+    [0.0, 1.0],     # magnetic
+    [0.0, 100.0],   # vibration
+    [20.0, 90.0],   # audio_db
+], dtype=np.float32)
+
+
+def connect(address, retries=50, delay=0.1):
+    """Sambungkan ke gateway, ulangi sampai server siap"""
+    family, target = parse_address(address)
+    for attempt in range(retries):
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.connect(target)
+            if family == socket.AF_INET:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return sock
+        except OSError:
+            sock.close()
+            if attempt == retries - 1:
+                raise
+            time.sleep(delay)
+
+
+def generate_batch(rng, records, zones):
+    """Isi array record yang sudah dialokasikan dengan pembacaan acak"""
+    count = len(records)
+    sensors = rng.integers(0, len(SENSOR_NAMES), count, dtype=np.uint8)
+    low, high = SENSOR_RANGES[sensors, 0], SENSOR_RANGES[sensors, 1]
+    records["timestamp"] = time.time()
+    records["zone"] = rng.integers(0, zones, count, dtype=np.uint16)
+    records["sensor"] = sensors
+    records["flags"] = 0
+    records["value"] = low + rng.random(count, dtype=np.float32) * (high - low)
+
+
+def run_simulator(address, rate, batch, zones, node_id=1, duration=0, seed=None):
+    """Kirim batch pembacaan pada laju tertentu (record/detik), 0 = secepat mungkin"""
+    rng = np.random.default_rng(seed)
+    records = np.zeros(batch, dtype=SENSOR_RECORD_DTYPE)
+    interval = batch / rate if rate > 0 else 0.0
+    sent = 0
+    seq = 0
+
+    sock = connect(address)
+    start = time.perf_counter()
+    try:
+        while not duration or time.perf_counter() - start < duration:
+            generate_batch(rng, records, zones)
+            sock.sendall(encode_frame(node_id, seq, records))
+            seq += 1
+            sent += batch
+            if interval:
+                delay = start + seq * interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+    except (BrokenPipeError, ConnectionError):
+        pass
+    finally:
+        sock.close()
+
+    elapsed = time.perf_counter() - start
+    return {"records": sent, "frames": seq, "elapsed_s": elapsed,
+            "records_per_s": sent / elapsed if elapsed else 0.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulator node sensor untuk gateway")
+    parser.add_argument("--address", default="tcp://127.0.0.1:7700")
+    parser.add_argument("--rate", type=float, default=1000, help="Record per detik (0 = secepat mungkin)")
+    parser.add_argument("--batch", type=int, default=256, help="Record per frame")
+    parser.add_argument("--zones", type=int, default=4)
+    parser.add_argument("--node-id", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=0, help="Lama simulasi (detik, 0 = terus)")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    result = run_simulator(args.address, args.rate, args.batch, args.zones,
+                           args.node_id, args.duration, args.seed)
+    print(f"Terkirim {result['records']} record dalam {result['frames']} frame "
+          f"({result['records_per_s']:.0f} record/detik)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
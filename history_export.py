@@ -0,0 +1,108 @@
+import csv
+import gzip
+import os
+from datetime import datetime
+
+from detection_history import HISTORY_COLUMNS
+
+EXPORT_FORMATS = ("parquet", "arrow", "csv.gz")
+
+
+class _CsvGzipBatchWriter:
+    """Penulis batch ke file CSV terkompresi gzip"""
+
+    def __init__(self, filepath):
+        self.file = gzip.open(filepath, "wt", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(HISTORY_COLUMNS)
+
+    def write_batch(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class _ArrowBatchWriter:
+    """Penulis batch ke Parquet atau Arrow IPC menggunakan pyarrow"""
+
+    def __init__(self, filepath, fmt):
+        import pyarrow as pa
+
+        self.pa = pa
+        self.schema = pa.schema([
+            ("timestamp", pa.timestamp("ms")),
+            ("zone", pa.string()),
+            ("event_type", pa.string()),
+            ("sensor", pa.string()),
+            ("value", pa.float64()),
+            ("message", pa.string()),
+        ])
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            self.writer = pq.ParquetWriter(filepath, self.schema, compression="zstd")
+        else:
+            self.writer = pa.ipc.new_file(filepath, self.schema)
+
+    def write_batch(self, rows):
+        # Transpos baris ke kolom sekali per batch
+        timestamps, zones, event_types, sensors, values, messages = zip(*rows)
+        batch = self.pa.RecordBatch.from_arrays([
+            self.pa.array([datetime.fromisoformat(ts) for ts in timestamps], self.pa.timestamp("ms")),
+            self.pa.array(zones, self.pa.string()),
+            self.pa.array(event_types, self.pa.string()),
+            self.pa.array(sensors, self.pa.string()),
+            self.pa.array([float(v) if v else None for v in values], self.pa.float64()),
+            self.pa.array(messages, self.pa.string()),
+        ], schema=self.schema)
+        self.writer.write_batch(batch)
+
+    def close(self):
+        self.writer.close()
+
+
+def export_history(history, start, end, fmt="parquet", zones=None, event_types=None,
+                   batch_size=50000, output_dir="data/export"):
+    """Export riwayat deteksi ke Parquet/Arrow/CSV.gz secara bertahap per batch
+
+    Hanya satu batch (`batch_size` baris) yang berada di memori pada satu
+    waktu. Mengembalikan tuple (path file, jumlah baris).
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format export tidak dikenal: {fmt}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    filename = (f"riwayat_{start.strftime('%Y%m%d%H%M')}_"
+                f"{end.strftime('%Y%m%d%H%M')}.{'arrow' if fmt == 'arrow' else fmt}")
+    filepath = os.path.join(output_dir, filename)
+
+    if fmt == "csv.gz":
+        writer = _CsvGzipBatchWriter(filepath)
+    else:
+        writer = _ArrowBatchWriter(filepath, fmt)
+
+    total_rows = 0
+    batch = []
+    try:
+        for row in history.iter_rows(start, end, zones=zones, event_types=event_types):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                writer.write_batch(batch)
+                total_rows += len(batch)
+                batch = []
+        if batch:
+            writer.write_batch(batch)
+            total_rows += len(batch)
+    finally:
+        writer.close()
+
+    return filepath, total_rows
+
+
+def default_export_format():
+    """Pilih Parquet jika pyarrow tersedia, jika tidak gunakan CSV.gz"""
+    try:
+        import pyarrow.parquet
+        return "parquet"
+    except ImportError:
+        return "csv.gz"
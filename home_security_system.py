@@ -3,28 +3,84 @@ import random
 import pandas as pd
 from datetime import datetime, timedelta
 import time
+from collections import deque
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QLabel, QPushButton, QFrame, QTabWidget,
                            QProgressBar, QTableWidget, QTableWidgetItem, QComboBox,
                            QLineEdit, QScrollArea, QGridLayout, QListWidget, QSlider,
                            QListWidgetItem, QFileDialog, QSizePolicy, QMessageBox, QHeaderView)
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont, QColor, QPainter, QLinearGradient
+from PyQt5.QtCore import Qt, QTimer, QEvent, pyqtSignal
+from PyQt5.QtGui import QFont, QColor, QPainter, QLinearGradient, QImage, QPixmap
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from algorithm_tree import AlgorithmTreeWidget
 from dummy_devices import SecurityDevices
+from detection_history import DetectionHistory
+from latency_metrics import PipelineLatency
+from security_engine import SecurityEngine, SecurityAI, RESPONSE_BUDGET_MS
+from zones import ZoneRegistry
+from camera_pipeline import CameraPipeline
+from audio_pipeline import AudioPipeline
+from event_recorder import EventRecorder
+from notification_dispatcher import create_notifier
+from object_tracker import OBJECT_CLASSES
+from resource_sampler import ResourceSampler
 import seaborn as sns
 import os
+import json
 from openpyxl import Workbook
 from openpyxl.styles import PatternFill, Font, Alignment
+from openpyxl.utils import get_column_letter
+
+# Interval sampling sumber daya proses (detik)
+RESOURCE_SAMPLE_INTERVAL = 5.0
+
+# Konfigurasi zona opsional, default empat zona standar
+ZONES_CONFIG = "config/zones.json"
+
+# Grid kamera: jumlah kolom dan kamera per halaman
+CAMERA_GRID_COLUMNS = 2
+CAMERA_PAGE_SIZE = 4
+
+# Pipeline kamera: resolusi frame, fps akuisisi, dan laju/ukuran thumbnail grid
+CAMERA_SOURCES_CONFIG = "config/cameras.json"
+CAMERA_FRAME_SIZE = (640, 360)
+CAMERA_FPS = 15
+THUMBNAIL_FPS = 5
+THUMBNAIL_SIZE = (320, 180)
+
+# Interval motion gate pada frame kamera terbaru (ms), tetap berjalan di mode latar
+VISION_INTERVAL_MS = 200
+
+# Pipeline audio: satu mikrofon per zona, sumber WAV opsional per zona
+MICROPHONE_SOURCES_CONFIG = "config/microphones.json"
+AUDIO_INTERVAL_MS = 250
+
+# Sumber sintetis untuk kamera/mikrofon tanpa konfigurasi, hanya untuk benchmark dan pengujian
+SYNTHETIC_SOURCES = os.environ.get("HOMESECURITY_SYNTHETIC_SOURCES") == "1"
+
+# Kanal notifikasi (SMTP, webhook, file/socket) untuk bantuan dan penyusupan serius
+NOTIFICATION_CONFIG = "config/notifications.json"
+
+# Pengawas event loop: interval heartbeat dan ambang stall (ms)
+WATCHDOG_INTERVAL_MS = 100
+WATCHDOG_STALL_THRESHOLD_MS = 250
 
 class SecuritySystem(QMainWindow):
+    # Event mesin dari thread lain (mis. hasil perintah grup) diantrekan ke thread UI
+    engineEvent = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
         self.devices = SecurityDevices()  # Initialize dummy devices
+        self.history = DetectionHistory()  # Riwayat deteksi untuk analisis offline
+        self.latency = PipelineLatency()  # Histogram latensi per tahap pipeline
+        self.zones = (ZoneRegistry.from_file(ZONES_CONFIG) if os.path.exists(ZONES_CONFIG)
+                      else ZoneRegistry())
+        self.resourceSampler = ResourceSampler(interval=RESOURCE_SAMPLE_INTERVAL)
+        self.resourceSampler.start()
         
         # Inisialisasi figure dan canvas untuk grafik evaluasi
         self.objectPieFigure = Figure(figsize=(6, 4))
@@ -61,6 +117,10 @@ class SecuritySystem(QMainWindow):
         self.setupData()
         self.setupTimers()
         self.setupAI()
+        self.setupCameraPipeline()
+        self.setupAudioPipeline()
+        self.setupNotifications()
+        self.setupWatchdog()
 
     def initUI(self):
         """Inisialisasi UI utama"""
@@ -160,37 +220,61 @@ class SecuritySystem(QMainWindow):
         leftPanel = QFrame()
         leftLayout = QVBoxLayout(leftPanel)
         
-        # Grid Kamera
+        # Grid Kamera, dibangkitkan dari registry zona dan ditampilkan per halaman
         cameraGrid = QFrame()
         gridLayout = QGridLayout(cameraGrid)
         gridLayout.setSpacing(10)
         
-        camera_areas = ["Depan", "Belakang", "Samping", "Dalam"]
-        for i in range(2):
-            for j in range(2):
-                cameraFrame = QFrame()
-                cameraFrame.setStyleSheet("""
-            QFrame {
-                        background-color: #f5f6fa;
-                        border: 2px solid #dcdde1;
-                border-radius: 10px;
-                        min-height: 200px;
-            }
-        """)
-                cameraLayout = QVBoxLayout(cameraFrame)
-                
-                area = camera_areas[i*2 + j]
-                title = QLabel(f"Kamera Area {area}")
-                title.setStyleSheet("font-weight: bold; color: #2c3e50;")
-                status = QLabel("Status: Normal")
-                status.setStyleSheet("color: #27ae60;")
-                
-                cameraLayout.addWidget(title)
-                cameraLayout.addWidget(status)
-                gridLayout.addWidget(cameraFrame, i, j)
+        self.cameraPage = 0
+        self.cameraTiles = []
+        self.cameraTileIds = []
+        for k in range(CAMERA_PAGE_SIZE):
+            cameraFrame = QFrame()
+            cameraFrame.setStyleSheet("""
+                QFrame {
+                    background-color: #f5f6fa;
+                    border: 2px solid #dcdde1;
+                    border-radius: 10px;
+                    min-height: 200px;
+                }
+            """)
+            cameraLayout = QVBoxLayout(cameraFrame)
+            
+            title = QLabel()
+            title.setStyleSheet("font-weight: bold; color: #2c3e50;")
+            preview = QLabel()
+            preview.setAlignment(Qt.AlignCenter)
+            preview.setMinimumSize(*THUMBNAIL_SIZE)
+            preview.setStyleSheet("background-color: #2c3e50; border: none;")
+            status = QLabel("Status: Normal")
+            status.setStyleSheet("color: #27ae60;")
+            
+            cameraLayout.addWidget(title)
+            cameraLayout.addWidget(preview)
+            cameraLayout.addWidget(status)
+            gridLayout.addWidget(cameraFrame, k // CAMERA_GRID_COLUMNS, k % CAMERA_GRID_COLUMNS)
+            self.cameraTiles.append((cameraFrame, title, preview, status))
         
         leftLayout.addWidget(cameraGrid)
         
+        # Navigasi halaman kamera
+        self.cameraPager = QFrame()
+        pagerLayout = QHBoxLayout(self.cameraPager)
+        prevButton = QPushButton("◀")
+        prevButton.clicked.connect(lambda: self.showCameraPage(self.cameraPage - 1))
+        nextButton = QPushButton("▶")
+        nextButton.clicked.connect(lambda: self.showCameraPage(self.cameraPage + 1))
+        self.cameraPageLabel = QLabel()
+        self.cameraPageLabel.setStyleSheet("color: #7f8c8d;")
+        pagerLayout.addStretch()
+        pagerLayout.addWidget(prevButton)
+        pagerLayout.addWidget(self.cameraPageLabel)
+        pagerLayout.addWidget(nextButton)
+        pagerLayout.addStretch()
+        leftLayout.addWidget(self.cameraPager)
+        
+        self.showCameraPage(0)
+        
         # Log Aktivitas
         logFrame = QFrame()
         logLayout = QVBoxLayout(logFrame)
@@ -259,12 +343,12 @@ class SecuritySystem(QMainWindow):
         rightLayout.addWidget(actionsTitle)
         
         actions = [
-            ("🚨 Aktifkan Alarm", "#e74c3c"),
-            ("🔒 Kunci Semua Pintu", "#3498db"),
-            ("📞 Hubungi Bantuan", "#27ae60")
+            ("🚨 Aktifkan Alarm", "#e74c3c", self.activateAlarm),
+            ("🔒 Kunci Semua Pintu", "#3498db", self.lockAllDoors),
+            ("📞 Hubungi Bantuan", "#27ae60", self.requestHelp)
         ]
         
-        for text, color in actions:
+        for text, color, handler in actions:
             btn = QPushButton(text)
             btn.setStyleSheet(f"""
                 QPushButton {{
@@ -279,12 +363,44 @@ class SecuritySystem(QMainWindow):
                     background-color: {color}dd;
                 }}
             """)
+            btn.clicked.connect(handler)
             rightLayout.addWidget(btn)
         
         layout.addWidget(rightPanel, 30)
         
         self.tabWidget.addTab(monitoringTab, "🎥 Pemantauan")
 
+    def showCameraPage(self, page):
+        """Tampilkan satu halaman grid kamera, tile dipakai ulang antar halaman"""
+        cameras = self.zones.cameras()
+        page_count = max(1, (len(cameras) + CAMERA_PAGE_SIZE - 1) // CAMERA_PAGE_SIZE)
+        self.cameraPage = max(0, min(page, page_count - 1))
+        
+        start = self.cameraPage * CAMERA_PAGE_SIZE
+        self.cameraTileIds = [camera for zone, camera in cameras[start:start + CAMERA_PAGE_SIZE]]
+        for k, (cameraFrame, title, preview, status) in enumerate(self.cameraTiles):
+            preview.clear()
+            if start + k < len(cameras):
+                zone, camera = cameras[start + k]
+                title.setText(camera)
+                pipeline = getattr(self, "cameraPipeline", None)
+                if pipeline is not None and camera in pipeline.skipped:
+                    status.setText("Status: Tidak ada sumber")
+                    status.setStyleSheet("color: #7f8c8d;")
+                else:
+                    status.setText("Status: Normal")
+                    status.setStyleSheet("color: #27ae60;")
+                cameraFrame.setVisible(True)
+            else:
+                cameraFrame.setVisible(False)
+        
+        # Paksa thumbnail halaman baru digambar ulang
+        if getattr(self, "cameraPipeline", None) is not None:
+            self.cameraPipeline.thumbnail_seq.clear()
+        
+        self.cameraPageLabel.setText(f"Halaman {self.cameraPage + 1}/{page_count}")
+        self.cameraPager.setVisible(page_count > 1)
+
     def setupEvaluationTab(self):
         """Setup tab evaluasi"""
         evaluationTab = QWidget()
@@ -326,8 +442,25 @@ class SecuritySystem(QMainWindow):
                     """)
         refreshButton.clicked.connect(self.refreshData)
         
+        historyButton = QPushButton("🗂️ Export Riwayat")
+        historyButton.setStyleSheet("""
+            QPushButton {
+                background-color: #8e44ad;
+                color: white;
+                padding: 10px 20px;
+                border: none;
+                border-radius: 5px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #9b59b6;
+            }
+        """)
+        historyButton.clicked.connect(self.exportHistory)
+        
         toolbarLayout.addWidget(exportButton)
         toolbarLayout.addWidget(refreshButton)
+        toolbarLayout.addWidget(historyButton)
         toolbarLayout.addStretch()
         
         layout.addWidget(toolbarFrame)
@@ -517,13 +650,20 @@ class SecuritySystem(QMainWindow):
         except Exception as e:
             print(f"Error updating evaluation charts: {str(e)}")
 
-    def updateObjectDetectionCharts(self):
-        """Update grafik deteksi objek"""
+    def updateObjectDetectionCharts(self, points=None):
+        """Update grafik deteksi objek (points: panjang seri trend)
+        
+        Memakai jumlah objek unik dari pelacak bila sudah ada, jika belum
+        memakai data contoh.
+        """
+        counter = self.engine.object_counter
+        tracked = bool(counter.totals.any())
+        
         # Pie Chart
         self.objectPieFigure.clear()
         ax = self.objectPieFigure.add_subplot(111)
-        objects = ['Orang', 'Kendaraan', 'Tas', 'Mencurigakan']
-        sizes = [random.randint(20, 40) for _ in range(4)]
+        objects = OBJECT_CLASSES
+        sizes = counter.totals.tolist() if tracked else [random.randint(20, 40) for _ in range(4)]
         colors = ['#2ecc71', '#3498db', '#f1c40f', '#e74c3c']
         explode = (0.1, 0, 0, 0.1)  # Explode orang dan mencurigakan
         ax.pie(sizes, explode=explode, labels=objects, colors=colors, autopct='%1.1f%%',
@@ -534,10 +674,15 @@ class SecuritySystem(QMainWindow):
         # Trend Chart
         self.objectTrendFigure.clear()
         ax = self.objectTrendFigure.add_subplot(111)
-        times = pd.date_range(end=datetime.now(), periods=10, freq='h')
+        points = points or 10
+        if tracked:
+            starts, counts = counter.series(points, time.time())
+            times = pd.date_range(end=datetime.fromtimestamp(starts[-1]), periods=points, freq='h')
+        else:
+            times = pd.date_range(end=datetime.now(), periods=points, freq='h')
         
         for i, obj in enumerate(objects):
-            values = np.random.normal(30, 5, 10)
+            values = counts[:, i] if tracked else np.random.normal(30, 5, points)
             ax.plot(times, values, '-o', label=obj, color=colors[i], linewidth=2,
                    marker='o', markersize=8, markerfacecolor='white')
             
@@ -549,8 +694,8 @@ class SecuritySystem(QMainWindow):
         self.objectTrendFigure.tight_layout()
         self.objectTrendCanvas.draw()
 
-    def updateBehaviorCharts(self):
-        """Update grafik analisis perilaku"""
+    def updateBehaviorCharts(self, points=None):
+        """Update grafik analisis perilaku (ukuran tetap, points diabaikan)"""
         # Heatmap
         self.behaviorHeatFigure.clear()
         ax = self.behaviorHeatFigure.add_subplot(111)
@@ -590,14 +735,16 @@ class SecuritySystem(QMainWindow):
         self.behaviorBarFigure.tight_layout()
         self.behaviorBarCanvas.draw()
 
-    def updateAnomalyCharts(self):
-        """Update grafik deteksi anomali"""
+    def updateAnomalyCharts(self, points=None):
+        """Update grafik deteksi anomali (points: jumlah titik data)"""
+        points = points or 100
+        
         # Time Series
         self.anomalyTSFigure.clear()
         ax = self.anomalyTSFigure.add_subplot(111)
-        times = pd.date_range(end=datetime.now(), periods=100, freq='5min')
-        values = np.random.normal(0, 1, 100)
-        anomalies = np.random.choice([0, 1], 100, p=[0.9, 0.1])
+        times = pd.date_range(end=datetime.now(), periods=points, freq='5min')
+        values = np.random.normal(0, 1, points)
+        anomalies = np.random.choice([0, 1], points, p=[0.9, 0.1])
         
         # Plot normal data
         ax.plot(times, values, 'b-', label='Normal', linewidth=2, color='#3498db')
@@ -618,8 +765,8 @@ class SecuritySystem(QMainWindow):
         ax = self.anomalyScatterFigure.add_subplot(111)
         
         # Generate better-looking clusters
-        normal_data = np.random.multivariate_normal([0, 0], [[1, 0.5], [0.5, 1]], 100)
-        anomaly_data = np.random.multivariate_normal([3, 3], [[0.5, 0.2], [0.2, 0.5]], 10)
+        normal_data = np.random.multivariate_normal([0, 0], [[1, 0.5], [0.5, 1]], points)
+        anomaly_data = np.random.multivariate_normal([3, 3], [[0.5, 0.2], [0.2, 0.5]], max(1, points // 10))
         
         ax.scatter(normal_data[:, 0], normal_data[:, 1], 
                   label='Normal', color='#3498db', alpha=0.6)
@@ -634,14 +781,14 @@ class SecuritySystem(QMainWindow):
         self.anomalyScatterFigure.tight_layout()
         self.anomalyScatterCanvas.draw()
 
-    def updateAudioCharts(self):
-        """Update grafik analisis audio"""
+    def updateAudioCharts(self, points=None):
+        """Update grafik analisis audio (points: panjang sinyal dan seri level)"""
         # Spektogram
         self.audioSpecFigure.clear()
         ax = self.audioSpecFigure.add_subplot(111)
         
         # Generate more interesting audio data
-        t = np.linspace(0, 10, 1000)
+        t = np.linspace(0, 10, points or 1000)
         frequencies = [1.0, 2.0, 3.0]
         signal = np.zeros_like(t)
         for freq in frequencies:
@@ -657,15 +804,21 @@ class SecuritySystem(QMainWindow):
         self.audioSpecFigure.tight_layout()
         self.audioSpecCanvas.draw()
         
-        # Level Suara
+        # Level Suara, dari pipeline audio bila sudah ada data
         self.audioLevelFigure.clear()
         ax = self.audioLevelFigure.add_subplot(111)
-        times = pd.date_range(end=datetime.now(), periods=50, freq='1min')
-        
-        # Generate more realistic audio levels
+        level_points = points or 50
         base_level = 45  # Base ambient noise level
-        activity_spikes = np.random.normal(20, 5, 50)  # Random activity
-        levels = base_level + activity_spikes
+        
+        if self.audioPipeline is not None and self.audioPipeline.level_count:
+            timestamps, levels = self.audioPipeline.level_history(level_points)
+            times = [datetime.fromtimestamp(t) for t in timestamps]
+        else:
+            times = pd.date_range(end=datetime.now(), periods=level_points, freq='1min')
+            
+            # Generate more realistic audio levels
+            activity_spikes = np.random.normal(20, 5, level_points)  # Random activity
+            levels = base_level + activity_spikes
         
         ax.fill_between(times, base_level, levels, alpha=0.3, color='#3498db')
         ax.plot(times, levels, '-', color='#2980b9', linewidth=2)
@@ -683,17 +836,18 @@ class SecuritySystem(QMainWindow):
         self.audioLevelFigure.tight_layout()
         self.audioLevelCanvas.draw()
 
-    def updatePerformanceCharts(self):
-        """Update grafik kinerja"""
+    def updatePerformanceCharts(self, points=None):
+        """Update grafik kinerja (points: panjang seri metrik model)"""
         # Metrics Chart
         self.perfMetricsFigure.clear()
         ax = self.perfMetricsFigure.add_subplot(111)
-        times = pd.date_range(end=datetime.now(), periods=24, freq='h')
+        points = points or 24
+        times = pd.date_range(end=datetime.now(), periods=points, freq='h')
         
         metrics = {
-            'Akurasi': (np.random.uniform(0.85, 0.95, 24), '#2ecc71'),
-            'Presisi': (np.random.uniform(0.80, 0.90, 24), '#3498db'),
-            'Recall': (np.random.uniform(0.75, 0.85, 24), '#e67e22')
+            'Akurasi': (np.random.uniform(0.85, 0.95, points), '#2ecc71'),
+            'Presisi': (np.random.uniform(0.80, 0.90, points), '#3498db'),
+            'Recall': (np.random.uniform(0.75, 0.85, points), '#e67e22')
         }
         
         for metric, (values, color) in metrics.items():
@@ -710,19 +864,20 @@ class SecuritySystem(QMainWindow):
         self.perfMetricsFigure.tight_layout()
         self.perfMetricsCanvas.draw()
         
-        # Resource Usage
+        # Resource Usage dari sampler proses
         self.resourceUsageFigure.clear()
         ax = self.resourceUsageFigure.add_subplot(111)
         
+        samples = self.resourceSampler.history()
+        sample_times = [datetime.fromtimestamp(sample['timestamp']) for sample in samples]
         resources = {
-            'CPU': (np.random.uniform(20, 60, 24), '#3498db'),
-            'Memory': (np.random.uniform(30, 70, 24), '#2ecc71'),
-            'GPU': (np.random.uniform(10, 50, 24), '#e74c3c')
+            'CPU': ([sample['cpu_percent'] for sample in samples], '#3498db'),
+            'Memory': ([sample['memory_percent'] for sample in samples], '#2ecc71')
         }
         
         for resource, (values, color) in resources.items():
-            ax.fill_between(times, 0, values, label=resource, alpha=0.3, color=color)
-            ax.plot(times, values, color=color, linewidth=2)
+            ax.fill_between(sample_times, 0, values, label=resource, alpha=0.3, color=color)
+            ax.plot(sample_times, values, color=color, linewidth=2)
         
         ax.set_title('Penggunaan Sumber Daya', pad=20, fontsize=12, fontweight='bold')
         ax.set_xlabel('Waktu', fontsize=10)
@@ -774,6 +929,31 @@ class SecuritySystem(QMainWindow):
                 f"Terjadi kesalahan saat mengekspor data:\n{str(e)}"
             )
 
+    def exportHistory(self):
+        """Export riwayat deteksi 30 hari terakhir ke format kolumnar"""
+        try:
+            from history_export import export_history, default_export_format
+            
+            end = datetime.now()
+            start = end - timedelta(days=30)
+            filepath, total_rows = export_history(
+                self.history, start, end, fmt=default_export_format()
+            )
+            
+            QMessageBox.information(
+                self,
+                "Export Berhasil",
+                f"Riwayat deteksi berhasil diekspor:\n{filepath}\n\n"
+                f"Jumlah baris: {total_rows}"
+            )
+            
+        except Exception as e:
+            QMessageBox.critical(
+                self,
+                "Error Export",
+                f"Terjadi kesalahan saat mengekspor riwayat:\n{str(e)}"
+            )
+
     def refreshData(self):
         """Perbarui data dalam tabel dan grafik"""
         try:
@@ -800,54 +980,55 @@ class SecuritySystem(QMainWindow):
     def updateTables(self):
         """Update semua tabel dengan data terbaru"""
         try:
-            # Data untuk setiap tabel
-            tables_data = {
-                self.objectDetectionTable: [
-                    ['Orang', 'Kendaraan', 'Tas', 'Benda Mencurigakan'],
-                    (0.70, 0.99),
-                    ['Depan', 'Belakang', 'Samping', 'Dalam'],
-                    ['Normal', 'Perlu Perhatian', 'Mencurigakan']
-                ],
-                self.behaviorTable: [
-                    ['Normal', 'Mencurigakan', 'Berbahaya', 'Darurat'],
-                    (0.0, 1.0),
-                    (1, 60),
-                    ['Monitoring', 'Peringatan', 'Alarm', 'Evakuasi']
-                ],
-                self.anomalyTable: [
-                    (0.0, 1.0),
-                    ['Gerakan', 'Suara', 'Akses', 'Pola'],
-                    ['Rendah', 'Sedang', 'Tinggi', 'Kritis'],
-                    ['Pending', 'Diproses', 'Ditangani', 'Selesai']
-                ],
-                self.audioTable: [
-                    ['Normal', 'Berisik', 'Mencurigakan', 'Darurat'],
-                    (30, 100),
-                    ['Percakapan', 'Langkah Kaki', 'Tabrakan', 'Teriakan'],
-                    ['Depan', 'Belakang', 'Samping', 'Dalam']
-                ],
-                self.performanceTable: [
-                    (90.0, 99.9),
-                    (0.01, 0.05),
-                    (0.5, 2.0),
-                    (20, 80)
-                ]
-            }
-            
             # Update setiap tabel
-            for table, data_columns in tables_data.items():
+            for table, data_columns in self.tableDataColumns().items():
                 self.fillTableData(table, data_columns)
             
         except Exception as e:
             print(f"Kesalahan saat memperbarui tabel: {str(e)}")
 
+    def tableDataColumns(self):
+        """Definisi kolom data untuk setiap tabel evaluasi"""
+        return {
+            self.objectDetectionTable: [
+                ['Orang', 'Kendaraan', 'Tas', 'Benda Mencurigakan'],
+                (0.70, 0.99),
+                self.zones.names(),
+                ['Normal', 'Perlu Perhatian', 'Mencurigakan']
+            ],
+            self.behaviorTable: [
+                ['Normal', 'Mencurigakan', 'Berbahaya', 'Darurat'],
+                (0.0, 1.0),
+                (1, 60),
+                ['Monitoring', 'Peringatan', 'Alarm', 'Evakuasi']
+            ],
+            self.anomalyTable: [
+                (0.0, 1.0),
+                ['Gerakan', 'Suara', 'Akses', 'Pola'],
+                ['Rendah', 'Sedang', 'Tinggi', 'Kritis'],
+                ['Pending', 'Diproses', 'Ditangani', 'Selesai']
+            ],
+            self.audioTable: [
+                ['Normal', 'Berisik', 'Mencurigakan', 'Darurat'],
+                (30, 100),
+                ['Percakapan', 'Langkah Kaki', 'Tabrakan', 'Teriakan'],
+                self.zones.names()
+            ],
+            self.performanceTable: [
+                (90.0, 99.9),
+                (0.01, 0.05),
+                (0.5, 2.0),
+                (20, 80)
+            ]
+        }
+
     def fillTableData(self, table, data_columns):
         """Isi tabel dengan data"""
         try:
             current_time = datetime.now()
             
-            # Generate 15 baris data
-            for i in range(15):
+            # Isi semua baris tabel (default 15 baris)
+            for i in range(table.rowCount()):
                 # Set timestamp
                 timestamp = current_time - timedelta(minutes=i*5)
                 timestamp_item = QTableWidgetItem(timestamp.strftime("%Y-%m-%d %H:%M:%S"))
@@ -1168,6 +1349,81 @@ class SecuritySystem(QMainWindow):
         
         aiTabs.addTab(healthTab, "Health")
         
+        # 5. UI Responsiveness Tab
+        responsivenessTab = QWidget()
+        responsivenessLayout = QVBoxLayout(responsivenessTab)
+        
+        stallStats = QHBoxLayout()
+        self.stallCountLabel = QLabel("Total Stall: 0")
+        self.timerDriftLabel = QLabel("Timer Drift p99: 0 ms")
+        self.eventLatencyLabel = QLabel("Event Latency p99: 0 ms")
+        
+        for label in [self.stallCountLabel, self.timerDriftLabel, self.eventLatencyLabel]:
+            label.setStyleSheet("font-size: 14px; color: #2c3e50; padding: 5px;")
+            stallStats.addWidget(label)
+        
+        responsivenessLayout.addLayout(stallStats)
+        
+        # Histogram durasi stall
+        self.stallFigure = plt.figure(figsize=(10, 3))
+        self.stallCanvas = FigureCanvas(self.stallFigure)
+        responsivenessLayout.addWidget(self.stallCanvas)
+        
+        # Stall terakhir beserta pemanggil yang memblokir
+        self.stallTable = QTableWidget(0, 3)
+        self.stallTable.setHorizontalHeaderLabels(["Timestamp", "Durasi (ms)", "Pemanggil"])
+        self.formatTable(self.stallTable)
+        responsivenessLayout.addWidget(QLabel("Stall Terakhir"))
+        responsivenessLayout.addWidget(self.stallTable)
+        
+        aiTabs.addTab(responsivenessTab, "Responsiveness")
+        
+        # 6. Profiling Tab
+        profilingTab = QWidget()
+        profilingLayout = QVBoxLayout(profilingTab)
+        
+        durationLayout = QHBoxLayout()
+        durationLayout.addWidget(QLabel("Durasi Capture"))
+        self.profileDurationCombo = QComboBox()
+        self.profileDurationCombo.addItems(["10 detik", "30 detik", "60 detik", "300 detik"])
+        self.profileDurationCombo.setCurrentIndex(1)
+        durationLayout.addWidget(self.profileDurationCombo)
+        durationLayout.addStretch()
+        profilingLayout.addLayout(durationLayout)
+        
+        profileButtons = QHBoxLayout()
+        self.cprofileButton = QPushButton("⏱️ Capture cProfile")
+        self.cprofileButton.clicked.connect(self.startCProfileCapture)
+        self.samplerButton = QPushButton("🔬 Capture Stack Sampler")
+        self.samplerButton.clicked.connect(self.startStackSampling)
+        self.memoryButton = QPushButton("📸 Snapshot Memori")
+        self.memoryButton.clicked.connect(self.startMemoryCapture)
+        
+        for btn in [self.cprofileButton, self.samplerButton, self.memoryButton]:
+            btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #34495e;
+                    color: white;
+                    padding: 8px 15px;
+                    border-radius: 5px;
+                }
+                QPushButton:hover {
+                    background-color: #2c3e50;
+                }
+                QPushButton:disabled {
+                    background-color: #95a5a6;
+                }
+            """)
+            profileButtons.addWidget(btn)
+        profilingLayout.addLayout(profileButtons)
+        
+        # Daftar file hasil profiling
+        self.profileOutputList = QListWidget()
+        profilingLayout.addWidget(QLabel("Hasil Profiling"))
+        profilingLayout.addWidget(self.profileOutputList)
+        
+        aiTabs.addTab(profilingTab, "Profiling")
+        
         layout.addWidget(aiTabs)
         self.tabWidget.addTab(aiTab, "AI Maintenance")
         
@@ -1238,17 +1494,259 @@ class SecuritySystem(QMainWindow):
             # Update training progress
             self.trainingProgress.setValue(90)
             
-            # Update system health
-            self.cpuProgress.setValue(45)
-            self.memoryProgress.setValue(60)
-            self.responseProgress.setValue(25)
+            # Update system health dari sampel sumber daya terakhir
+            sample = self.resourceSampler.latest()
+            if sample:
+                self.cpuProgress.setValue(min(100, int(sample['cpu_percent'])))
+                self.cpuProgress.setFormat(f"{sample['cpu_percent']:.1f}%")
+                self.memoryProgress.setValue(min(100, int(sample['memory_percent'])))
+                self.memoryProgress.setFormat(
+                    f"{sample['rss_bytes'] / 1048576:.0f} MB ({sample['memory_percent']:.1f}%)")
+            
+            # Response time: p95 pipeline terhadap anggaran waktu respons
+            total = self.latency.histograms["total"]
+            p95 = total.percentile_ms(95)
+            self.responseProgress.setValue(min(100, int(p95 / RESPONSE_BUDGET_MS * 100)))
+            self.responseProgress.setFormat(f"{p95:.1f} ms (p95)")
             
             # Update tables
             self.updateAITables()
             
+            # Update metrik responsivitas UI
+            self.updateResponsivenessMetrics()
+            
         except Exception as e:
             print(f"Error updating AI metrics: {str(e)}")
             
+    def setupCameraPipeline(self):
+        """Jalankan worker akuisisi per kamera dan timer thumbnail grid"""
+        try:
+            sources = {}
+            if os.path.exists(CAMERA_SOURCES_CONFIG):
+                with open(CAMERA_SOURCES_CONFIG, encoding="utf-8") as f:
+                    sources = json.load(f)
+            
+            width, height = CAMERA_FRAME_SIZE
+            self.cameraPipeline = CameraPipeline(
+                [camera for zone, camera in self.zones.cameras()],
+                width=width, height=height, fps=CAMERA_FPS, sources=sources,
+                synthetic=SYNTHETIC_SOURCES
+            )
+            if self.cameraPipeline.skipped:
+                self.logList.insertItem(
+                    0, f"📷 Kamera tanpa sumber dilewati: {', '.join(self.cameraPipeline.skipped)}")
+            self.showCameraPage(self.cameraPage)
+            if not self.cameraPipeline.workers:
+                return
+            self.cameraPipeline.start()
+        except Exception as e:
+            print(f"Error saat inisialisasi pipeline kamera: {str(e)}")
+            self.cameraPipeline = None
+            return
+        
+        # Frame terbaru disaring motion gate sebelum analisis gerakan
+        self.visionSeen = {}
+        self.visionTimer = QTimer()
+        self.visionTimer.timeout.connect(self.updateVision)
+        self.visionTimer.start(VISION_INTERVAL_MS)
+        
+        # Thumbnail dibatasi ke laju yang bisa ditampilkan, berhenti di mode latar
+        self.thumbnailTimer = QTimer()
+        self.thumbnailTimer.timeout.connect(self.updateCameraThumbnails)
+        self.thumbnailTimer.start(int(1000 / THUMBNAIL_FPS))
+        self.uiTimers.append(self.thumbnailTimer)
+
+    def setupAudioPipeline(self):
+        """Jalankan akuisisi audio semua mikrofon dan timer ekstraksi fitur"""
+        try:
+            sources = {}
+            if os.path.exists(MICROPHONE_SOURCES_CONFIG):
+                with open(MICROPHONE_SOURCES_CONFIG, encoding="utf-8") as f:
+                    sources = json.load(f)
+            
+            self.audioPipeline = AudioPipeline(self.zones.names(), sources=sources,
+                                               synthetic=SYNTHETIC_SOURCES)
+            if self.audioPipeline.skipped:
+                self.logList.insertItem(
+                    0, f"🎙️ Mikrofon tanpa sumber dilewati: {', '.join(self.audioPipeline.skipped)}")
+            if not self.audioPipeline.microphones:
+                self.audioPipeline = None
+                return
+            self.audioPipeline.start()
+            self.engine.audio = self.audioPipeline
+        except Exception as e:
+            print(f"Error saat inisialisasi pipeline audio: {str(e)}")
+            self.audioPipeline = None
+            return
+        
+        # Fitur dihitung per batch, tetap berjalan di mode latar
+        self.audioTimer = QTimer()
+        self.audioTimer.timeout.connect(self.engine.process_audio)
+        self.audioTimer.start(AUDIO_INTERVAL_MS)
+
+    def setupNotifications(self):
+        """Aktifkan pengirim notifikasi jika kanalnya dikonfigurasi"""
+        try:
+            if os.path.exists(NOTIFICATION_CONFIG):
+                with open(NOTIFICATION_CONFIG, encoding="utf-8") as f:
+                    self.engine.notifier = create_notifier(json.load(f))
+                self.logList.insertItem(0, f"📨 Notifikasi aktif: {len(self.engine.notifier.channels)} kanal")
+        except Exception as e:
+            print(f"Error saat inisialisasi notifikasi: {str(e)}")
+
+    def updateVision(self):
+        """Teruskan frame kamera baru ke pipeline visi mesin keamanan"""
+        try:
+            self.engine.analyze_vision(self.cameraPipeline.latest_frames(self.visionSeen))
+        except Exception as e:
+            print(f"Error dalam pipeline visi: {str(e)}")
+
+    def updateCameraThumbnails(self):
+        """Gambar thumbnail terbaru untuk kamera di halaman grid yang tampil"""
+        width, height = THUMBNAIL_SIZE
+        for camera, (cameraFrame, title, preview, status) in zip(self.cameraTileIds, self.cameraTiles):
+            thumb = self.cameraPipeline.thumbnail(camera, width, height)
+            if thumb is None:
+                continue
+            # QImage membungkus buffer thumbnail langsung, thumb tetap direferensikan selama konversi
+            image = QImage(thumb.data, thumb.shape[1], thumb.shape[0], thumb.strides[0],
+                           QImage.Format_RGB888)
+            preview.setPixmap(QPixmap.fromImage(image))
+
+    def setupWatchdog(self):
+        """Inisialisasi pengawas event loop untuk mendeteksi stall UI"""
+        try:
+            from ui_watchdog import EventLoopWatchdog
+            
+            self.watchdog = EventLoopWatchdog(
+                interval_ms=WATCHDOG_INTERVAL_MS,
+                stall_threshold_ms=WATCHDOG_STALL_THRESHOLD_MS,
+                parent=self
+            )
+            self.watchdog.start()
+        except Exception as e:
+            print(f"Error saat inisialisasi watchdog UI: {str(e)}")
+            self.watchdog = None
+
+    def updateResponsivenessMetrics(self):
+        """Update metrik responsivitas UI dari watchdog"""
+        if self.watchdog is None:
+            return
+        
+        summary = self.watchdog.summary()
+        self.stallCountLabel.setText(f"Total Stall: {summary['stall_count']}")
+        self.timerDriftLabel.setText(f"Timer Drift p99: {summary['timer_drift']['p99']:.1f} ms")
+        self.eventLatencyLabel.setText(f"Event Latency p99: {summary['event_delivery']['p99']:.1f} ms")
+        
+        # Histogram durasi stall
+        durations = [stall['duration_ms'] for stall in summary['recent_stalls']
+                     if stall['duration_ms'] is not None]
+        self.stallFigure.clear()
+        ax = self.stallFigure.add_subplot(111)
+        if durations:
+            ax.hist(durations, bins=20, color='#e67e22')
+        ax.axvline(x=WATCHDOG_STALL_THRESHOLD_MS, color='#e74c3c', linestyle='--', label='Ambang Stall')
+        ax.set_title('Distribusi Durasi Stall')
+        ax.set_xlabel('Durasi (ms)')
+        ax.set_ylabel('Jumlah')
+        ax.legend()
+        self.stallCanvas.draw()
+        
+        # Tabel stall terbaru, pemanggil diambil dari frame terdalam
+        stalls = list(reversed(summary['recent_stalls']))[:20]
+        self.stallTable.setRowCount(len(stalls))
+        for i, stall in enumerate(stalls):
+            timestamp = datetime.fromtimestamp(stall['timestamp']).strftime("%Y-%m-%d %H:%M:%S")
+            duration = "berjalan" if stall['duration_ms'] is None else f"{stall['duration_ms']:.0f}"
+            if stall.get('interrupted'):
+                duration += " (terputus pause)"
+            caller = stall['stack'][-1].strip().splitlines()[0] if stall['stack'] else "-"
+            caller_item = QTableWidgetItem(caller)
+            caller_item.setToolTip("".join(stall['stack']))
+            self.stallTable.setItem(i, 0, QTableWidgetItem(timestamp))
+            self.stallTable.setItem(i, 1, QTableWidgetItem(duration))
+            self.stallTable.setItem(i, 2, caller_item)
+
+    def getProfilingManager(self):
+        """Buat profiling manager saat pertama kali dibutuhkan"""
+        if not hasattr(self, 'profilingManager'):
+            from profiling_tools import ProfilingManager
+            self.profilingManager = ProfilingManager()
+        return self.profilingManager
+
+    def profileDurationMs(self):
+        """Durasi capture profiling terpilih dalam milidetik"""
+        return int(self.profileDurationCombo.currentText().split()[0]) * 1000
+
+    def addProfileOutput(self, text):
+        """Tambahkan hasil profiling ke daftar"""
+        current_time = datetime.now().strftime("%H:%M:%S")
+        self.profileOutputList.insertItem(0, f"{current_time} - {text}")
+
+    def startCProfileCapture(self):
+        """Mulai capture cProfile terbatas waktu pada thread GUI"""
+        try:
+            if self.getProfilingManager().start_cprofile():
+                self.cprofileButton.setEnabled(False)
+                self.addProfileOutput("cProfile dimulai")
+                QTimer.singleShot(self.profileDurationMs(), self.stopCProfileCapture)
+        except Exception as e:
+            print(f"Error dalam capture cProfile: {str(e)}")
+
+    def stopCProfileCapture(self):
+        """Hentikan capture cProfile dan simpan hasilnya"""
+        try:
+            filepath = self.getProfilingManager().stop_cprofile()
+            if filepath:
+                self.addProfileOutput(f"cProfile disimpan: {filepath}")
+        except Exception as e:
+            print(f"Error dalam menyimpan cProfile: {str(e)}")
+        finally:
+            self.cprofileButton.setEnabled(True)
+
+    def startStackSampling(self):
+        """Mulai stack sampler terbatas waktu"""
+        try:
+            if self.getProfilingManager().start_sampler():
+                self.samplerButton.setEnabled(False)
+                self.addProfileOutput("Stack sampler dimulai")
+                QTimer.singleShot(self.profileDurationMs(), self.stopStackSampling)
+        except Exception as e:
+            print(f"Error dalam stack sampling: {str(e)}")
+
+    def stopStackSampling(self):
+        """Hentikan stack sampler dan simpan hasil collapsed-stack"""
+        try:
+            filepath = self.getProfilingManager().stop_sampler()
+            if filepath:
+                self.addProfileOutput(f"Stack sampler disimpan: {filepath}")
+        except Exception as e:
+            print(f"Error dalam menyimpan stack sampler: {str(e)}")
+        finally:
+            self.samplerButton.setEnabled(True)
+
+    def startMemoryCapture(self):
+        """Aktifkan tracemalloc terbatas waktu dengan snapshot baseline"""
+        try:
+            if self.getProfilingManager().start_tracemalloc():
+                self.memoryButton.setEnabled(False)
+                self.addProfileOutput("tracemalloc aktif, baseline snapshot diambil")
+                QTimer.singleShot(self.profileDurationMs(), self.takeMemorySnapshot)
+        except Exception as e:
+            print(f"Error dalam snapshot memori: {str(e)}")
+
+    def takeMemorySnapshot(self):
+        """Simpan selisih alokasi top-N terhadap baseline lalu hentikan tracemalloc"""
+        try:
+            filepath = self.getProfilingManager().memory_snapshot()
+            if filepath:
+                self.addProfileOutput(f"Selisih alokasi disimpan: {filepath}")
+        except Exception as e:
+            print(f"Error dalam snapshot memori: {str(e)}")
+        finally:
+            self.getProfilingManager().stop_tracemalloc()
+            self.memoryButton.setEnabled(True)
+
     def updateAITables(self):
         """Update tabel-tabel dalam AI maintenance tab"""
         # Update model updates table
@@ -1327,6 +1825,12 @@ class SecuritySystem(QMainWindow):
         }
         self.alarmActive = False
         self.currentMode = "Normal"
+        
+        # Mode latar: event UI ditahan selama jendela tersembunyi/minimize
+        self.backgroundMode = False
+        self.backgroundSince = None
+        self.pendingLogMessages = deque(maxlen=100)
+        self.pendingStatusEvents = {}
 
     def setupTimers(self):
         """Setup timer untuk update otomatis"""
@@ -1354,6 +1858,9 @@ class SecuritySystem(QMainWindow):
         self.tableTimer = QTimer()
         self.tableTimer.timeout.connect(self.updateTables)
         self.tableTimer.start(300000)  # Update setiap 5 menit
+        
+        # Timer yang hanya memperbarui tampilan, dihentikan pada mode latar
+        self.uiTimers = [self.statusTimer, self.timestampTimer, self.tableTimer]
 
     def updateStatus(self):
         """Update status sistem"""
@@ -1363,45 +1870,30 @@ class SecuritySystem(QMainWindow):
     def simulateActivity(self):
         """Simulasi aktivitas sistem"""
         try:
-            # Get real readings from dummy devices
-            sensor_readings = self.devices.get_all_sensor_readings()
-            actuator_status = self.devices.get_all_actuator_status()
-            
-            # Update log dengan data sensor
-            current_time = datetime.now().strftime("%H:%M:%S")
-            
-            # Check PIR sensor
-            if sensor_readings['pir'] > 0.7:
-                self.logList.insertItem(0, f"🚨 {current_time} - Gerakan terdeteksi! (PIR: {sensor_readings['pir']:.2f})")
-                self.devices.trigger_alarm()
-            
-            # Check magnetic sensor
-            if sensor_readings['magnetic'] > 0.8:
-                self.logList.insertItem(0, f"🚪 {current_time} - Pintu/jendela terbuka! (Magnetic: {sensor_readings['magnetic']:.2f})")
-                self.devices.trigger_alarm()
-            
-            # Check vibration
-            if sensor_readings['vibration'] > 80:
-                self.logList.insertItem(0, f"📳 {current_time} - Getaran kuat terdeteksi! (Vibration: {sensor_readings['vibration']:.2f})")
-                self.devices.trigger_alarm()
+            self.engine.check_sensors()
             
             # Limit log items
             while self.logList.count() > 100:
                 self.logList.takeItem(self.logList.count() - 1)
-            
-            # Update status sistem
-            system_status = "NORMAL"
-            status_color = "#27ae60"
-            
-            if any([
-                sensor_readings['pir'] > 0.7,
-                sensor_readings['magnetic'] > 0.8,
-                sensor_readings['vibration'] > 80
-            ]):
-                system_status = "WASPADA"
-                status_color = "#e74c3c"
-            
-            self.statusLabel.setText(f"Status: {system_status}")
+        except Exception as e:
+            print(f"Error dalam simulasi aktivitas: {str(e)}")
+
+    def onEngineEvent(self, event):
+        """Tampilkan event dari mesin keamanan di UI"""
+        if self.backgroundMode:
+            # Tahan event sampai jendela tampil lagi, status cukup yang terakhir
+            if event["kind"] in ("log", "group_result"):
+                self.pendingLogMessages.append(event["message"])
+            else:
+                self.pendingStatusEvents.pop(event["kind"], None)
+                self.pendingStatusEvents[event["kind"]] = event
+            return
+        
+        if event["kind"] in ("log", "group_result"):
+            self.logList.insertItem(0, event["message"])
+        elif event["kind"] == "sensor_status":
+            status_color = event["color"]
+            self.statusLabel.setText(f"Status: {event['status']}")
             self.statusLabel.setStyleSheet(f"""
                 font-size: 18px;
                 color: {status_color};
@@ -1409,126 +1901,18 @@ class SecuritySystem(QMainWindow):
                 border: 2px solid {status_color};
                 border-radius: 5px;
             """)
-        except Exception as e:
-            print(f"Error dalam simulasi aktivitas: {str(e)}")
+        elif event["kind"] == "security_status":
+            self.updateSecurityStatus(event["status"])
 
     def setupAI(self):
         """Inisialisasi sistem AI untuk keamanan rumah dengan machine learning"""
+        self.engineEvent.connect(self.onEngineEvent)
         try:
-            class SecurityAI:
-                def __init__(self):
-                    self.threat_level = "Aman"
-                    self.last_detection = None
-                    self.active_zones = ["Depan", "Belakang", "Samping", "Dalam"]
-                    self.training_data = []
-                    self.model_version = 1.0
-                    self.last_training = datetime.now()
-                    self.false_positives = []
-                    self.false_negatives = []
-                
-                def analyze_motion(self, sensor_data):
-                    """Analisis gerakan dengan machine learning"""
-                    result = {
-                        "status": "Normal",
-                        "location": "Depan",
-                        "confidence": 0.95,
-                        "type": "Orang",
-                        "action": "Berjalan"
-                    }
-                    return result
-                
-                def collect_training_data(self, sensor_data, result, label=None):
-                    """Mengumpulkan data untuk training"""
-                    training_instance = {
-                        "timestamp": datetime.now(),
-                        "sensor_data": sensor_data,
-                        "result": result,
-                        "label": label,
-                        "verified": False
-                    }
-                    self.training_data.append(training_instance)
-                    
-                    # Batasi ukuran data training
-                    if len(self.training_data) > 1000:
-                        self.training_data = self.training_data[-1000:]
-                
-                def update_model(self):
-                    """Update model dengan data baru"""
-                    if len(self.training_data) >= 100:  # Minimal 100 data untuk update
-                        try:
-                            # Simulasi update model
-                            self.model_version += 0.1
-                            self.last_training = datetime.now()
-                            # Reset data training setelah update
-                            self.training_data = []
-                            return {
-                                "status": "Success",
-                                "new_version": self.model_version,
-                                "accuracy": 0.95
-                            }
-                        except Exception as e:
-                            return {
-                                "status": "Failed",
-                                "error": str(e)
-                            }
-                    return {"status": "Insufficient data"}
-                
-                def validate_detection(self, detection_id, is_correct):
-                    """Validasi deteksi untuk pembelajaran"""
-                    if not is_correct:
-                        if detection_id in self.training_data:
-                            if self.training_data[detection_id]["result"]["status"] == "Normal":
-                                self.false_negatives.append(detection_id)
-                            else:
-                                self.false_positives.append(detection_id)
-                
-                def get_model_metrics(self):
-                    """Dapatkan metrik performa model"""
-                    return {
-                        "version": self.model_version,
-                        "last_training": self.last_training,
-                        "training_data_size": len(self.training_data),
-                        "false_positives": len(self.false_positives),
-                        "false_negatives": len(self.false_negatives)
-                    }
-                
-                def adaptive_learning(self, new_pattern):
-                    """Pembelajaran adaptif untuk pola baru"""
-                    self.collect_training_data(new_pattern, None, "new_pattern")
-                    if len(self.training_data) >= 50:  # Update lebih cepat untuk pola baru
-                        return self.update_model()
-                    return {"status": "Collecting data"}
-
-                def detect_intrusion(self, sensor_data):
-                    """Deteksi penyusupan"""
-                    return {
-                        "detected": False,
-                        "location": "Depan",
-                        "threat_level": "Rendah"
-                    }
-
-                def analyze_sound(self, sensor_data):
-                    """Analisis suara"""
-                    return {
-                        "is_threat": False,
-                        "type": "Normal",
-                        "level_db": 45.0
-                    }
-
-                def get_security_status(self):
-                    """Dapatkan status keamanan"""
-                    return {
-                        "overall_status": "Aman",
-                        "last_check": datetime.now().strftime("%H:%M:%S")
-                    }
-
-            # Coba import modul AI keamanan, jika gagal gunakan implementasi default
-            try:
-                from security_ai_model import AdvancedSecurityAI
-                self.ai_system = AdvancedSecurityAI()
-            except ImportError:
-                print("Info: Menggunakan sistem AI keamanan default dengan machine learning")
-                self.ai_system = SecurityAI()
+            # Mesin keamanan tanpa Qt, GUI hanya menjadi klien event-nya
+            self.engine = SecurityEngine(self.devices, history=self.history, latency=self.latency,
+                                         zones=self.zones, recorder=EventRecorder())
+            self.engine.add_listener(self.engineEvent.emit)
+            self.ai_system = self.engine.ai_system
             
             # Timer untuk monitoring
             self.monitoringTimer = QTimer()
@@ -1547,60 +1931,23 @@ class SecuritySystem(QMainWindow):
             
             self.logList.insertItem(0, "🤖 Sistem AI Keamanan aktif dengan pembelajaran mesin")
             
+            # Kedalaman antrean data training ikut dipantau sampler
+            self.resourceSampler.register_queue(
+                "training_data", lambda: len(self.ai_system.training_data))
+            
         except Exception as e:
             print(f"Error saat inisialisasi AI Keamanan: {str(e)}")
-            self.ai_system = SecurityAI()
+            self.engine = SecurityEngine(self.devices, ai_system=SecurityAI(self.zones.names()),
+                                         history=self.history, latency=self.latency,
+                                         zones=self.zones)
+            self.engine.add_listener(self.engineEvent.emit)
+            self.ai_system = self.engine.ai_system
             self.logList.insertItem(0, "⚠️ Menggunakan sistem AI default karena terjadi error")
 
     def updateSecurity(self):
         """Update status keamanan real-time"""
         try:
-            # Dapatkan data sensor
-            sensor_data = self.devices.get_all_sensor_readings()
-            
-            # Analisis gerakan
-            try:
-                motion_result = self.ai_system.analyze_motion(sensor_data)
-                if motion_result["status"] != "Normal":
-                    self.logList.insertItem(0, 
-                        f"👥 Terdeteksi {motion_result['type']} {motion_result['action']} " +
-                        f"di area {motion_result['location']} " +
-                        f"(Kepercayaan: {motion_result['confidence']:.2f})"
-                    )
-            except Exception as e:
-                print(f"Error dalam analisis gerakan: {str(e)}")
-            
-            # Deteksi penyusupan
-            try:
-                intrusion_result = self.ai_system.detect_intrusion(sensor_data)
-                if intrusion_result["detected"]:
-                    self.logList.insertItem(0,
-                        f"🚨 PERINGATAN: Terdeteksi penyusupan di {intrusion_result['location']}! " +
-                        f"Level ancaman: {intrusion_result['threat_level']}"
-                    )
-                    if intrusion_result["threat_level"] in ["Tinggi", "Kritis"]:
-                        self.devices.trigger_alarm()
-            except Exception as e:
-                print(f"Error dalam deteksi penyusupan: {str(e)}")
-            
-            # Analisis suara
-            try:
-                audio_result = self.ai_system.analyze_sound(sensor_data)
-                if audio_result["is_threat"]:
-                    self.logList.insertItem(0,
-                        f"🔊 Terdeteksi suara mencurigakan: {audio_result['type']} " +
-                        f"({audio_result['level_db']} dB)"
-                    )
-            except Exception as e:
-                print(f"Error dalam analisis suara: {str(e)}")
-            
-            # Update status keamanan
-            try:
-                security_status = self.ai_system.get_security_status()
-                self.updateSecurityStatus(security_status)
-            except Exception as e:
-                print(f"Error dalam update status keamanan: {str(e)}")
-            
+            self.engine.update_security()
         except Exception as e:
             print(f"Error dalam update keamanan: {str(e)}")
             # Tampilkan pesan error ke user
@@ -1610,6 +1957,19 @@ class SecuritySystem(QMainWindow):
                 f"Terjadi kesalahan dalam sistem keamanan:\n{str(e)}"
             )
 
+    def activateAlarm(self):
+        """Aktifkan alarm secara manual"""
+        self.logList.insertItem(0, f"🚨 {datetime.now().strftime('%H:%M:%S')} - Alarm diaktifkan manual")
+        self.engine.activate_alarm()
+
+    def lockAllDoors(self):
+        """Kunci semua pintu; hasil gabungan muncul di log saat selesai"""
+        self.engine.lock_all_doors()
+
+    def requestHelp(self):
+        """Kirim permintaan bantuan"""
+        self.engine.request_help()
+
     def analyzeBehavior(self):
         """Analisis pola perilaku mencurigakan"""
         try:
@@ -1622,7 +1982,7 @@ class SecuritySystem(QMainWindow):
                     )
                     
                     if behavior_result["frequency"] == "Tinggi":
-                        self.devices.trigger_alarm()
+                        self.engine.trigger_alarm()
         except Exception as e:
             print(f"Error dalam analisis perilaku: {str(e)}")
 
@@ -1670,192 +2030,110 @@ class SecuritySystem(QMainWindow):
                 timestamp_item.setFont(font)
                 table.setItem(i, 0, timestamp_item)
 
+    def enterBackgroundMode(self):
+        """Hentikan semua pekerjaan UI, akuisisi dan deteksi tetap berjalan"""
+        if self.backgroundMode:
+            return
+        self.backgroundMode = True
+        self.backgroundSince = time.monotonic()
+        
+        for timer in self.uiTimers:
+            timer.stop()
+        if self.watchdog is not None:
+            self.watchdog.pause()
+
+    def exitBackgroundMode(self):
+        """Kembali ke mode normal dengan satu refresh gabungan"""
+        if not self.backgroundMode:
+            return
+        self.backgroundMode = False
+        hidden_ms = (time.monotonic() - self.backgroundSince) * 1000
+        
+        # Log yang tertahan dimasukkan sekaligus, terlama lebih dulu
+        self.logList.setUpdatesEnabled(False)
+        try:
+            while self.pendingLogMessages:
+                self.logList.insertItem(0, self.pendingLogMessages.popleft())
+            while self.logList.count() > 100:
+                self.logList.takeItem(self.logList.count() - 1)
+        finally:
+            self.logList.setUpdatesEnabled(True)
+        
+        # Hanya status terakhir yang perlu ditampilkan
+        status_events = list(self.pendingStatusEvents.values())
+        self.pendingStatusEvents.clear()
+        for event in status_events:
+            self.onEngineEvent(event)
+        
+        self.updateStatus()
+        if hidden_ms >= self.tableTimer.interval():
+            self.updateTables()
+        self.updateTableTimestamps()
+        
+        for timer in self.uiTimers:
+            timer.start()
+        if self.watchdog is not None:
+            self.watchdog.resume()
+
+    def hideEvent(self, event):
+        """Masuk mode latar saat jendela disembunyikan"""
+        super().hideEvent(event)
+        self.enterBackgroundMode()
+
+    def showEvent(self, event):
+        """Keluar dari mode latar saat jendela tampil lagi"""
+        super().showEvent(event)
+        if not self.isMinimized():
+            self.exitBackgroundMode()
+
+    def changeEvent(self, event):
+        """Minimize juga dianggap mode latar"""
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            if self.isMinimized():
+                self.enterBackgroundMode()
+            elif self.isVisible():
+                self.exitBackgroundMode()
+
     def closeEvent(self, event):
         """Handle window close event"""
-        # Reset all actuators before closing
-        self.devices.reset_alarm()
+        # Reset alarm lewat dispatcher agar urut dengan perintah yang masih antre
+        self.engine.reset_alarm()
+        self.engine.actuators.flush(timeout=2.0)
         self.hide()
         event.ignore()  # Prevent the window from being destroyed
 
     def maintainAI(self):
         """Maintenance rutin sistem AI keamanan"""
-        try:
-            # 1. Analisis Pola Keamanan
-            security_patterns = self.analyzeSecurityPatterns()
-            if security_patterns["new_patterns_found"]:
-                self.logList.insertItem(0, 
-                    f"🔍 Pola baru terdeteksi: {security_patterns['pattern_description']}")
-                self.ai_system.adaptive_learning(security_patterns["pattern_data"])
-
-            # 2. Evaluasi Akurasi Deteksi
-            detection_metrics = self.evaluateDetectionAccuracy()
-            self.logList.insertItem(0,
-                f"📊 Akurasi Deteksi - Orang: {detection_metrics['person_accuracy']}%, " +
-                f"Kendaraan: {detection_metrics['vehicle_accuracy']}%, " +
-                f"Objek: {detection_metrics['object_accuracy']}%")
-
-            # 3. Analisis Zona Keamanan
-            zone_analysis = self.analyzeSecurityZones()
-            for zone, status in zone_analysis["vulnerable_zones"].items():
-                if status["risk_level"] > 0.7:
-                    self.logList.insertItem(0,
-                        f"⚠️ Zona {zone} memerlukan perhatian - " +
-                        f"Risiko: {status['risk_level']:.2f}, " +
-                        f"Alasan: {status['reason']}")
-
-            # 4. Optimasi Sensor
-            sensor_optimization = self.optimizeSensors()
-            if sensor_optimization["adjustments_needed"]:
-                self.logList.insertItem(0,
-                    f"🔧 Rekomendasi penyesuaian sensor: {sensor_optimization['recommendations']}")
-
-            # 5. Analisis Waktu Respons
-            response_analysis = self.analyzeResponseTimes()
-            self.logList.insertItem(0,
-                f"⚡ Waktu respons rata-rata: {response_analysis['avg_response_time']}ms, " +
-                f"Keterlambatan: {response_analysis['delayed_responses']}")
-
-            # 6. Pembaruan Knowledge Base
-            kb_update = self.updateKnowledgeBase()
-            if kb_update["new_entries"]:
-                self.logList.insertItem(0,
-                    f"📚 Knowledge base diperbarui dengan {kb_update['new_entries']} kasus baru")
-
-        except Exception as e:
-            print(f"Error dalam maintenance AI: {str(e)}")
+        self.engine.maintain()
 
     def analyzeSecurityPatterns(self):
         """Analisis pola keamanan baru"""
-        try:
-            return {
-                "new_patterns_found": True,
-                "pattern_description": "Aktivitas berulang di zona belakang pukul 02:00-03:00",
-                "pattern_data": {
-                    "time_range": "02:00-03:00",
-                    "location": "belakang",
-                    "frequency": "daily",
-                    "confidence": 0.85
-                }
-            }
-        except Exception as e:
-            print(f"Error dalam analisis pola: {str(e)}")
-            return {"new_patterns_found": False}
+        return self.engine.analyze_security_patterns()
 
     def evaluateDetectionAccuracy(self):
         """Evaluasi akurasi deteksi berbagai objek"""
-        try:
-            return {
-                "person_accuracy": 95,
-                "vehicle_accuracy": 92,
-                "object_accuracy": 88,
-                "false_positives": {
-                    "person": 0.03,
-                    "vehicle": 0.05,
-                    "object": 0.07
-                },
-                "false_negatives": {
-                    "person": 0.02,
-                    "vehicle": 0.03,
-                    "object": 0.05
-                }
-            }
-        except Exception as e:
-            print(f"Error dalam evaluasi akurasi: {str(e)}")
-            return {"person_accuracy": 0, "vehicle_accuracy": 0, "object_accuracy": 0}
+        return self.engine.evaluate_detection_accuracy()
 
     def analyzeSecurityZones(self):
         """Analisis kerentanan zona keamanan"""
-        try:
-            return {
-                "vulnerable_zones": {
-                    "depan": {
-                        "risk_level": 0.3,
-                        "reason": "Pencahayaan cukup"
-                    },
-                    "belakang": {
-                        "risk_level": 0.8,
-                        "reason": "Pencahayaan kurang & blind spot terdeteksi"
-                    },
-                    "samping": {
-                        "risk_level": 0.5,
-                        "reason": "Jarak sensor optimal"
-                    }
-                },
-                "recommendations": {
-                    "belakang": "Tambah pencahayaan dan sensor sudut"
-                }
-            }
-        except Exception as e:
-            print(f"Error dalam analisis zona: {str(e)}")
-            return {"vulnerable_zones": {}}
+        return self.engine.analyze_security_zones()
 
     def optimizeSensors(self):
         """Optimasi penempatan dan sensitivitas sensor"""
-        try:
-            return {
-                "adjustments_needed": True,
-                "recommendations": [
-                    "Sesuaikan sensitivitas PIR belakang: +15%",
-                    "Rotasi kamera depan: +10° horizontal",
-                    "Kalibrasi sensor gerak samping"
-                ],
-                "sensor_health": {
-                    "pir": 0.95,
-                    "camera": 0.98,
-                    "motion": 0.92
-                }
-            }
-        except Exception as e:
-            print(f"Error dalam optimasi sensor: {str(e)}")
-            return {"adjustments_needed": False}
+        return self.engine.optimize_sensors()
 
     def analyzeResponseTimes(self):
-        """Analisis waktu respons sistem"""
-        try:
-            return {
-                "avg_response_time": 150,
-                "delayed_responses": 2,
-                "response_breakdown": {
-                    "detection": 50,
-                    "analysis": 45,
-                    "decision": 35,
-                    "action": 20
-                },
-                "bottlenecks": ["Analisis video pada malam hari"]
-            }
-        except Exception as e:
-            print(f"Error dalam analisis respons: {str(e)}")
-            return {"avg_response_time": 0, "delayed_responses": 0}
+        """Analisis waktu respons sistem dari histogram latensi pipeline"""
+        return self.engine.analyze_response_times()
 
     def updateKnowledgeBase(self):
         """Update basis pengetahuan sistem"""
-        try:
-            return {
-                "new_entries": 5,
-                "categories": {
-                    "normal_activity": 2,
-                    "suspicious_patterns": 2,
-                    "environmental": 1
-                },
-                "total_cases": 1250,
-                "learning_rate": 0.92
-            }
-        except Exception as e:
-            print(f"Error dalam update knowledge base: {str(e)}")
-            return {"new_entries": 0}
+        return self.engine.update_knowledge_base()
 
     def validateModel(self):
         """Validasi performa model"""
-        try:
-            metrics = self.ai_system.get_model_metrics()
-            total_errors = metrics['false_positives'] + metrics['false_negatives']
-            
-            if total_errors > 10:  # Terlalu banyak error
-                self.logList.insertItem(0, "⚠️ Performa model menurun, memulai pembelajaran adaptif")
-                self.ai_system.adaptive_learning(self.devices.get_all_sensor_readings())
-            
-        except Exception as e:
-            print(f"Error dalam validasi model: {str(e)}")
+        self.engine.validate_model()
 
     def setupAISecurityEvaluationTab(self):
         """Setup tab evaluasi AI keamanan rumah"""
@@ -1991,102 +2269,7 @@ class SecuritySystem(QMainWindow):
     def exportSecurityReport(self):
         """Export laporan evaluasi keamanan ke Excel"""
         try:
-            # Buat workbook baru
-            wb = Workbook()
-            
-            # Sheet 1: Evaluasi Keamanan Umum
-            ws1 = wb.active
-            ws1.title = "Evaluasi Keamanan"
-            
-            # Header
-            headers = ["Komponen", "Status", "Akurasi", "Risiko", "Maintenance", "Rekomendasi"]
-            for col, header in enumerate(headers, 1):
-                cell = ws1.cell(row=1, column=col)
-                cell.value = header
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                cell.font = Font(color="FFFFFF", bold=True)
-            
-            # Data dari tabel
-            for i in range(self.securityTable.rowCount()):
-                for j in range(self.securityTable.columnCount()):
-                    item = self.securityTable.item(i, j)
-                    if item:
-                        ws1.cell(row=i+2, column=j+1).value = item.text()
-            
-            # Sheet 2: Analisis AI
-            ws2 = wb.create_sheet("Analisis AI")
-            
-            # Data AI
-            ai_data = [
-                ["Metrik", "Nilai", "Status"],
-                ["Akurasi Model", "98%", "Optimal"],
-                ["False Positives", "0.02%", "Baik"],
-                ["False Negatives", "0.01%", "Baik"],
-                ["Response Time", "50ms", "Optimal"],
-                ["Model Version", "2.1", "Updated"],
-                ["Training Data", "10000 samples", "Sufficient"],
-                ["Last Update", datetime.now().strftime("%Y-%m-%d %H:%M"), "Recent"]
-            ]
-            
-            for row in ai_data:
-                ws2.append(row)
-            
-            # Sheet 3: Sensor Status
-            ws3 = wb.create_sheet("Status Sensor")
-            
-            # Data sensor
-            sensor_data = [
-                ["Sensor", "Status", "Akurasi", "Maintenance"],
-                ["Kamera Depan", "Active", "99%", "None"],
-                ["Kamera Belakang", "Active", "98%", "None"],
-                ["PIR Sensor", "Active", "95%", "Calibrate"],
-                ["Motion Sensor", "Active", "97%", "None"],
-                ["Door Sensor", "Active", "100%", "None"]
-            ]
-            
-            for row in sensor_data:
-                ws3.append(row)
-            
-            # Sheet 4: Rekomendasi
-            ws4 = wb.create_sheet("Rekomendasi")
-            
-            # Data rekomendasi
-            recom_data = [
-                ["Area", "Prioritas", "Rekomendasi", "Timeline"],
-                ["AI Model", "Medium", "Update training data", "Weekly"],
-                ["Sensors", "Low", "Regular calibration", "Monthly"],
-                ["Network", "Low", "Bandwidth monitoring", "Daily"],
-                ["Storage", "Medium", "Cleanup old data", "Weekly"]
-            ]
-            
-            for row in recom_data:
-                ws4.append(row)
-            
-            # Format semua sheet
-            for ws in [ws1, ws2, ws3, ws4]:
-                # Set column width
-                for column in ws.columns:
-                    max_length = 0
-                    column = [cell for cell in column]
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(cell.value)
-                        except:
-                            pass
-                    adjusted_width = (max_length + 2)
-                    ws.column_dimensions[column[0].column_letter].width = adjusted_width
-            
-            # Simpan file
-            filename = f"security_evaluation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            filepath = f"reports/{filename}"
-            
-            # Buat direktori jika belum ada
-            os.makedirs("reports", exist_ok=True)
-            
-            # Simpan workbook
-            wb.save(filepath)
+            filepath = self.buildSecurityReport()
             
             QMessageBox.information(
                 self,
@@ -2116,6 +2299,134 @@ class SecuritySystem(QMainWindow):
                 f"Terjadi kesalahan saat mengexport laporan:\n{str(e)}"
             )
 
+    def buildSecurityReport(self):
+        """Bangun laporan evaluasi keamanan secara inkremental, tanpa dialog
+        
+        Bisa dipanggil dari jadwal export. Agregat riwayat hanya dihitung untuk
+        data baru sejak watermark export terakhir.
+        """
+        from report_cache import IncrementalReportCache, column_widths
+        
+        if not hasattr(self, 'reportCache'):
+            self.reportCache = IncrementalReportCache(self.history)
+        
+        self.reportCache.update_aggregates()
+        totals = self.reportCache.totals()
+        deltas = self.reportCache.event_deltas(totals)
+        previous_watermark = self.reportCache.watermark or "-"
+        
+        # Buat workbook baru
+        wb = Workbook()
+        
+        # Sheet 1: Evaluasi Keamanan Umum
+        ws1 = wb.active
+        ws1.title = "Evaluasi Keamanan"
+        
+        # Header
+        headers = ["Komponen", "Status", "Akurasi", "Risiko", "Maintenance", "Rekomendasi"]
+        for col, header in enumerate(headers, 1):
+            cell = ws1.cell(row=1, column=col)
+            cell.value = header
+            cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+            cell.font = Font(color="FFFFFF", bold=True)
+        
+        # Data dari tabel
+        security_rows = [headers]
+        for i in range(self.securityTable.rowCount()):
+            row = []
+            for j in range(self.securityTable.columnCount()):
+                item = self.securityTable.item(i, j)
+                row.append(item.text() if item else None)
+                if item:
+                    ws1.cell(row=i+2, column=j+1).value = item.text()
+            security_rows.append(row)
+        
+        # Sheet 2: Analisis AI
+        ws2 = wb.create_sheet("Analisis AI")
+        
+        # Data AI
+        ai_data = [
+            ["Metrik", "Nilai", "Status"],
+            ["Akurasi Model", "98%", "Optimal"],
+            ["False Positives", "0.02%", "Baik"],
+            ["False Negatives", "0.01%", "Baik"],
+            ["Response Time", "50ms", "Optimal"],
+            ["Model Version", "2.1", "Updated"],
+            ["Training Data", "10000 samples", "Sufficient"],
+            ["Last Update", datetime.now().strftime("%Y-%m-%d %H:%M"), "Recent"],
+            ["Export Sebelumnya", previous_watermark, "Watermark"],
+            ["Total Riwayat", totals["rows"], "Baris"]
+        ]
+        
+        # Ringkasan kejadian dari riwayat: total dan tambahan sejak export terakhir
+        for event_type in sorted(totals["events"]):
+            ai_data.append([
+                f"Kejadian: {event_type}",
+                totals["events"][event_type],
+                f"+{deltas.get(event_type, 0)} baru"
+            ])
+        
+        for row in ai_data:
+            ws2.append(row)
+        
+        # Sheet 3: Sensor Status
+        ws3 = wb.create_sheet("Status Sensor")
+        
+        # Data sensor
+        sensor_data = [
+            ["Sensor", "Status", "Akurasi", "Maintenance"],
+            ["Kamera Depan", "Active", "99%", "None"],
+            ["Kamera Belakang", "Active", "98%", "None"],
+            ["PIR Sensor", "Active", "95%", "Calibrate"],
+            ["Motion Sensor", "Active", "97%", "None"],
+            ["Door Sensor", "Active", "100%", "None"]
+        ]
+        
+        for row in sensor_data:
+            ws3.append(row)
+        
+        # Sheet 4: Rekomendasi
+        ws4 = wb.create_sheet("Rekomendasi")
+        
+        # Data rekomendasi
+        recom_data = [
+            ["Area", "Prioritas", "Rekomendasi", "Timeline"],
+            ["AI Model", "Medium", "Update training data", "Weekly"],
+            ["Sensors", "Low", "Regular calibration", "Monthly"],
+            ["Network", "Low", "Bandwidth monitoring", "Daily"],
+            ["Storage", "Medium", "Cleanup old data", "Weekly"]
+        ]
+        
+        for row in recom_data:
+            ws4.append(row)
+        
+        # Format semua sheet
+        sheet_rows = [
+            (ws1, security_rows),
+            (ws2, ai_data),
+            (ws3, sensor_data),
+            (ws4, recom_data)
+        ]
+        for ws, rows in sheet_rows:
+            widths = column_widths(rows)
+            for col, width in enumerate(widths, 1):
+                ws.column_dimensions[get_column_letter(col)].width = width
+        
+        # Simpan file
+        filename = f"security_evaluation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        filepath = f"reports/{filename}"
+        
+        # Buat direktori jika belum ada
+        os.makedirs("reports", exist_ok=True)
+        
+        # Simpan workbook
+        wb.save(filepath)
+        
+        # Catat watermark export
+        self.reportCache.commit_export(totals)
+        
+        return filepath
+
 if __name__ == '__main__':
     try:
         app = QApplication(sys.argv)
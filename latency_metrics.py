@@ -0,0 +1,136 @@
+import threading
+from contextlib import contextmanager
+from time import perf_counter_ns
+
+
+class LatencyHistogram:
+    """Histogram latensi bergaya HDR dengan presisi relatif tetap
+
+    Nilai dicatat dalam mikrodetik ke bucket log-linear: setiap rentang
+    pangkat dua dibagi menjadi `2**significant_bits / 2` sub-bucket,
+    sehingga galat relatif tidak lebih dari 2 / 2**significant_bits.
+    Pencatatan O(1) tanpa alokasi.
+    """
+
+    def __init__(self, highest_us=60_000_000, significant_bits=7):
+        self.significant_bits = significant_bits
+        self.sub_bucket_count = 1 << significant_bits
+        self.half_count = self.sub_bucket_count // 2
+        self.highest_us = highest_us
+        self.counts = [0] * (self._index(highest_us) + 1)
+        self.total_count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def _index(self, value):
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.significant_bits
+        mantissa = value >> shift
+        return self.sub_bucket_count + (shift - 1) * self.half_count + (mantissa - self.half_count)
+
+    def _bucket_value(self, index):
+        """Batas atas nilai untuk satu bucket"""
+        if index < self.sub_bucket_count:
+            return index
+        shift = (index - self.sub_bucket_count) // self.half_count + 1
+        mantissa = (index - self.sub_bucket_count) % self.half_count + self.half_count
+        return ((mantissa + 1) << shift) - 1
+
+    def record_ns(self, duration_ns):
+        """Catat satu durasi dalam nanodetik"""
+        value = min(max(duration_ns // 1000, 0), self.highest_us)
+        self.counts[self._index(value)] += 1
+        self.total_count += 1
+        self.total_us += value
+        if value > self.max_us:
+            self.max_us = value
+
+    def percentile_ms(self, percentile):
+        """Nilai latensi (ms) pada persentil tertentu"""
+        if self.total_count == 0:
+            return 0.0
+        target = max(1, int(round(percentile / 100.0 * self.total_count)))
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(self._bucket_value(index), self.max_us) / 1000.0
+        return self.max_us / 1000.0
+
+    def count_above_ms(self, threshold_ms):
+        """Jumlah sampel di atas ambang batas (ms)"""
+        start = self._index(min(int(threshold_ms * 1000), self.highest_us)) + 1
+        return sum(self.counts[start:])
+
+    def mean_ms(self):
+        return self.total_us / self.total_count / 1000.0 if self.total_count else 0.0
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.total_count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def summary(self):
+        """Ringkasan p50/p95/p99/max dalam milidetik"""
+        return {
+            "count": self.total_count,
+            "mean": round(self.mean_ms(), 3),
+            "p50": self.percentile_ms(50),
+            "p95": self.percentile_ms(95),
+            "p99": self.percentile_ms(99),
+            "max": self.max_us / 1000.0
+        }
+
+
+class PipelineLatency:
+    """Kumpulan histogram latensi per tahap pipeline deteksi"""
+
+    STAGES = (
+        "sensor_read",
+        "motion_gate",
+        "analyze_motion",
+        "tracking",
+        "detect_intrusion",
+        "audio_features",
+        "analyze_sound",
+        "status_update",
+        "trigger_alarm",
+        "sensor_to_alarm",
+        "actuator_ack",
+        "total"
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {stage: LatencyHistogram() for stage in self.STAGES}
+
+    def record(self, stage, duration_ns):
+        """Catat durasi satu tahap"""
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, LatencyHistogram())
+        histogram.record_ns(duration_ns)
+
+    @contextmanager
+    def span(self, stage):
+        """Ukur durasi blok kode dengan perf_counter_ns"""
+        start = perf_counter_ns()
+        try:
+            yield start
+        finally:
+            self.record(stage, perf_counter_ns() - start)
+
+    def summary(self):
+        """Ringkasan semua tahap yang sudah memiliki sampel"""
+        return {
+            stage: histogram.summary()
+            for stage, histogram in self.histograms.items()
+            if histogram.total_count
+        }
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
@@ -0,0 +1,175 @@
+from collections import deque
+
+import numpy as np
+
+try:
+    from scipy import ndimage
+except ImportError:
+    ndimage = None
+
+# Bobot luminans RGB ke grayscale (ITU-R BT.601)
+LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+# Ukuran tile untuk pelabelan region tanpa SciPy (piksel setelah downscale)
+FALLBACK_TILE = 8
+
+
+class MotionGate:
+    """Tahap awal murah sebelum deteksi objek: selisih frame terhadap latar
+
+    Frame diperkecil dan diubah ke grayscale, dibandingkan dengan latar
+    rata-rata berjalan, lalu piksel berubah dikelompokkan menjadi region.
+    Hanya frame dengan region cukup besar (di dalam ROI zona bila ada) yang
+    diteruskan ke detektor.
+
+    `rois` berbentuk {kamera: {zona: (x0, y0, x1, y1)}} dengan koordinat
+    relatif 0-1 terhadap frame.
+    """
+
+    def __init__(self, rois=None, downscale=4, alpha=0.05, diff_threshold=25.0, min_area=40):
+        self.rois = rois or {}
+        self.downscale = downscale
+        self.alpha = alpha
+        self.diff_threshold = diff_threshold
+        self.min_area = min_area
+        self.cameras = {}
+        self.frames_seen = 0
+        self.frames_passed = 0
+
+    def _state(self, camera, frame):
+        """Buffer per kamera dialokasikan sekali sesuai ukuran frame kecil"""
+        small_shape = frame[::self.downscale, ::self.downscale].shape[:2]
+        state = self.cameras.get(camera)
+        if state is None or state["gray"].shape != small_shape:
+            height, width = small_shape
+            masks = {}
+            for zone, (x0, y0, x1, y1) in self.rois.get(camera, {}).items():
+                mask = np.zeros(small_shape, dtype=bool)
+                mask[int(y0 * height):int(np.ceil(y1 * height)),
+                     int(x0 * width):int(np.ceil(x1 * width))] = True
+                masks[zone] = mask
+            state = self.cameras[camera] = {
+                "gray": np.empty(small_shape, dtype=np.float32),
+                "background": None,
+                "diff": np.empty(small_shape, dtype=np.float32),
+                "roi_masks": masks,
+                "roi_union": np.logical_or.reduce(list(masks.values())) if masks else None
+            }
+        return state
+
+    def process(self, camera, frame):
+        """Periksa satu frame, kembalikan dict hasil gating
+
+        Kunci hasil: "motion" (bool), "regions" [(x0, y0, x1, y1, area)] dalam
+        koordinat frame asli, "zones" {zona: area gerakan} dan "fraction".
+        """
+        state = self._state(camera, frame)
+        gray = state["gray"]
+        np.matmul(frame[::self.downscale, ::self.downscale], LUMA_WEIGHTS, out=gray)
+        self.frames_seen += 1
+
+        if state["background"] is None:
+            state["background"] = gray.copy()
+            return {"camera": camera, "motion": False, "regions": [], "zones": {}, "fraction": 0.0}
+
+        background = state["background"]
+        diff = state["diff"]
+        np.subtract(gray, background, out=diff)
+        np.abs(diff, out=diff)
+        mask = diff > self.diff_threshold
+        if state["roi_union"] is not None:
+            mask &= state["roi_union"]
+
+        # Latar diperbarui dengan rata-rata berjalan: bg += alpha * (gray - bg)
+        np.subtract(gray, background, out=diff)
+        background += self.alpha * diff
+
+        regions, kept = self.find_regions(mask)
+        scale = self.downscale
+        result = {
+            "camera": camera,
+            "motion": bool(regions),
+            "regions": [(x0 * scale, y0 * scale, x1 * scale, y1 * scale, area)
+                        for x0, y0, x1, y1, area in regions],
+            "zones": {},
+            "fraction": float(kept.mean()) if regions else 0.0
+        }
+        if regions:
+            for zone, roi in state["roi_masks"].items():
+                area = int(np.count_nonzero(kept & roi))
+                if area >= self.min_area:
+                    result["zones"][zone] = area
+            self.frames_passed += 1
+        return result
+
+    def find_regions(self, mask):
+        """Kelompokkan piksel berubah menjadi region dan buang yang terlalu kecil
+
+        Mengembalikan ([(x0, y0, x1, y1, area)], mask region yang lolos).
+        """
+        if not mask.any():
+            return [], mask
+        if ndimage is not None:
+            labels, count = ndimage.label(mask)
+            areas = np.bincount(labels.ravel(), minlength=count + 1)
+            keep = areas >= self.min_area
+            keep[0] = False
+            regions = [
+                (sl[1].start, sl[0].start, sl[1].stop, sl[0].stop, int(areas[label]))
+                for label, sl in enumerate(ndimage.find_objects(labels), start=1)
+                if keep[label]
+            ]
+            return regions, keep[labels]
+        return self._find_regions_tiled(mask)
+
+    def _find_regions_tiled(self, mask):
+        """Pelabelan kasar tanpa SciPy: komponen terhubung pada grid tile"""
+        tile = FALLBACK_TILE
+        height, width = mask.shape
+        rows, cols = -(-height // tile), -(-width // tile)
+        padded = np.zeros((rows * tile, cols * tile), dtype=bool)
+        padded[:height, :width] = mask
+        counts = padded.reshape(rows, tile, cols, tile).sum(axis=(1, 3))
+
+        labels = np.zeros((rows, cols), dtype=np.int32)
+        regions = []
+        kept_tiles = np.zeros((rows, cols), dtype=bool)
+        for start in zip(*np.nonzero(counts)):
+            if labels[start]:
+                continue
+            label = len(regions) + 1
+            labels[start] = label
+            queue = deque([start])
+            members = []
+            while queue:
+                r, c = queue.popleft()
+                members.append((r, c))
+                for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                    if 0 <= nr < rows and 0 <= nc < cols and counts[nr, nc] and not labels[nr, nc]:
+                        labels[nr, nc] = label
+                        queue.append((nr, nc))
+            member_rows, member_cols = np.array(members).T
+            area = int(counts[member_rows, member_cols].sum())
+            regions.append((int(member_cols.min()) * tile, int(member_rows.min()) * tile,
+                            min(width, (int(member_cols.max()) + 1) * tile),
+                            min(height, (int(member_rows.max()) + 1) * tile), area))
+            if area >= self.min_area:
+                kept_tiles[member_rows, member_cols] = True
+
+        kept = np.repeat(np.repeat(kept_tiles, tile, axis=0), tile, axis=1)[:height, :width] & mask
+        return [region for region in regions if region[4] >= self.min_area], kept
+
+    def reset(self, camera=None):
+        """Lupakan latar satu kamera (atau semua), mis. setelah kamera dipindah"""
+        if camera is None:
+            self.cameras.clear()
+        else:
+            self.cameras.pop(camera, None)
+
+    def stats(self):
+        """Jumlah frame diperiksa dan yang diteruskan ke detektor"""
+        return {
+            "frames_seen": self.frames_seen,
+            "frames_passed": self.frames_passed,
+            "pass_rate": self.frames_passed / self.frames_seen if self.frames_seen else 0.0
+        }
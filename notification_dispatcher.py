@@ -0,0 +1,314 @@
+import asyncio
+import json
+import random
+import smtplib
+import socket
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from email.message import EmailMessage
+
+from sensor_gateway import parse_address
+
+# Urutan tingkat notifikasi, digest memakai tingkat tertinggi di dalamnya
+SEVERITIES = ["info", "peringatan", "kritis"]
+
+
+class Notification:
+    __slots__ = ("title", "message", "severity", "timestamp")
+
+    def __init__(self, title, message, severity="info", timestamp=None):
+        self.title = title
+        self.message = message
+        self.severity = severity if severity in SEVERITIES else "info"
+        self.timestamp = timestamp if timestamp is not None else time.time()
+
+    def to_dict(self):
+        return {
+            "title": self.title,
+            "message": self.message,
+            "severity": self.severity,
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(timespec="seconds")
+        }
+
+
+class Digest:
+    """Kumpulan notifikasi yang dikirim sebagai satu pesan"""
+
+    def __init__(self, notifications):
+        self.notifications = notifications
+        self.severity = max((n.severity for n in notifications), key=SEVERITIES.index)
+
+    @property
+    def subject(self):
+        first = self.notifications[0]
+        if len(self.notifications) == 1:
+            return f"[{first.severity.upper()}] {first.title}"
+        return f"[{self.severity.upper()}] {first.title} (+{len(self.notifications) - 1} notifikasi)"
+
+    def text(self):
+        return "\n".join(
+            f"{datetime.fromtimestamp(n.timestamp).strftime('%H:%M:%S')} [{n.severity}] {n.title}: {n.message}"
+            for n in self.notifications)
+
+    def to_dict(self):
+        return {
+            "subject": self.subject,
+            "severity": self.severity,
+            "notifications": [n.to_dict() for n in self.notifications]
+        }
+
+
+class FileChannel:
+    """Tulis digest sebagai baris JSON ke file lokal"""
+
+    name = "file"
+
+    def __init__(self, path):
+        self.path = path
+
+    def _append(self, line):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    async def send(self, digest):
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._append, json.dumps(digest.to_dict(), ensure_ascii=False))
+
+
+class SocketChannel:
+    """Kirim digest sebagai baris JSON ke socket 'tcp://host:port' atau 'unix:///path'"""
+
+    name = "socket"
+
+    def __init__(self, address, timeout=5.0):
+        self.address = address
+        self.timeout = timeout
+
+    async def send(self, digest):
+        family, target = parse_address(self.address)
+        if family == socket.AF_UNIX:
+            connection = asyncio.open_unix_connection(target)
+        else:
+            connection = asyncio.open_connection(*target)
+        reader, writer = await asyncio.wait_for(connection, self.timeout)
+        try:
+            writer.write(json.dumps(digest.to_dict(), ensure_ascii=False).encode("utf-8") + b"\n")
+            await asyncio.wait_for(writer.drain(), self.timeout)
+        finally:
+            writer.close()
+
+
+class WebhookChannel:
+    """POST digest sebagai JSON ke URL webhook"""
+
+    name = "webhook"
+
+    def __init__(self, url, timeout=10.0, headers=None):
+        self.url = url
+        self.timeout = timeout
+        self.headers = headers or {}
+
+    def _post(self, body):
+        request = urllib.request.Request(
+            self.url, data=body, method="POST",
+            headers=dict(self.headers, **{"Content-Type": "application/json"}))
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    async def send(self, digest):
+        body = json.dumps(digest.to_dict(), ensure_ascii=False).encode("utf-8")
+        await asyncio.get_running_loop().run_in_executor(None, self._post, body)
+
+
+class SmtpChannel:
+    """Kirim digest sebagai email lewat server SMTP"""
+
+    name = "smtp"
+
+    def __init__(self, host, sender, recipients, port=587, username=None, password=None,
+                 starttls=True, timeout=15.0):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = list(recipients)
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def _send_mail(self, subject, text):
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = self.sender
+        message["To"] = ", ".join(self.recipients)
+        message.set_content(text)
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            smtp.send_message(message)
+
+    async def send(self, digest):
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._send_mail, f"Keamanan Rumah: {digest.subject}", digest.text())
+
+
+CHANNEL_TYPES = {
+    "file": FileChannel,
+    "socket": SocketChannel,
+    "webhook": WebhookChannel,
+    "smtp": SmtpChannel,
+}
+
+
+def channels_from_config(config):
+    """Buat channel dari daftar konfigurasi [{"type": "smtp", ...}, ...]"""
+    channels = []
+    for entry in config:
+        options = dict(entry)
+        channels.append(CHANNEL_TYPES[options.pop("type")](**options))
+    return channels
+
+
+def create_notifier(config):
+    """Buat NotificationDispatcher dari konfigurasi {"channels": [...], opsi lain...}"""
+    options = dict(config)
+    return NotificationDispatcher(channels_from_config(options.pop("channels", [])), **options)
+
+
+class NotificationDispatcher:
+    """Pengirim notifikasi asinkron dengan digest dan retry
+
+    Event loop asyncio berjalan di thread sendiri. `notify` hanya
+    menjadwalkan notifikasi ke loop itu dan langsung kembali. Notifikasi
+    yang datang dalam `digest_window` detik digabung menjadi satu digest
+    (notifikasi kritis hanya menunggu `urgent_window`), lalu dikirim ke
+    semua channel secara bersamaan. Pengiriman yang gagal diulang dengan
+    backoff eksponensial sampai `max_retries` kali.
+    """
+
+    def __init__(self, channels, digest_window=5.0, urgent_window=0.5, max_batch=50, max_pending=1000,
+                 max_retries=5, backoff=1.0, max_backoff=60.0):
+        self.channels = list(channels)
+        self.digest_window = digest_window
+        self.urgent_window = urgent_window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.stats = {"queued": 0, "dropped": 0, "digests": 0, "delivered": 0, "retries": 0, "failed": 0}
+        self._loop = asyncio.new_event_loop()
+        self._queue = None
+        self._deliveries = set()
+        self._collecting = False
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="notification-dispatcher", daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        self._worker = self._loop.create_task(self._collect())
+        self._loop.call_soon(self._started.set)
+        try:
+            self._loop.run_forever()
+        finally:
+            # Loop ditutup di thread-nya sendiri setelah berhenti, termasuk executor I/O channel
+            self._loop.run_until_complete(self._loop.shutdown_default_executor())
+            self._loop.close()
+
+    def notify(self, title, message, severity="info"):
+        """Antrekan notifikasi tanpa memblokir; False jika dispatcher sudah berhenti"""
+        if self._loop.is_closed() or not self._loop.is_running():
+            return False
+        notification = Notification(title, message, severity)
+        try:
+            self._loop.call_soon_threadsafe(self._enqueue, notification)
+        except RuntimeError:
+            return False
+        return True
+
+    def _enqueue(self, notification):
+        if self._queue.qsize() >= self.max_pending:
+            self.stats["dropped"] += 1
+            return
+        self.stats["queued"] += 1
+        self._queue.put_nowait(notification)
+
+    async def _collect(self):
+        while True:
+            batch = [await self._queue.get()]
+            self._collecting = True
+            window = self.urgent_window if batch[0].severity == "kritis" else self.digest_window
+            deadline = self._loop.time() + window
+            while len(batch) < self.max_batch:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    notification = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(notification)
+                # Notifikasi kritis memperpendek jendela digest yang sedang berjalan
+                if notification.severity == "kritis":
+                    deadline = min(deadline, self._loop.time() + self.urgent_window)
+
+            digest = Digest(batch)
+            self.stats["digests"] += 1
+            for channel in self.channels:
+                task = self._loop.create_task(self._deliver(channel, digest))
+                self._deliveries.add(task)
+                task.add_done_callback(self._deliveries.discard)
+            self._collecting = False
+
+    async def _deliver(self, channel, digest):
+        for attempt in range(self.max_retries + 1):
+            try:
+                await channel.send(digest)
+                self.stats["delivered"] += 1
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.stats["failed"] += 1
+                    print(f"Error dalam pengiriman notifikasi ({channel.name}): {str(e)}")
+                    return
+                self.stats["retries"] += 1
+                delay = min(self.backoff * (2 ** attempt), self.max_backoff)
+                # Jitter agar channel yang gagal bersamaan tidak mencoba ulang serentak
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+    async def _drain(self, timeout):
+        deadline = self._loop.time() + timeout
+        while (self._queue.qsize() or self._collecting or self._deliveries) and self._loop.time() < deadline:
+            if not self._queue.qsize() and self._deliveries:
+                await asyncio.wait(set(self._deliveries), timeout=max(0.0, deadline - self._loop.time()))
+            else:
+                await asyncio.sleep(0.05)
+
+    async def _shutdown(self):
+        """Batalkan worker pengumpul dan pengiriman tersisa, lalu tunggu sampai selesai"""
+        tasks = [self._worker, *self._deliveries]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self, timeout=10.0):
+        """Tunggu antrean dan pengiriman berjalan selesai (maksimal `timeout`), lalu tutup loop"""
+        if self._loop.is_closed() or not self._loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._drain(timeout), self._loop).result(timeout + 1.0)
+        except Exception as e:
+            print(f"Error dalam menghentikan notifikasi: {str(e)}")
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(2.0)
+        except Exception as e:
+            print(f"Error dalam menghentikan notifikasi: {str(e)}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5.0)
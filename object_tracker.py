@@ -0,0 +1,257 @@
+import itertools
+
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+# Kelas objek yang dihitung, sesuai grafik distribusi objek
+OBJECT_CLASSES = ["Orang", "Kendaraan", "Tas", "Mencurigakan"]
+CLASS_ALIASES = {"Benda Mencurigakan": "Mencurigakan"}
+
+# Model kecepatan konstan: state [cx, cy, w, h, vx, vy, vw, vh], pengukuran [cx, cy, w, h]
+_F = np.eye(8)
+_F[:4, 4:] = np.eye(4)
+_Q = np.diag([1.0, 1.0, 1.0, 1.0, 0.01, 0.01, 0.0001, 0.0001])
+_R = np.diag([1.0, 1.0, 10.0, 10.0])
+_P0 = np.diag([10.0, 10.0, 10.0, 10.0, 1e4, 1e4, 1e4, 1e4])
+
+
+def class_index(name):
+    """Indeks kelas objek, -1 jika tidak dihitung"""
+    name = CLASS_ALIASES.get(name, name)
+    return OBJECT_CLASSES.index(name) if name in OBJECT_CLASSES else -1
+
+
+def class_name(index):
+    """Nama kelas objek untuk indeks, None jika tidak terklasifikasi"""
+    return OBJECT_CLASSES[index] if index >= 0 else None
+
+
+def boxes_to_state(boxes):
+    """(x0, y0, x1, y1) -> (cx, cy, w, h)"""
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    return np.column_stack([(boxes[:, 0] + boxes[:, 2]) / 2, (boxes[:, 1] + boxes[:, 3]) / 2,
+                            boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1]])
+
+
+def state_to_boxes(state):
+    """(cx, cy, w, h) -> (x0, y0, x1, y1)"""
+    half = np.abs(state[:, 2:4]) / 2
+    return np.column_stack([state[:, :2] - half, state[:, :2] + half])
+
+
+def iou_matrix(a, b):
+    """IoU semua pasangan kotak a (N, 4) dan b (M, 4)"""
+    a = np.asarray(a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float64).reshape(-1, 4)
+    x0 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y0 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x1 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y1 = np.minimum(a[:, None, 3], b[None, :, 3])
+    intersection = np.clip(x1 - x0, 0, None) * np.clip(y1 - y0, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def assign(iou, threshold):
+    """Pasangkan baris-kolom dengan IoU maksimum (Hungarian, greedy tanpa SciPy)"""
+    if iou.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    if linear_sum_assignment is not None:
+        rows, cols = linear_sum_assignment(-iou)
+    else:
+        rows, cols = [], []
+        used_rows, used_cols = set(), set()
+        for flat in np.argsort(-iou, axis=None):
+            row, col = divmod(int(flat), iou.shape[1])
+            if iou[row, col] < threshold:
+                break
+            if row not in used_rows and col not in used_cols:
+                used_rows.add(row)
+                used_cols.add(col)
+                rows.append(row)
+                cols.append(col)
+        rows, cols = np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)
+    keep = iou[rows, cols] >= threshold
+    return rows[keep], cols[keep]
+
+
+class MultiObjectTracker:
+    """Pelacak multi-objek per kamera dengan ID stabil
+
+    Semua track disimpan dalam array dan prediksi/koreksi Kalman dilakukan
+    sekaligus untuk semua track. Detektor cukup dijalankan setiap
+    `detect_every` frame atau saat ada gerakan baru di luar track yang ada;
+    di antaranya `update(None)` membawa track maju dengan prediksi.
+    """
+
+    def __init__(self, detect_every=5, iou_threshold=0.3, min_hits=2, max_misses=3, max_age=90,
+                 id_source=None):
+        self.detect_every = detect_every
+        self.iou_threshold = iou_threshold
+        self.min_hits = min_hits
+        self.max_misses = max_misses
+        self.max_age = max_age
+        self.ids = id_source if id_source is not None else itertools.count(1)
+        self.state = np.zeros((0, 8))
+        self.covariance = np.zeros((0, 8, 8))
+        self.track_ids = np.zeros(0, dtype=np.int64)
+        self.classes = np.zeros(0, dtype=np.int64)
+        self.confidence = np.zeros(0)
+        self.hits = np.zeros(0, dtype=np.int64)
+        self.misses = np.zeros(0, dtype=np.int64)
+        self.age = np.zeros(0, dtype=np.int64)
+        self.frames = 0
+        self.detector_runs = 0
+        self.frames_since_detection = 0
+
+    def __len__(self):
+        return len(self.track_ids)
+
+    def boxes(self):
+        return state_to_boxes(self.state)
+
+    def needs_detection(self, motion_regions=None):
+        """True jika detektor perlu dijalankan untuk frame ini"""
+        if self.frames_since_detection + 1 >= self.detect_every:
+            return True
+        if motion_regions:
+            regions = np.array([region[:4] for region in motion_regions], dtype=np.float64)
+            if len(self) == 0:
+                return True
+            # Gerakan yang tidak tumpang tindih dengan track mana pun dianggap objek baru
+            return bool((iou_matrix(regions, self.boxes()).max(axis=1) < 0.1).any())
+        return False
+
+    def _predict(self):
+        self.state = self.state @ _F.T
+        self.covariance = _F @ self.covariance @ _F.T + _Q
+        self.age += 1
+
+    def _correct(self, indices, measurements):
+        covariance = self.covariance[indices]
+        innovation = measurements - self.state[indices, :4]
+        gain = covariance[:, :, :4] @ np.linalg.inv(covariance[:, :4, :4] + _R)
+        self.state[indices] += (gain @ innovation[:, :, None])[:, :, 0]
+        self.covariance[indices] = covariance - gain @ covariance[:, :4, :]
+
+    def update(self, detections=None):
+        """Proses satu frame
+
+        `detections` berisi (kotak (x0, y0, x1, y1), kelas, confidence) dari
+        detektor, atau None jika detektor tidak dijalankan pada frame ini.
+        Mengembalikan daftar (id, kelas) track yang baru terkonfirmasi; kelas
+        None untuk deteksi yang tidak diklasifikasi detektor.
+        """
+        self.frames += 1
+        self._predict()
+        confirmed = []
+
+        if detections is None:
+            self.frames_since_detection += 1
+        else:
+            self.detector_runs += 1
+            self.frames_since_detection = 0
+            boxes = np.array([detection[0] for detection in detections], dtype=np.float64).reshape(-1, 4)
+            rows, cols = assign(iou_matrix(self.boxes(), boxes), self.iou_threshold)
+
+            if len(rows):
+                self._correct(rows, boxes_to_state(boxes[cols]))
+                self.hits[rows] += 1
+                self.age[rows] = 0
+                self.confidence[rows] = [detections[col][2] for col in cols]
+                newly = rows[self.hits[rows] == self.min_hits]
+                confirmed.extend((int(self.track_ids[i]), class_name(self.classes[i])) for i in newly)
+
+            missed = np.ones(len(self), dtype=bool)
+            missed[rows] = False
+            self.misses[missed] += 1
+            self.misses[rows] = 0
+
+            unmatched = np.setdiff1d(np.arange(len(boxes)), cols)
+            if len(unmatched):
+                confirmed.extend(self._spawn([detections[i] for i in unmatched], boxes[unmatched]))
+
+        keep = (self.misses <= self.max_misses) & (self.age <= self.max_age)
+        if not keep.all():
+            self._select(keep)
+        return confirmed
+
+    def _spawn(self, detections, boxes):
+        count = len(detections)
+        state = np.zeros((count, 8))
+        state[:, :4] = boxes_to_state(boxes)
+        classes = np.array([class_index(detection[1]) for detection in detections], dtype=np.int64)
+        track_ids = np.array([next(self.ids) for _ in range(count)], dtype=np.int64)
+
+        self.state = np.vstack([self.state, state])
+        self.covariance = np.concatenate([self.covariance, np.broadcast_to(_P0, (count, 8, 8))])
+        self.track_ids = np.concatenate([self.track_ids, track_ids])
+        self.classes = np.concatenate([self.classes, classes])
+        self.confidence = np.concatenate([self.confidence, [detection[2] for detection in detections]])
+        self.hits = np.concatenate([self.hits, np.ones(count, dtype=np.int64)])
+        self.misses = np.concatenate([self.misses, np.zeros(count, dtype=np.int64)])
+        self.age = np.concatenate([self.age, np.zeros(count, dtype=np.int64)])
+
+        if self.min_hits <= 1:
+            return [(int(track_id), class_name(cls)) for track_id, cls in zip(track_ids, classes)]
+        return []
+
+    def _select(self, keep):
+        self.state = self.state[keep]
+        self.covariance = self.covariance[keep]
+        self.track_ids = self.track_ids[keep]
+        self.classes = self.classes[keep]
+        self.confidence = self.confidence[keep]
+        self.hits = self.hits[keep]
+        self.misses = self.misses[keep]
+        self.age = self.age[keep]
+
+    def active_counts(self):
+        """Jumlah track terkonfirmasi yang sedang aktif per kelas"""
+        classes = self.classes[(self.hits >= self.min_hits) & (self.classes >= 0)]
+        return np.bincount(classes, minlength=len(OBJECT_CLASSES))
+
+    def stats(self):
+        return {
+            "tracks": len(self),
+            "frames": self.frames,
+            "detector_runs": self.detector_runs,
+            "detector_rate": self.detector_runs / self.frames if self.frames else 0.0
+        }
+
+
+class UniqueObjectCounter:
+    """Jumlah objek unik per kelas per interval waktu dalam ring array"""
+
+    def __init__(self, bucket_seconds=3600, buckets=168):
+        self.bucket_seconds = bucket_seconds
+        self.counts = np.zeros((buckets, len(OBJECT_CLASSES)), dtype=np.int64)
+        self.bucket_ids = np.full(buckets, -1, dtype=np.int64)
+        self.totals = np.zeros(len(OBJECT_CLASSES), dtype=np.int64)
+
+    def add(self, class_name, timestamp):
+        index = class_index(class_name)
+        if index < 0:
+            return
+        bucket = int(timestamp // self.bucket_seconds)
+        slot = bucket % len(self.bucket_ids)
+        if self.bucket_ids[slot] != bucket:
+            self.bucket_ids[slot] = bucket
+            self.counts[slot] = 0
+        self.counts[slot, index] += 1
+        self.totals[index] += 1
+
+    def series(self, points, now):
+        """(awal interval dalam detik epoch, jumlah (points, kelas)) untuk interval terakhir"""
+        last = int(now // self.bucket_seconds)
+        buckets = np.arange(last - points + 1, last + 1)
+        slots = buckets % len(self.bucket_ids)
+        valid = self.bucket_ids[slots] == buckets
+        counts = np.where(valid[:, None], self.counts[slots], 0)
+        return buckets * self.bucket_seconds, counts
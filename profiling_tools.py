@@ -0,0 +1,165 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+
+class StackSampler:
+    """Sampler stack berbiaya rendah untuk semua thread Python
+
+    Mengambil stack setiap `interval` detik dari thread terpisah dan
+    mengagregasinya ke format collapsed-stack (flamegraph).
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self.sample_count = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.stacks.clear()
+        self.sample_count = 0
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                frames.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(frames))] += 1
+            self.sample_count += 1
+
+    def write_collapsed(self, filepath):
+        """Tulis hasil dalam format collapsed-stack"""
+        with open(filepath, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class ProfilingManager:
+    """Kontrol profiling saat runtime: cProfile, tracemalloc dan stack sampler"""
+
+    def __init__(self, report_dir="reports/profiling"):
+        self.report_dir = report_dir
+        self.profiler = None
+        self.sampler = StackSampler()
+        self.last_snapshot = None
+
+    def _path(self, prefix, extension):
+        os.makedirs(self.report_dir, exist_ok=True)
+        return os.path.join(self.report_dir,
+                            f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}")
+
+    @property
+    def cprofile_running(self):
+        return self.profiler is not None
+
+    def start_cprofile(self):
+        """Mulai cProfile pada thread pemanggil"""
+        if self.profiler is not None:
+            return False
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        return True
+
+    def stop_cprofile(self, top_n=30):
+        """Hentikan cProfile, simpan file pstats dan ringkasan teks"""
+        if self.profiler is None:
+            return None
+        self.profiler.disable()
+        filepath = self._path("cprofile", "pstats")
+        self.profiler.dump_stats(filepath)
+
+        output = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=output)
+        stats.sort_stats("cumulative").print_stats(top_n)
+        with open(filepath[:-len(".pstats")] + ".txt", "w", encoding="utf-8") as f:
+            f.write(output.getvalue())
+
+        self.profiler = None
+        return filepath
+
+    def start_tracemalloc(self, frames=25):
+        """Aktifkan tracemalloc dan simpan snapshot baseline"""
+        if tracemalloc.is_tracing():
+            return False
+        tracemalloc.start(frames)
+        self.last_snapshot = self._take_snapshot()
+        return True
+
+    def memory_snapshot(self, top_n=20, stop=True):
+        """Tulis selisih alokasi top-N terhadap baseline, lalu hentikan tracemalloc
+
+        Dengan `stop=False` tracing tetap aktif dan snapshot ini menjadi
+        baseline berikutnya. Mengembalikan None jika tracemalloc belum aktif.
+        """
+        if not tracemalloc.is_tracing() or self.last_snapshot is None:
+            return None
+
+        snapshot = self._take_snapshot()
+        stats = snapshot.compare_to(self.last_snapshot, "lineno")[:top_n]
+        self.last_snapshot = snapshot
+
+        current, peak = tracemalloc.get_traced_memory()
+        filepath = self._path("tracemalloc", "txt")
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.write(f"Memori terlacak: {current / 1024:.1f} KiB (puncak {peak / 1024:.1f} KiB)\n\n")
+            for stat in stats:
+                f.write(f"{stat}\n")
+        if stop:
+            self.stop_tracemalloc()
+        return filepath
+
+    def _take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>")
+        ])
+
+    def stop_tracemalloc(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.last_snapshot = None
+
+    def start_sampler(self, interval=0.005):
+        """Mulai stack sampler"""
+        if self.sampler.running:
+            return False
+        self.sampler.interval = interval
+        self.sampler.start()
+        return True
+
+    def stop_sampler(self):
+        """Hentikan sampler dan simpan hasil collapsed-stack"""
+        if not self.sampler.running:
+            return None
+        self.sampler.stop()
+        filepath = self._path("stacks", "collapsed")
+        self.sampler.write_collapsed(filepath)
+        return filepath
@@ -0,0 +1,159 @@
+import csv
+import io
+import json
+import os
+from datetime import datetime
+
+from detection_history import HISTORY_COLUMNS
+
+
+def _empty_aggregate():
+    return {"rows": 0, "events": {}, "zones": {}, "sensors": {}}
+
+
+def _merge_aggregate(target, source):
+    target["rows"] += source["rows"]
+    for key in ("events", "zones"):
+        for name, count in source[key].items():
+            target[key][name] = target[key].get(name, 0) + count
+    for name, stats in source["sensors"].items():
+        current = target["sensors"].setdefault(name, {"count": 0, "sum": 0.0, "max": None})
+        current["count"] += stats["count"]
+        current["sum"] += stats["sum"]
+        if stats["max"] is not None and (current["max"] is None or stats["max"] > current["max"]):
+            current["max"] = stats["max"]
+
+
+def column_widths(rows):
+    """Lebar kolom lembar laporan dari teks terpanjang per kolom
+
+    Satu lintasan atas baris yang sudah ada di memori; tidak di-cache karena
+    hash isi sama mahalnya dan lembar "Analisis AI" selalu berisi waktu sekarang.
+    """
+    widths = []
+    for row in rows:
+        for col, value in enumerate(row):
+            length = len(str(value)) if value is not None else 0
+            if col >= len(widths):
+                widths.append(length)
+            elif length > widths[col]:
+                widths[col] = length
+    return [width + 2 for width in widths]
+
+
+class IncrementalReportCache:
+    """Cache agregat riwayat dan lembar laporan untuk export inkremental
+
+    Setiap partisi riwayat disimpan agregatnya bersama ukuran file dan
+    offset byte terakhir yang sudah dibaca. Partisi yang tidak berubah
+    dipakai ulang, partisi yang bertambah hanya dibaca dari offset terakhir.
+    """
+
+    def __init__(self, history, cache_path="reports/.cache/report_state.json"):
+        self.history = history
+        self.cache_path = cache_path
+        self.state = self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("columns") == HISTORY_COLUMNS:
+                return state
+        except (OSError, ValueError):
+            pass
+        return {"columns": HISTORY_COLUMNS, "watermark": None, "last_totals": None,
+                "partitions": {}}
+
+    def save(self):
+        """Simpan state cache ke disk"""
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.cache_path)
+
+    @property
+    def watermark(self):
+        return self.state["watermark"]
+
+    def update_aggregates(self):
+        """Perbarui agregat hanya untuk partisi yang berubah sejak export terakhir"""
+        partitions = self.state["partitions"]
+        if not os.path.isdir(self.history.base_dir):
+            return 0
+
+        new_rows = 0
+        for name in sorted(os.listdir(self.history.base_dir)):
+            if not name.endswith(".csv"):
+                continue
+            path = os.path.join(self.history.base_dir, name)
+            size = os.path.getsize(path)
+            cached = partitions.get(name)
+            if cached and cached["size"] == size:
+                continue  # Partisi tidak berubah, pakai agregat lama
+
+            if cached and size > cached["size"]:
+                offset = cached["offset"]
+                aggregate = cached["aggregate"]
+            else:
+                offset = 0
+                aggregate = _empty_aggregate()
+
+            offset, rows = self._scan_partition(path, offset, aggregate)
+            new_rows += rows
+            partitions[name] = {"size": size, "offset": offset, "aggregate": aggregate}
+
+        return new_rows
+
+    def _scan_partition(self, path, offset, aggregate):
+        """Baca baris baru mulai dari offset byte dan lipat ke agregat"""
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+
+        # Abaikan baris terakhir yang mungkin belum selesai ditulis
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return offset, 0
+
+        rows = 0
+        reader = csv.reader(io.StringIO(data[:end].decode("utf-8"), newline=""))
+        for row in reader:
+            if len(row) != len(HISTORY_COLUMNS) or row[0] == HISTORY_COLUMNS[0]:
+                continue
+            _, zone, event_type, sensor, value, _ = row
+            rows += 1
+            aggregate["rows"] += 1
+            aggregate["events"][event_type] = aggregate["events"].get(event_type, 0) + 1
+            aggregate["zones"][zone] = aggregate["zones"].get(zone, 0) + 1
+            if value:
+                value = float(value)
+                stats = aggregate["sensors"].setdefault(sensor, {"count": 0, "sum": 0.0, "max": None})
+                stats["count"] += 1
+                stats["sum"] += value
+                if stats["max"] is None or value > stats["max"]:
+                    stats["max"] = value
+
+        return offset + end, rows
+
+    def totals(self):
+        """Gabungkan agregat semua partisi"""
+        total = _empty_aggregate()
+        for cached in self.state["partitions"].values():
+            _merge_aggregate(total, cached["aggregate"])
+        return total
+
+    def commit_export(self, totals):
+        """Catat watermark dan total saat export selesai"""
+        self.state["watermark"] = datetime.now().isoformat(timespec="seconds")
+        self.state["last_totals"] = {"rows": totals["rows"], "events": dict(totals["events"])}
+        self.save()
+
+    def event_deltas(self, totals):
+        """Jumlah kejadian baru per jenis sejak watermark terakhir"""
+        previous = (self.state["last_totals"] or {}).get("events", {})
+        return {
+            event_type: count - previous.get(event_type, 0)
+            for event_type, count in totals["events"].items()
+        }
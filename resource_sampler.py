@@ -0,0 +1,164 @@
+import gc
+import os
+import threading
+import time
+from collections import deque
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+_PROC_SELF = "/proc/self"
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _read_stat_times(path):
+    """Baca utime+stime (detik) dari file stat /proc"""
+    with open(path, "rb") as f:
+        data = f.read()
+    # Nama proses bisa mengandung spasi, jadi potong setelah ')' terakhir
+    fields = data[data.rfind(b")") + 2:].split()
+    return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+
+
+class ResourceSampler:
+    """Sampler sumber daya proses (CPU, RSS, FD, GC, antrean) ke ring buffer
+
+    Membaca langsung dari /proc bila tersedia, jika tidak menggunakan psutil.
+    Berjalan di thread latar dengan interval yang bisa diatur.
+    """
+
+    def __init__(self, interval=1.0, capacity=3600):
+        self.interval = interval
+        self.samples = deque(maxlen=capacity)
+        self.queues = {}
+        self.use_proc = os.path.exists(os.path.join(_PROC_SELF, "stat"))
+        self.mem_total = self._read_mem_total()
+        self._process = psutil.Process() if psutil and not self.use_proc else None
+        self._last_wall = None
+        self._last_cpu = None
+        self._last_thread_cpu = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def register_queue(self, name, depth_fn):
+        """Daftarkan fungsi yang mengembalikan kedalaman antrean"""
+        self.queues[name] = depth_fn
+
+    def start(self):
+        """Mulai sampling di thread latar"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def set_interval(self, interval):
+        """Ubah laju sampling (detik)"""
+        self.interval = max(0.05, float(interval))
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"Error dalam sampling sumber daya: {str(e)}")
+            self._stop_event.wait(self.interval)
+
+    def _read_mem_total(self):
+        try:
+            with open("/proc/meminfo") as f:
+                for line in f:
+                    if line.startswith("MemTotal:"):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        if psutil:
+            return psutil.virtual_memory().total
+        return 0
+
+    def _read_proc(self):
+        cpu_seconds = _read_stat_times(os.path.join(_PROC_SELF, "stat"))
+        with open(os.path.join(_PROC_SELF, "statm")) as f:
+            rss = int(f.read().split()[1]) * _PAGE_SIZE
+        open_fds = len(os.listdir(os.path.join(_PROC_SELF, "fd")))
+
+        thread_cpu = {}
+        task_dir = os.path.join(_PROC_SELF, "task")
+        for tid in os.listdir(task_dir):
+            try:
+                thread_cpu[int(tid)] = _read_stat_times(os.path.join(task_dir, tid, "stat"))
+            except (OSError, IndexError, ValueError):
+                continue  # Thread sudah selesai
+        return cpu_seconds, rss, open_fds, thread_cpu
+
+    def _read_psutil(self):
+        times = self._process.cpu_times()
+        rss = self._process.memory_info().rss
+        try:
+            open_fds = self._process.num_fds()
+        except AttributeError:
+            open_fds = self._process.num_handles()
+        thread_cpu = {t.id: t.user_time + t.system_time for t in self._process.threads()}
+        return times.user + times.system, rss, open_fds, thread_cpu
+
+    def sample(self):
+        """Ambil satu sampel dan simpan ke ring buffer"""
+        wall = time.monotonic()
+        if self.use_proc:
+            cpu_seconds, rss, open_fds, thread_cpu = self._read_proc()
+        elif self._process is not None:
+            cpu_seconds, rss, open_fds, thread_cpu = self._read_psutil()
+        else:
+            return None
+
+        cpu_percent = 0.0
+        threads = {}
+        names = {t.native_id: t.name for t in threading.enumerate()}
+        if self._last_wall is not None:
+            elapsed = max(wall - self._last_wall, 1e-6)
+            cpu_percent = (cpu_seconds - self._last_cpu) / elapsed * 100
+            for tid, seconds in thread_cpu.items():
+                previous = self._last_thread_cpu.get(tid, seconds)
+                threads[tid] = {
+                    "name": names.get(tid, str(tid)),
+                    "cpu_percent": (seconds - previous) / elapsed * 100
+                }
+        self._last_wall = wall
+        self._last_cpu = cpu_seconds
+        self._last_thread_cpu = thread_cpu
+
+        queue_depths = {}
+        for name, depth_fn in list(self.queues.items()):
+            try:
+                queue_depths[name] = depth_fn()
+            except Exception:
+                queue_depths[name] = None
+
+        sample = {
+            "timestamp": time.time(),
+            "cpu_percent": cpu_percent,
+            "rss_bytes": rss,
+            "memory_percent": rss / self.mem_total * 100 if self.mem_total else 0.0,
+            "open_fds": open_fds,
+            # Jumlah koleksi per generasi; gc.get_count() hanya penghitung alokasi sejak koleksi terakhir
+            "gc_collections": [generation["collections"] for generation in gc.get_stats()],
+            "threads": threads,
+            "queues": queue_depths
+        }
+        self.samples.append(sample)
+        return sample
+
+    def latest(self):
+        """Sampel terakhir atau None jika belum ada"""
+        return self.samples[-1] if self.samples else None
+
+    def history(self, limit=None):
+        """Salinan sampel dalam ring buffer (terlama lebih dulu)"""
+        samples = list(self.samples)
+        return samples[-limit:] if limit else samples
@@ -0,0 +1,101 @@
+"""Salin record gateway dari ring shared memory daemon ke file biner harian
+
+Berjalan sebagai proses terpisah di samping `security_daemon.py --shared-ring`.
+
+Contoh:
+    python security_daemon.py --gateway tcp://0.0.0.0:7700 --shared-ring homesec-sensors
+    python ring_exporter.py --ring homesec-sensors --output-dir data/raw
+"""
+import argparse
+import os
+import signal
+import sys
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from sensor_gateway import SENSOR_RECORD_DTYPE
+from shared_ring import SharedSensorRing
+
+# Jumlah record maksimum per poll, membatasi salinan per iterasi
+MAX_RECORDS_PER_POLL = 65536
+
+
+def load_records(filepath):
+    """Baca kembali file record mentah hasil RingExporter"""
+    return np.fromfile(filepath, dtype=SENSOR_RECORD_DTYPE)
+
+
+class RingExporter:
+    """Pembaca ring yang menulis record mentah ke partisi `YYYY-MM-DD.bin`
+
+    Membaca lewat kursor `RingReader` sendiri sehingga penulis (daemon)
+    tidak pernah menunggu; record yang tertimpa sebelum sempat dibaca
+    dihitung di `reader.dropped`.
+    """
+
+    def __init__(self, ring, output_dir="data/raw", from_start=False):
+        self.reader = ring.reader(from_start)
+        self.output_dir = output_dir
+        self.exported = 0
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def partition_path(self, day):
+        return os.path.join(self.output_dir, f"{day.strftime('%Y-%m-%d')}.bin")
+
+    def poll(self, max_records=MAX_RECORDS_PER_POLL):
+        """Salin record baru ke partisi harian, mengembalikan jumlah record"""
+        records = self.reader.read(max_records)
+        count = len(records)
+        while len(records):
+            day = datetime.fromtimestamp(float(records["timestamp"][0])).replace(
+                hour=0, minute=0, second=0, microsecond=0)
+            in_day = records["timestamp"] < (day + timedelta(days=1)).timestamp()
+            with open(self.partition_path(day), "ab") as f:
+                records[in_day].tofile(f)
+            records = records[~in_day]
+        self.exported += count
+        return count
+
+    def run(self, stop_event, interval=1.0):
+        """Poll sampai `stop_event` di-set; sisa record dibaca sebelum berhenti"""
+        while not stop_event.is_set():
+            if self.poll() < MAX_RECORDS_PER_POLL:
+                stop_event.wait(interval)
+        while self.poll():
+            pass
+
+    def stats(self):
+        return {"exported": self.exported, "overruns": self.reader.overruns, "dropped": self.reader.dropped}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export record ring shared memory ke file biner")
+    parser.add_argument("--ring", required=True, help="Nama ring dari security_daemon.py --shared-ring")
+    parser.add_argument("--output-dir", default="data/raw")
+    parser.add_argument("--interval", type=float, default=1.0, help="Interval poll (detik)")
+    parser.add_argument("--from-start", action="store_true",
+                        help="Mulai dari record tertua yang masih ada di ring")
+    args = parser.parse_args()
+
+    ring = SharedSensorRing.attach(args.ring)
+    exporter = RingExporter(ring, args.output_dir, args.from_start)
+    stop_event = threading.Event()
+
+    def shutdown(signum, frame):
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    print(f"Mengekspor ring {args.ring} ke {args.output_dir}", flush=True)
+    exporter.run(stop_event, args.interval)
+    print(f"Statistik export: {exporter.stats()}", flush=True)
+    exporter.reader = None
+    ring.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
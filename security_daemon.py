@@ -0,0 +1,132 @@
+"""Jalankan mesin keamanan tanpa GUI (mode daemon untuk perangkat headless)
+
+Contoh:
+    python security_daemon.py --security-interval 5 --sensor-interval 10
+    python security_daemon.py --gateway tcp://0.0.0.0:7700 --simulate
+    python security_daemon.py --gateway tcp://0.0.0.0:7700 --shared-ring homesec-sensors
+    python security_daemon.py --notifications-config config/notifications.json
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+from datetime import datetime
+
+from detection_history import DetectionHistory
+from event_recorder import EventRecorder
+from notification_dispatcher import create_notifier
+from resource_sampler import ResourceSampler
+from security_engine import SecurityEngine
+from zones import ZoneRegistry
+
+
+def print_event(event):
+    """Tulis event mesin ke stdout"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if event["kind"] in ("log", "group_result"):
+        print(f"[{timestamp}] {event['message']}", flush=True)
+    elif event["kind"] == "sensor_status" and event["status"] != "NORMAL":
+        print(f"[{timestamp}] Status: {event['status']}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daemon sistem keamanan tanpa GUI")
+    parser.add_argument("--sensor-interval", type=float, default=10, help="Interval cek sensor (detik)")
+    parser.add_argument("--security-interval", type=float, default=5, help="Interval analisis AI (detik)")
+    parser.add_argument("--maintenance-interval", type=float, default=3600)
+    parser.add_argument("--validation-interval", type=float, default=1800)
+    parser.add_argument("--history-dir", default="data/history")
+    parser.add_argument("--recordings-dir", default="recordings", help="Direktori klip kejadian")
+    parser.add_argument("--resource-interval", type=float, default=0,
+                        help="Interval sampling sumber daya (0 = nonaktif)")
+    parser.add_argument("--zones-config", help="File JSON konfigurasi zona")
+    parser.add_argument("--gateway", help="Terima sensor dari gateway, mis. tcp://0.0.0.0:7700")
+    parser.add_argument("--simulate", action="store_true",
+                        help="Jalankan simulator node sensor lokal untuk gateway")
+    parser.add_argument("--shared-ring", help="Publikasikan record gateway ke ring shared memory bernama")
+    parser.add_argument("--ring-capacity", type=int, default=1 << 20, help="Kapasitas ring (record)")
+    parser.add_argument("--notifications-config", help="File JSON kanal notifikasi")
+    args = parser.parse_args()
+    if args.shared_ring and not args.gateway:
+        parser.error("--shared-ring memerlukan --gateway")
+
+    from dummy_devices import SecurityDevices
+
+    zones = ZoneRegistry.from_file(args.zones_config) if args.zones_config else ZoneRegistry()
+    devices = SecurityDevices()
+    gateway = simulator = ring = None
+    if args.gateway:
+        from sensor_gateway import GatewayDevices, SensorGatewayServer
+
+        devices = GatewayDevices(zones.names(), actuators=devices)
+        on_batch = devices.ingest
+        if args.shared_ring:
+            from shared_ring import SharedSensorRing
+
+            # ring_exporter.py memetakan ring ini lewat SharedSensorRing.attach dan membaca dengan kursornya sendiri
+            ring = SharedSensorRing.create(args.shared_ring, args.ring_capacity)
+
+            def on_batch(node_id, records):
+                devices.ingest(node_id, records)
+                ring.write(records)
+
+        gateway = SensorGatewayServer(args.gateway, on_batch)
+        gateway.start()
+        if args.simulate:
+            simulator = subprocess.Popen([
+                sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "gateway_simulator.py"),
+                "--address", args.gateway.replace("0.0.0.0", "127.0.0.1"),
+                "--zones", str(len(zones))
+            ])
+
+    notifier = None
+    if args.notifications_config:
+        with open(args.notifications_config, encoding="utf-8") as f:
+            notifier = create_notifier(json.load(f))
+
+    engine = SecurityEngine(devices, history=DetectionHistory(args.history_dir), zones=zones,
+                            recorder=EventRecorder(args.recordings_dir), notifier=notifier)
+    engine.add_listener(print_event)
+    engine.configure_default_jobs(
+        sensor_interval=args.sensor_interval,
+        security_interval=args.security_interval,
+        maintenance_interval=args.maintenance_interval,
+        validation_interval=args.validation_interval
+    )
+
+    if args.resource_interval > 0:
+        sampler = ResourceSampler(interval=args.resource_interval)
+        sampler.start()
+
+    def shutdown(signum, frame):
+        engine.stop()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    print("Mesin keamanan berjalan dalam mode daemon", flush=True)
+    engine.run_forever()
+    engine.reset_alarm()
+    engine.actuators.flush(timeout=5.0)
+    engine.actuators.stop()
+    print(f"Statistik aktuator: {engine.actuators.stats()}", flush=True)
+    engine.recorder.close()
+    if notifier is not None:
+        notifier.stop()
+        print(f"Statistik notifikasi: {notifier.stats}", flush=True)
+    if simulator is not None:
+        simulator.terminate()
+    if gateway is not None:
+        gateway.stop()
+        print(f"Statistik gateway: {gateway.stats}", flush=True)
+    if ring is not None:
+        ring.close()
+        ring.unlink()
+    print("Mesin keamanan dihentikan", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
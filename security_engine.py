@@ -0,0 +1,872 @@
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from actuator_dispatcher import ActuatorDispatcher
+from audio_pipeline import THREAT_SOUNDS
+from detection_history import DetectionHistory
+from event_correlation import EventCorrelator
+from latency_metrics import PipelineLatency
+from motion_gate import MotionGate
+from object_tracker import MultiObjectTracker, UniqueObjectCounter, OBJECT_CLASSES
+from sensor_fusion import ZoneFusion, readings_matrix, STATUS_ALARM, STATUS_WASPADA
+from threshold_backtest import BackgroundBacktest
+from zones import ZoneRegistry, DEFAULT_ZONES
+
+# Anggaran waktu respons pipeline deteksi (sensor sampai alarm)
+RESPONSE_BUDGET_MS = 500
+
+# Ambang batas per sensor: (sensor, ambang, ikon, pesan log, label, jenis kejadian)
+SENSOR_RULES = [
+    ("pir", 0.7, "🚨", "Gerakan terdeteksi!", "PIR", "gerakan"),
+    ("magnetic", 0.8, "🚪", "Pintu/jendela terbuka!", "Magnetic", "pintu_terbuka"),
+    ("vibration", 80, "📳", "Getaran kuat terdeteksi!", "Vibration", "getaran"),
+]
+SENSOR_THRESHOLDS = np.array([rule[1] for rule in SENSOR_RULES], dtype=np.float64)
+SENSOR_TYPES = {rule[0] for rule in SENSOR_RULES}
+
+# Zona untuk pembacaan yang tidak menyebutkan zona
+UNKNOWN_ZONE = "-"
+
+# Warna status sistem hasil fusi sensor
+STATUS_COLORS = {"NORMAL": "#27ae60", STATUS_WASPADA: "#f39c12", STATUS_ALARM: "#e74c3c"}
+
+# Deteksi gerakan dengan kepercayaan minimal ini ikut direkam sebagai klip
+RECORD_CONFIDENCE = 0.9
+
+
+class SecurityAI:
+    """Sistem AI keamanan default dengan machine learning"""
+
+    def __init__(self, zones=None):
+        self.threat_level = "Aman"
+        self.last_detection = None
+        self.active_zones = list(zones) if zones else list(DEFAULT_ZONES)
+        self.training_data = []
+        self.model_version = 1.0
+        self.last_training = datetime.now()
+        self.false_positives = []
+        self.false_negatives = []
+    
+    def analyze_motion(self, sensor_data):
+        """Analisis gerakan dengan machine learning"""
+        result = {
+            "status": "Normal",
+            "location": "Depan",
+            "confidence": 0.95,
+            "type": "Orang",
+            "action": "Berjalan"
+        }
+        return result
+    
+    def collect_training_data(self, sensor_data, result, label=None):
+        """Mengumpulkan data untuk training"""
+        training_instance = {
+            "timestamp": datetime.now(),
+            "sensor_data": sensor_data,
+            "result": result,
+            "label": label,
+            "verified": False
+        }
+        self.training_data.append(training_instance)
+        
+        # Batasi ukuran data training
+        if len(self.training_data) > 1000:
+            self.training_data = self.training_data[-1000:]
+    
+    def update_model(self):
+        """Update model dengan data baru"""
+        if len(self.training_data) >= 100:  # Minimal 100 data untuk update
+            try:
+                # Simulasi update model
+                self.model_version += 0.1
+                self.last_training = datetime.now()
+                # Reset data training setelah update
+                self.training_data = []
+                return {
+                    "status": "Success",
+                    "new_version": self.model_version,
+                    "accuracy": 0.95
+                }
+            except Exception as e:
+                return {
+                    "status": "Failed",
+                    "error": str(e)
+                }
+        return {"status": "Insufficient data"}
+    
+    def validate_detection(self, detection_id, is_correct):
+        """Validasi deteksi untuk pembelajaran"""
+        if not is_correct:
+            if detection_id in self.training_data:
+                if self.training_data[detection_id]["result"]["status"] == "Normal":
+                    self.false_negatives.append(detection_id)
+                else:
+                    self.false_positives.append(detection_id)
+    
+    def get_model_metrics(self):
+        """Dapatkan metrik performa model"""
+        return {
+            "version": self.model_version,
+            "last_training": self.last_training,
+            "training_data_size": len(self.training_data),
+            "false_positives": len(self.false_positives),
+            "false_negatives": len(self.false_negatives)
+        }
+    
+    def adaptive_learning(self, new_pattern):
+        """Pembelajaran adaptif untuk pola baru"""
+        self.collect_training_data(new_pattern, None, "new_pattern")
+        if len(self.training_data) >= 50:  # Update lebih cepat untuk pola baru
+            return self.update_model()
+        return {"status": "Collecting data"}
+
+    def detect_intrusion(self, sensor_data):
+        """Deteksi penyusupan"""
+        return {
+            "detected": False,
+            "location": "Depan",
+            "threat_level": "Rendah"
+        }
+
+    def analyze_sound(self, sensor_data):
+        """Analisis suara dari ringkasan fitur audio per mikrofon jika tersedia"""
+        audio = sensor_data.get("audio") or {}
+        events = [(zone, mic["event"]) for zone, mic in audio.items() if mic.get("event")]
+        if not events:
+            return {
+                "is_threat": False,
+                "type": "Normal",
+                "level_db": round(max((mic["level_db"] for mic in audio.values()), default=45.0), 1)
+            }
+        
+        # Kejadian terkuat: suara ancaman lebih dulu, lalu level tertinggi
+        zone, event = max(events, key=lambda item: (item[1]["type"] in THREAT_SOUNDS,
+                                                    item[1]["level_db"]))
+        return {
+            "is_threat": event["type"] in THREAT_SOUNDS,
+            "type": event["type"],
+            "level_db": round(event["level_db"], 1),
+            "location": zone
+        }
+
+    def get_security_status(self):
+        """Dapatkan status keamanan"""
+        return {
+            "overall_status": "Aman",
+            "last_check": datetime.now().strftime("%H:%M:%S")
+        }
+
+
+def create_ai_system(zones=None):
+    """Gunakan modul AI keamanan lanjutan jika ada, jika tidak gunakan implementasi default"""
+    try:
+        from security_ai_model import AdvancedSecurityAI
+        return AdvancedSecurityAI()
+    except ImportError:
+        print("Info: Menggunakan sistem AI keamanan default dengan machine learning")
+        return SecurityAI(zones)
+
+
+class SecurityEngine:
+    """Mesin keamanan tanpa Qt: polling sensor, analisis AI, alarm dan maintenance
+
+    Hasil dikirim sebagai event ke listener (GUI, daemon, logger), sehingga
+    mesin bisa berjalan di perangkat tanpa layar dengan event loop sendiri
+    (`run_forever`) atau digerakkan dari luar, misalnya oleh QTimer.
+
+    Jenis event: "log" (message), "sensor_status" (status, color),
+    "security_status" (status) dan "group_result" (status, message). Event
+    "group_result" dikirim dari thread dispatcher aktuator, listener GUI
+    harus meneruskannya ke thread UI.
+    """
+
+    def __init__(self, devices, ai_system=None, history=None, latency=None, zones=None,
+                 clock=time.time, motion_gate=None, audio=None, recorder=None, actuators=None,
+                 notifier=None, fusion=None, correlator=None):
+        self.devices = devices
+        self.zones = zones if zones is not None else ZoneRegistry(clock=clock)
+        self.ai_system = ai_system if ai_system is not None else create_ai_system(self.zones.names())
+        self.history = history if history is not None else DetectionHistory()
+        self.latency = latency if latency is not None else PipelineLatency()
+        # Perintah ke aktuator lewat antrean agar I/O perangkat tidak memblokir deteksi
+        self.actuators = actuators if actuators is not None else ActuatorDispatcher(devices, latency=self.latency)
+        self.fusion = fusion if fusion is not None else ZoneFusion(self.zones.names(), clock=clock)
+        self.correlator = correlator if correlator is not None else EventCorrelator()
+        # Backtest parameter fusi berjalan di latar, dipicu dari maintenance
+        self.backtest = BackgroundBacktest(self.history, self.fusion, clock=clock)
+        self.motion_gate = motion_gate if motion_gate is not None else MotionGate(self.zones.camera_rois())
+        self.trackers = {}
+        self._track_ids = itertools.count(1)
+        self.object_counter = UniqueObjectCounter()
+        self.audio = audio
+        self.recorder = recorder
+        self.notifier = notifier
+        self.clock = clock
+        self.listeners = []
+        self.jobs = []
+        self._job_seq = itertools.count()
+        self._stop_event = threading.Event()
+
+    def add_listener(self, listener):
+        """Daftarkan callback penerima event mesin"""
+        self.listeners.append(listener)
+
+    def emit(self, kind, **fields):
+        """Kirim event ke semua listener"""
+        event = dict(fields, kind=kind)
+        for listener in self.listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"Error dalam listener mesin keamanan: {str(e)}")
+
+    def log(self, message):
+        self.emit("log", message=message)
+
+    def now(self):
+        return datetime.fromtimestamp(self.clock())
+
+    # ------------------------------------------------------------------
+    # Pipeline deteksi
+
+    def read_zone_sensors(self):
+        """Baca sensor semua zona sebagai dict {zona: pembacaan}
+
+        Perangkat multi-zona menyediakan `get_all_zone_readings` di samping
+        `get_all_sensor_readings`; perangkat biasa hanya mengembalikan satu
+        dict yang boleh berisi kunci "zone". Tanpa kunci itu, setiap sensor
+        dipetakan ke zona lewat binding `Zone.sensors` (id "pir_belakang"
+        dibaca sebagai sensor "pir"); sensor yang tidak terikat masuk ke
+        UNKNOWN_ZONE, yang ikut fusi dan riwayat tetapi bukan zona registry.
+        """
+        if hasattr(self.devices, "get_all_zone_readings"):
+            return self.devices.get_all_zone_readings()
+        readings = self.devices.get_all_sensor_readings()
+        if "zone" in readings:
+            return {readings["zone"]: readings}
+        
+        zone_readings = {}
+        for sensor, value in readings.items():
+            zone = self.zones.zone_for_sensor(sensor)
+            if zone is None:
+                zone = UNKNOWN_ZONE
+            else:
+                kind = sensor.split("_", 1)[0]
+                sensor = kind if kind in SENSOR_TYPES else sensor
+            zone_readings.setdefault(zone, {"zone": zone})[sensor] = value
+        return zone_readings
+
+    def check_sensors(self):
+        """Periksa pembacaan sensor semua zona dengan fusi sensor
+
+        Ambang batas per sensor dievaluasi sebagai satu operasi array zona x
+        sensor untuk riwayat kejadian; keputusan alarm dan status diambil
+        per zona dari probabilitas ancaman hasil fusi semua sensor.
+        """
+        try:
+            read_start = time.perf_counter_ns()
+            zone_readings = self.read_zone_sensors()
+            self.latency.record("sensor_read", time.perf_counter_ns() - read_start)
+            
+            # Update log dengan data sensor
+            now = self.now()
+            current_time = now.strftime("%H:%M:%S")
+            
+            zone_names = list(zone_readings)
+            values = np.array([
+                [float(zone_readings[zone].get(rule[0], 0.0)) for rule in SENSOR_RULES]
+                for zone in zone_names
+            ], dtype=np.float64).reshape(len(zone_names), len(SENSOR_RULES))
+            triggered = values > SENSOR_THRESHOLDS
+            timestamp = self.clock()
+            
+            # Pre-roll perekam kejadian per zona
+            if self.recorder is not None:
+                for zone in zone_names:
+                    self.recorder.add_sensor(zone, zone_readings[zone], timestamp)
+                self.log_saved_clips()
+            
+            # Simpan pembacaan semua zona ke riwayat dalam satu kali tulis
+            self.history.record_many([
+                ("pembacaan", zone, sensor, value, "")
+                for zone in zone_names
+                for sensor, value in zone_readings[zone].items()
+                if isinstance(value, (int, float)) and not isinstance(value, bool)
+            ], timestamp=now)
+            
+            for zone_i, rule_i in np.argwhere(triggered):
+                sensor, _, icon, message, label, event_type = SENSOR_RULES[rule_i]
+                self.history.record(event_type, zone=zone_names[zone_i], sensor=sensor,
+                                    value=values[zone_i, rule_i], message=message.rstrip("!"),
+                                    timestamp=now)
+                self.correlate(zone_names[zone_i], event_type, timestamp)
+            
+            # Catat kejadian ke state zona
+            indices = []
+            for zone_i in np.flatnonzero(triggered.any(axis=1)):
+                index = self.zones.index(zone_names[zone_i])
+                if index is not None:
+                    indices.append(index)
+                else:
+                    # Sensor tanpa zona dihitung terpisah, bukan sebagai zona registry
+                    self.zones.record_unassigned(
+                        [SENSOR_RULES[rule_i][0] for rule_i in np.flatnonzero(triggered[zone_i])])
+            self.zones.record_events(indices)
+            
+            # Fusi semua bukti zona, alarm hanya saat zona baru masuk status alarm
+            probabilities, newly_alarmed = self.fusion.update(
+                zone_names, readings_matrix([zone_readings[zone] for zone in zone_names]), timestamp)
+            rows = {zone: row for row, zone in enumerate(zone_names)}
+            for fusion_i in newly_alarmed:
+                zone = self.fusion.zone_names[fusion_i]
+                row = rows.get(zone)
+                evidence = ", ".join(
+                    f"{SENSOR_RULES[rule_i][4]}: {values[row, rule_i]:.2f}"
+                    for rule_i in np.flatnonzero(triggered[row])) if row is not None else ""
+                location = "" if zone == UNKNOWN_ZONE else f" [{zone}]"
+                self.log(f"🚨 {current_time} - Ancaman terdeteksi{location} "
+                         f"(probabilitas {probabilities[fusion_i]:.2f}{'; ' + evidence if evidence else ''})")
+                self.trigger_alarm(read_start, zone=None if zone == UNKNOWN_ZONE else zone)
+            
+            # Status sistem mengikuti zona dengan status tertinggi
+            statuses = self.fusion.statuses()
+            if (statuses == STATUS_ALARM).any():
+                system_status = STATUS_ALARM
+            elif (statuses == STATUS_WASPADA).any():
+                system_status = STATUS_WASPADA
+            else:
+                system_status = "NORMAL"
+            
+            self.emit("sensor_status", status=system_status, color=STATUS_COLORS[system_status])
+            return system_status
+        except Exception as e:
+            print(f"Error dalam simulasi aktivitas: {str(e)}")
+            return None
+
+    def update_security(self):
+        """Update status keamanan dengan analisis AI
+
+        Error per tahap dicetak dan dilewati; error di luar tahap diteruskan
+        ke pemanggil.
+        """
+        security_status = None
+        
+        # Dapatkan data sensor
+        with self.latency.span("total") as read_start:
+            with self.latency.span("sensor_read"):
+                sensor_data = self.devices.get_all_sensor_readings()
+            now = self.now()
+            
+            # Analisis gerakan
+            try:
+                with self.latency.span("analyze_motion"):
+                    motion_result = self.ai_system.analyze_motion(sensor_data)
+                self.handle_motion_result(motion_result, now)
+            except Exception as e:
+                print(f"Error dalam analisis gerakan: {str(e)}")
+            
+            # Deteksi penyusupan
+            try:
+                with self.latency.span("detect_intrusion"):
+                    intrusion_result = self.ai_system.detect_intrusion(sensor_data)
+                    intrusion_result = self.correlator.escalate(intrusion_result, self.clock())
+                if intrusion_result["detected"]:
+                    self.log(
+                        f"🚨 PERINGATAN: Terdeteksi penyusupan di {intrusion_result['location']}! " +
+                        f"Level ancaman: {intrusion_result['threat_level']}" +
+                        (f" (pola: {intrusion_result['sequence']})" if intrusion_result.get("sequence") else "")
+                    )
+                    self.zones.record_event(intrusion_result['location'], weight=3.0)
+                    self.history.record("penyusupan", zone=intrusion_result['location'],
+                                        message=f"Level ancaman: {intrusion_result['threat_level']}",
+                                        timestamp=now)
+                    if intrusion_result["threat_level"] in ["Tinggi", "Kritis"]:
+                        self.trigger_alarm(read_start, zone=intrusion_result['location'])
+                        self.notify(
+                            f"Penyusupan di {intrusion_result['location']}",
+                            f"Level ancaman: {intrusion_result['threat_level']}",
+                            "kritis" if intrusion_result["threat_level"] == "Kritis" else "peringatan")
+            except Exception as e:
+                print(f"Error dalam deteksi penyusupan: {str(e)}")
+            
+            # Analisis suara, dengan ringkasan fitur audio sejak analisis terakhir
+            try:
+                with self.latency.span("analyze_sound"):
+                    if self.audio is not None:
+                        sensor_data = dict(sensor_data, audio=self.audio.take_summary())
+                    audio_result = self.ai_system.analyze_sound(sensor_data)
+                if audio_result["is_threat"]:
+                    self.log(
+                        f"🔊 Terdeteksi suara mencurigakan: {audio_result['type']} " +
+                        f"({audio_result['level_db']} dB)"
+                    )
+                    self.history.record("suara", zone=audio_result.get('location', UNKNOWN_ZONE),
+                                        sensor="audio", value=audio_result['level_db'],
+                                        message=audio_result['type'], timestamp=now)
+                    self.correlate(audio_result.get('location', UNKNOWN_ZONE), "suara", self.clock())
+            except Exception as e:
+                print(f"Error dalam analisis suara: {str(e)}")
+            
+            # Update status keamanan
+            try:
+                with self.latency.span("status_update"):
+                    security_status = self.ai_system.get_security_status()
+                    self.emit("security_status", status=security_status)
+            except Exception as e:
+                print(f"Error dalam update status keamanan: {str(e)}")
+        
+        return security_status
+
+    def handle_motion_result(self, motion_result, now):
+        """Log, catat ke zona dan riwayat untuk hasil analisis gerakan"""
+        if motion_result["status"] == "Normal":
+            return
+        self.log(
+            f"👥 Terdeteksi {motion_result['type']} {motion_result['action']} " +
+            f"di area {motion_result['location']} " +
+            f"(Kepercayaan: {motion_result['confidence']:.2f})"
+        )
+        self.zones.record_event(motion_result['location'])
+        self.fusion.add_evidence(motion_result['location'], "vision", motion_result['confidence'])
+        self.correlate(motion_result['location'], "deteksi_gerakan", self.clock())
+        self.history.record("deteksi_gerakan", zone=motion_result['location'],
+                            value=motion_result['confidence'],
+                            message=f"{motion_result['type']} {motion_result['action']}",
+                            timestamp=now)
+        if self.recorder is not None and motion_result['confidence'] >= RECORD_CONFIDENCE:
+            self.recorder.trigger(motion_result['location'], "deteksi", self.clock())
+
+    def correlate(self, zone, event_type, timestamp):
+        """Teruskan kejadian ke korelator dan catat pola berurutan yang terpenuhi"""
+        for match in self.correlator.add(zone, event_type, timestamp):
+            self.log(f"🔗 Pola berurutan terdeteksi: {match['pattern']} "
+                     f"({' → '.join(match['steps'])}, {match['end'] - match['start']:.0f} detik)")
+            self.history.record("korelasi", zone=match["zone"], message=match["pattern"],
+                                timestamp=self.now())
+
+    def analyze_vision(self, frames):
+        """Saring frame kamera dengan motion gate dan pelacak objek
+
+        Detektor (analyze_motion) hanya dijalankan untuk frame bergerak saat
+        pelacak membutuhkannya; di antaranya track dibawa maju dengan
+        prediksi. `frames` berisi pasangan (kamera, frame RGB). Mengembalikan
+        jumlah frame yang diteruskan ke detektor.
+        """
+        camera_zones = self.zones.camera_zones()
+        passed = 0
+        for camera, frame in frames:
+            try:
+                if self.recorder is not None:
+                    self.recorder.add_frame(camera_zones.get(camera, UNKNOWN_ZONE), camera, frame,
+                                            self.clock())
+                with self.latency.span("motion_gate"):
+                    gate_result = self.motion_gate.process(camera, frame)
+                tracker = self.trackers.get(camera)
+                if tracker is None:
+                    tracker = self.trackers[camera] = MultiObjectTracker(id_source=self._track_ids)
+                if not gate_result["motion"] or not tracker.needs_detection(gate_result["regions"]):
+                    with self.latency.span("tracking"):
+                        tracker.update(None)
+                    continue
+                passed += 1
+                
+                zones = list(gate_result["zones"]) or [camera_zones.get(camera, UNKNOWN_ZONE)]
+                with self.latency.span("analyze_motion"):
+                    motion_result = self.ai_system.analyze_motion({
+                        "camera": camera,
+                        "zone": zones[0],
+                        "zones": zones,
+                        "frame": frame,
+                        "regions": gate_result["regions"]
+                    })
+                
+                # Detektor boleh mengembalikan kotak sendiri, jika tidak pakai region gerakan
+                # tanpa kelas: track dari region tetap dilacak tetapi tidak dihitung sebagai objek
+                detections = motion_result.get("detections") or [
+                    (region[:4], None, motion_result["confidence"])
+                    for region in gate_result["regions"]
+                ]
+                with self.latency.span("tracking"):
+                    confirmed = tracker.update(detections)
+                
+                # Hanya objek unik baru yang diklasifikasi detektor yang dihitung
+                for track_id, object_class in confirmed:
+                    if object_class is not None:
+                        self.object_counter.add(object_class, self.clock())
+                if confirmed:
+                    self.handle_motion_result(motion_result, self.now())
+            except Exception as e:
+                print(f"Error dalam analisis video: {str(e)}")
+        return passed
+
+    def process_audio(self):
+        """Hitung fitur semua chunk audio baru dari pipeline audio"""
+        if self.audio is None:
+            return []
+        try:
+            with self.latency.span("audio_features"):
+                events = self.audio.process(
+                    sink=self.recorder.add_audio if self.recorder is not None else None)
+            # Hanya suara ancaman dari sumber nyata yang menjadi bukti fusi; mikrofon dinamai sesuai zona
+            for event in events:
+                if event["type"] in THREAT_SOUNDS and not event.get("synthetic"):
+                    self.fusion.add_evidence(event["microphone"], "audio", event["level_db"])
+            if self.recorder is not None:
+                self.log_saved_clips()
+            return events
+        except Exception as e:
+            print(f"Error dalam pemrosesan audio: {str(e)}")
+            return []
+
+    def tracking_summary(self):
+        """Statistik pelacak dan jumlah objek unik per kelas"""
+        runs = sum(tracker.detector_runs for tracker in self.trackers.values())
+        frames = sum(tracker.frames for tracker in self.trackers.values())
+        return {
+            "active_tracks": sum(len(tracker) for tracker in self.trackers.values()),
+            "detector_rate": runs / frames if frames else 0.0,
+            "unique_objects": dict(zip(OBJECT_CLASSES, self.object_counter.totals.tolist())),
+            "motion_gate": self.motion_gate.stats()
+        }
+
+    def trigger_alarm(self, read_start=None, zone=None):
+        """Kirim perintah alarm ke dispatcher dan mulai klip kejadian
+
+        Latensi sensor-ke-alarm dicatat dispatcher saat perangkat selesai
+        menjalankan perintah.
+        """
+        with self.latency.span("trigger_alarm"):
+            self.actuators.submit("alarm", "trigger_alarm", origin_ns=read_start)
+        if self.recorder is not None:
+            self.recorder.trigger(zone, "alarm", self.clock())
+
+    def activate_alarm(self, zone=None):
+        """Alarm manual operator, dicatat sebagai label insiden untuk backtest fusi"""
+        self.history.record("insiden", zone=zone or "-", message="Alarm diaktifkan manual",
+                            timestamp=self.now())
+        self.trigger_alarm(zone=zone)
+
+    def log_saved_clips(self):
+        """Log klip kejadian yang sudah selesai ditulis perekam"""
+        self.recorder.poll(self.clock())
+        for filepath, zone, reason in self.recorder.drain_saved():
+            self.log(f"🎞️ Klip kejadian ({reason}, zona {zone}) disimpan: {filepath}")
+
+    def reset_alarm(self):
+        self.actuators.submit("alarm", "reset_alarm")
+
+    def lock_all_doors(self):
+        """Kunci pintu semua zona secara paralel"""
+        self.log(f"🔒 Mengunci pintu di {len(self.zones)} zona...")
+        future = self.actuators.submit_group("lock_door", self.zones.names(), label="Kunci Semua Pintu")
+        future.add_done_callback(self.emit_group_result)
+        return future
+
+    def request_help(self):
+        """Catat permintaan bantuan manual, kirim notifikasi kritis dan picu alarm"""
+        now = self.now()
+        if self.notifier is not None:
+            self.notify("Permintaan bantuan", f"Bantuan diminta dari panel kontrol pada {now:%H:%M:%S}", "kritis")
+            self.log(f"📞 {now:%H:%M:%S} - Permintaan bantuan dikirim")
+        else:
+            self.log(f"⚠️ {now:%H:%M:%S} - Kanal notifikasi belum dikonfigurasi, bantuan tidak terkirim")
+        self.history.record("bantuan", message="Permintaan bantuan manual", timestamp=now)
+        self.trigger_alarm()
+
+    def notify(self, title, message, severity="info"):
+        """Antrekan notifikasi ke penerima; pengiriman tidak pernah ditunggu"""
+        if self.notifier is not None:
+            self.notifier.notify(title, message, severity)
+
+    def emit_group_result(self, future):
+        """Done-callback perintah aktuator grup: kirim status gabungan sebagai event"""
+        try:
+            status = future.result()
+        except Exception as e:
+            print(f"Error dalam perintah aktuator grup: {str(e)}")
+            return
+        failures = [f"{count} {label}" for count, label in (
+            (status["failed"], "gagal"), (status["timed_out"], "timeout"),
+            (status["unsupported"], "tidak didukung")) if count]
+        icon = "⚠️" if failures else "✅"
+        detail = f", {', '.join(failures)}" if failures else ""
+        if status["hung"]:
+            detail += (f"; {status['hung']} panggilan masih berjalan "
+                       f"({self.actuators.hung_calls} worker grup tertahan)")
+        self.emit("group_result", status=status,
+                  message=f"{icon} {status['label']}: {status['succeeded']}/{status['targets']} berhasil{detail} "
+                          f"({status['total_ms']:.0f} ms, terlambat: {status['slowest']} "
+                          f"{status['slowest_ms']:.0f} ms)")
+
+    # ------------------------------------------------------------------
+    # Maintenance AI
+
+    def maintain(self):
+        """Maintenance rutin sistem AI keamanan"""
+        try:
+            # 1. Analisis Pola Keamanan
+            security_patterns = self.analyze_security_patterns()
+            if security_patterns["new_patterns_found"]:
+                self.log(
+                    f"🔍 Pola baru terdeteksi: {security_patterns['pattern_description']}")
+                self.ai_system.adaptive_learning(security_patterns["pattern_data"])
+
+            # 2. Evaluasi Akurasi Deteksi
+            detection_metrics = self.evaluate_detection_accuracy()
+            self.log(
+                f"📊 Akurasi Deteksi - Orang: {detection_metrics['person_accuracy']}%, " +
+                f"Kendaraan: {detection_metrics['vehicle_accuracy']}%, " +
+                f"Objek: {detection_metrics['object_accuracy']}%")
+
+            # 3. Analisis Zona Keamanan
+            zone_analysis = self.analyze_security_zones()
+            for zone, status in zone_analysis["vulnerable_zones"].items():
+                if status["risk_level"] > 0.7:
+                    self.log(
+                        f"⚠️ Zona {zone} memerlukan perhatian - " +
+                        f"Risiko: {status['risk_level']:.2f}, " +
+                        f"Alasan: {status['reason']}")
+            if zone_analysis.get("unassigned_events"):
+                self.log(
+                    f"⚠️ {zone_analysis['unassigned_events']} kejadian dari sensor tanpa zona " +
+                    f"({', '.join(zone_analysis['unassigned_sensors'])}), tambahkan binding di konfigurasi zona")
+
+            # 4. Optimasi Sensor
+            sensor_optimization = self.optimize_sensors()
+            if sensor_optimization["adjustments_needed"] and sensor_optimization["new"]:
+                for recommendation in sensor_optimization["recommendations"]:
+                    self.log(f"🔧 Rekomendasi penyesuaian sensor: {recommendation}")
+
+            # 5. Analisis Waktu Respons
+            response_analysis = self.analyze_response_times()
+            self.log(
+                f"⚡ Waktu respons rata-rata: {response_analysis['avg_response_time']}ms, " +
+                f"Keterlambatan: {response_analysis['delayed_responses']}")
+
+            # 6. Pembaruan Knowledge Base
+            kb_update = self.update_knowledge_base()
+            if kb_update["new_entries"]:
+                self.log(
+                    f"📚 Knowledge base diperbarui dengan {kb_update['new_entries']} kasus baru")
+
+        except Exception as e:
+            print(f"Error dalam maintenance AI: {str(e)}")
+
+    def analyze_security_patterns(self):
+        """Analisis pola keamanan baru"""
+        try:
+            return {
+                "new_patterns_found": True,
+                "pattern_description": "Aktivitas berulang di zona belakang pukul 02:00-03:00",
+                "pattern_data": {
+                    "time_range": "02:00-03:00",
+                    "location": "belakang",
+                    "frequency": "daily",
+                    "confidence": 0.85
+                }
+            }
+        except Exception as e:
+            print(f"Error dalam analisis pola: {str(e)}")
+            return {"new_patterns_found": False}
+
+    def evaluate_detection_accuracy(self):
+        """Evaluasi akurasi deteksi berbagai objek"""
+        try:
+            return {
+                "person_accuracy": 95,
+                "vehicle_accuracy": 92,
+                "object_accuracy": 88,
+                "false_positives": {
+                    "person": 0.03,
+                    "vehicle": 0.05,
+                    "object": 0.07
+                },
+                "false_negatives": {
+                    "person": 0.02,
+                    "vehicle": 0.03,
+                    "object": 0.05
+                }
+            }
+        except Exception as e:
+            print(f"Error dalam evaluasi akurasi: {str(e)}")
+            return {"person_accuracy": 0, "vehicle_accuracy": 0, "object_accuracy": 0}
+
+    def analyze_security_zones(self):
+        """Analisis kerentanan zona keamanan dari state registry zona"""
+        try:
+            vulnerable_zones = {}
+            recommendations = {}
+            for zone, state in self.zones.summary().items():
+                vulnerable_zones[zone] = {
+                    "risk_level": state["risk_level"],
+                    "reason": f"{state['events']} kejadian tercatat"
+                }
+                if state["risk_level"] > 0.7:
+                    recommendations[zone] = "Periksa sensor dan kamera zona"
+            return {
+                "vulnerable_zones": vulnerable_zones,
+                "recommendations": recommendations,
+                "unassigned_events": self.zones.unassigned_events,
+                "unassigned_sensors": sorted(self.zones.unassigned_sensors)
+            }
+        except Exception as e:
+            print(f"Error dalam analisis zona: {str(e)}")
+            return {"vulnerable_zones": {}}
+
+    def optimize_sensors(self):
+        """Rekomendasi parameter fusi sensor dari backtest riwayat berlabel
+
+        Label berasal dari alarm manual ("insiden") dan permintaan bantuan;
+        tanpa label backtest tidak memuat pembacaan dan tidak ada
+        rekomendasi. Backtest dijalankan di latar; "new" bernilai True jika
+        hasil backtest baru selesai sejak pemanggilan sebelumnya.
+        """
+        try:
+            report, fresh = self.backtest.poll()
+            if report is None:
+                return {"adjustments_needed": False, "recommendations": [], "new": False}
+            
+            recommendations = []
+            current, best = report["current"], report["recommended"]
+            if best is not None:
+                # Hanya sarankan perubahan yang menaikkan deteksi atau jelas mengurangi alarm palsu
+                better_detection = best["detection_rate"] > current["detection_rate"]
+                fewer_false_alarms = (best["detection_rate"] >= current["detection_rate"] and
+                                      best["false_alarms_per_day"] < 0.9 * current["false_alarms_per_day"])
+                if better_detection or fewer_false_alarms:
+                    changes = [f"bobot {sensor} {current['weights'][sensor]:g} → {weight:g}"
+                               for sensor, weight in best["weights"].items()
+                               if weight != current["weights"][sensor]]
+                    if best["centre_shift"]:
+                        changes.append(f"titik tengah {best['centre_shift']:+g} skala")
+                    for key, label in (("alarm_probability", "probabilitas alarm"),
+                                       ("clear_probability", "probabilitas clear")):
+                        if best[key] != current[key]:
+                            changes.append(f"{label} {current[key]:.2f} → {best[key]:.2f}")
+                    recommendations.append(
+                        f"Fusi sensor ({report['incidents']} insiden berlabel): {', '.join(changes)}; "
+                        f"deteksi {current['detection_rate']:.0%} → {best['detection_rate']:.0%}, "
+                        f"alarm palsu {current['false_alarms_per_day']:.1f} → "
+                        f"{best['false_alarms_per_day']:.1f}/hari")
+            
+            return {
+                "adjustments_needed": bool(recommendations),
+                "recommendations": recommendations,
+                "new": fresh,
+                "backtest": report
+            }
+        except Exception as e:
+            print(f"Error dalam optimasi sensor: {str(e)}")
+            return {"adjustments_needed": False, "recommendations": [], "new": False}
+
+    def analyze_response_times(self):
+        """Analisis waktu respons sistem dari histogram latensi pipeline"""
+        try:
+            summary = self.latency.summary()
+            total = self.latency.histograms["total"]
+            
+            stage_map = {
+                "detection": ["sensor_read"],
+                "analysis": ["analyze_motion", "detect_intrusion", "analyze_sound"],
+                "decision": ["status_update"],
+                "action": ["trigger_alarm", "actuator_ack"]
+            }
+            breakdown = {
+                name: round(sum(summary.get(stage, {}).get("p50", 0.0) for stage in stages), 2)
+                for name, stages in stage_map.items()
+            }
+            
+            # Tahap dengan p95 tertinggi dianggap bottleneck
+            stages = [(stats["p95"], stage) for stage, stats in summary.items()
+                      if stage not in ("total", "sensor_to_alarm")]
+            bottlenecks = [max(stages)[1]] if stages else []
+            
+            return {
+                "avg_response_time": round(total.mean_ms(), 2),
+                "delayed_responses": total.count_above_ms(RESPONSE_BUDGET_MS),
+                "response_breakdown": breakdown,
+                "percentiles": summary,
+                "bottlenecks": bottlenecks
+            }
+        except Exception as e:
+            print(f"Error dalam analisis respons: {str(e)}")
+            return {"avg_response_time": 0, "delayed_responses": 0}
+
+    def update_knowledge_base(self):
+        """Update basis pengetahuan sistem"""
+        try:
+            return {
+                "new_entries": 5,
+                "categories": {
+                    "normal_activity": 2,
+                    "suspicious_patterns": 2,
+                    "environmental": 1
+                },
+                "total_cases": 1250,
+                "learning_rate": 0.92
+            }
+        except Exception as e:
+            print(f"Error dalam update knowledge base: {str(e)}")
+            return {"new_entries": 0}
+
+    def validate_model(self):
+        """Validasi performa model"""
+        try:
+            metrics = self.ai_system.get_model_metrics()
+            total_errors = metrics['false_positives'] + metrics['false_negatives']
+            
+            if total_errors > 10:  # Terlalu banyak error
+                self.log("⚠️ Performa model menurun, memulai pembelajaran adaptif")
+                self.ai_system.adaptive_learning(self.devices.get_all_sensor_readings())
+            
+        except Exception as e:
+            print(f"Error dalam validasi model: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # Penjadwalan tanpa Qt
+
+    def add_job(self, name, interval, fn):
+        """Jadwalkan fungsi berkala (interval dalam detik)"""
+        heapq.heappush(self.jobs, (self.clock() + interval, next(self._job_seq), name, interval, fn))
+
+    def configure_default_jobs(self, sensor_interval=10, security_interval=5,
+                               maintenance_interval=3600, validation_interval=1800,
+                               audio_interval=0.25):
+        """Jadwal standar yang sama dengan timer pada GUI"""
+        self.add_job("sensors", sensor_interval, self.check_sensors)
+        self.add_job("security", security_interval, self.update_security)
+        if self.audio is not None:
+            self.add_job("audio", audio_interval, self.process_audio)
+        self.add_job("maintenance", maintenance_interval, self.maintain)
+        self.add_job("validation", validation_interval, self.validate_model)
+
+    def run_pending(self):
+        """Jalankan semua job yang sudah jatuh tempo, kembalikan waktu job berikutnya"""
+        while self.jobs and self.jobs[0][0] <= self.clock():
+            due, _, name, interval, fn = heapq.heappop(self.jobs)
+            try:
+                fn()
+            except Exception as e:
+                print(f"Error dalam job {name}: {str(e)}")
+            # Jika tertinggal jauh, jangan kejar dengan burst eksekusi
+            next_due = due + interval
+            if next_due <= self.clock():
+                next_due = self.clock() + interval
+            heapq.heappush(self.jobs, (next_due, next(self._job_seq), name, interval, fn))
+        return self.jobs[0][0] if self.jobs else None
+
+    def run_forever(self):
+        """Event loop mesin sendiri sampai `stop` dipanggil"""
+        self._stop_event.clear()
+        while not self._stop_event.is_set():
+            next_due = self.run_pending()
+            timeout = 1.0 if next_due is None else max(0.0, next_due - self.clock())
+            self._stop_event.wait(timeout)
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,148 @@
+import time
+
+import numpy as np
+
+# Model bukti per sensor: (sensor, titik tengah, skala, log-odds maksimum).
+# Bukti = maks * tanh((nilai - tengah) / skala); di bawah titik tengah
+# bobotnya dikalikan MISS_WEIGHT karena sensor yang diam adalah bukti lemah.
+# Satu pembacaan kuat PIR/getaran (dua skala di atas titik tengah) atau pintu
+# terbuka (magnetic praktis biner, skala sempit) cukup untuk alarm dari prior;
+# pembacaan yang hanya sedikit di atas ambang perlu dukungan sensor lain.
+FUSION_SENSORS = [
+    ("pir", 0.7, 0.1, 7.0),
+    ("magnetic", 0.8, 0.05, 7.0),
+    ("vibration", 80.0, 10.0, 7.0),
+    ("audio", 70.0, 10.0, 1.5),
+    ("vision", 0.6, 0.15, 2.5),
+]
+FUSION_SENSOR_NAMES = [sensor[0] for sensor in FUSION_SENSORS]
+MISS_WEIGHT = 0.05
+
+# Batas log-odds agar zona tidak "terkunci" lama setelah bukti kuat
+LOG_ODDS_LIMIT = 8.0
+
+# Tingkat keputusan zona
+STATUS_NORMAL = "NORMAL"
+STATUS_WASPADA = "WASPADA"
+STATUS_ALARM = "ALARM"
+
+
+def log_odds(probability):
+    return float(np.log(probability / (1.0 - probability)))
+
+
+def readings_matrix(readings_list):
+    """Ubah daftar dict pembacaan menjadi matriks (zona x FUSION_SENSORS), NaN jika tidak ada
+
+    Sensor audio juga dibaca dari kunci "audio_db" (gateway sensor).
+    """
+    values = np.full((len(readings_list), len(FUSION_SENSORS)), np.nan)
+    for row, readings in enumerate(readings_list):
+        for column, name in enumerate(FUSION_SENSOR_NAMES):
+            value = readings.get(name, readings.get(f"{name}_db"))
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values[row, column] = value
+    return values
+
+
+class ZoneFusion:
+    """Probabilitas ancaman per zona dari gabungan bukti semua sensor
+
+    Setiap zona menyimpan log-odds ancaman yang meluruh ke prior dengan
+    waktu paruh `half_life`. Pembacaan sensor satu tick (zona x sensor)
+    menggambarkan keadaan saat ini, bukan kejadian baru: log-likelihood
+    ratio semua sensor dijumlahkan menjadi posterior sesaat (prior + LLR)
+    dan log-odds zona menjadi maksimum dari memori yang meluruh dan
+    posterior itu. Dengan begitu waktu menuju alarm hanya bergantung pada
+    bukti, bukan pada interval sensor atau laju gateway. Bukti asinkron
+    (audio, visi) adalah kejadian, ditampung lalu ditambahkan pada tick
+    berikutnya. Keputusan zona memakai histeresis: alarm di atas
+    `alarm_probability`, kembali normal di bawah `clear_probability`.
+    """
+
+    def __init__(self, zone_names=(), prior=0.02, half_life=30.0, alarm_probability=0.9,
+                 alert_probability=0.3, clear_probability=0.2, clock=time.time):
+        self.prior = log_odds(prior)
+        self.half_life = half_life
+        self.alarm_threshold = log_odds(alarm_probability)
+        self.alert_threshold = log_odds(alert_probability)
+        self.clear_threshold = log_odds(clear_probability)
+        self.clock = clock
+        self.centres = np.array([sensor[1] for sensor in FUSION_SENSORS], dtype=np.float64)
+        self.scales = np.array([sensor[2] for sensor in FUSION_SENSORS], dtype=np.float64)
+        self.weights = np.array([sensor[3] for sensor in FUSION_SENSORS], dtype=np.float64)
+        self.zone_index = {}
+        self.zone_names = []
+        self.log_odds = np.zeros(0)
+        self.pending = np.zeros(0)
+        self.alarmed = np.zeros(0, dtype=bool)
+        self.last_update = self.clock()
+        for zone in zone_names:
+            self.index(zone)
+
+    def index(self, zone):
+        """Indeks zona, zona baru ditambahkan dengan log-odds prior"""
+        index = self.zone_index.get(zone)
+        if index is None:
+            index = self.zone_index[zone] = len(self.zone_names)
+            self.zone_names.append(zone)
+            self.log_odds = np.append(self.log_odds, self.prior)
+            self.pending = np.append(self.pending, 0.0)
+            self.alarmed = np.append(self.alarmed, False)
+        return index
+
+    def evidence(self, values):
+        """Log-likelihood ratio per nilai sensor (kolom sesuai FUSION_SENSORS), NaN = tidak ada"""
+        llr = self.weights * np.tanh((values - self.centres) / self.scales)
+        llr = np.where(llr < 0, llr * MISS_WEIGHT, llr)
+        return np.nan_to_num(llr, nan=0.0)
+
+    def add_evidence(self, zone, sensor, value):
+        """Tampung bukti satu sensor untuk diterapkan pada tick berikutnya"""
+        column = FUSION_SENSOR_NAMES.index(sensor)
+        values = np.full(len(FUSION_SENSORS), np.nan)
+        values[column] = value
+        self.pending[self.index(zone)] += self.evidence(values).sum()
+
+    def _decay(self, now):
+        elapsed = max(0.0, now - self.last_update)
+        self.log_odds = self.prior + (self.log_odds - self.prior) * np.exp2(-elapsed / self.half_life)
+        self.last_update = now
+
+    def update(self, zone_names, values, now=None):
+        """Terapkan satu tick pembacaan (zona x sensor) dan bukti tertampung
+
+        Mengembalikan (probabilitas per zona, indeks zona yang baru masuk
+        alarm) dengan indeks sesuai `self.zone_names`.
+        """
+        indices = np.array([self.index(zone) for zone in zone_names], dtype=np.int64)
+        self._decay(self.clock() if now is None else now)
+
+        if len(indices):
+            # Zona yang muncul lebih dari sekali dalam satu tick memakai posterior terkuat
+            current = np.full(len(self.log_odds), -np.inf)
+            np.maximum.at(current, indices, self.prior + self.evidence(values).sum(axis=1))
+            self.log_odds = np.maximum(self.log_odds, current)
+        self.log_odds = np.clip(self.log_odds + self.pending, -LOG_ODDS_LIMIT, LOG_ODDS_LIMIT)
+        self.pending = np.zeros_like(self.pending)
+
+        newly = np.flatnonzero(~self.alarmed & (self.log_odds >= self.alarm_threshold))
+        self.alarmed |= self.log_odds >= self.alarm_threshold
+        self.alarmed &= self.log_odds >= self.clear_threshold
+        return self.probabilities(), newly
+
+    def probabilities(self):
+        return 1.0 / (1.0 + np.exp(-self.log_odds))
+
+    def statuses(self):
+        """Status per zona: ALARM, WASPADA atau NORMAL"""
+        return np.where(self.alarmed, STATUS_ALARM,
+                        np.where(self.log_odds >= self.alert_threshold, STATUS_WASPADA, STATUS_NORMAL))
+
+    def summary(self):
+        probabilities = self.probabilities()
+        statuses = self.statuses()
+        return {
+            zone: {"probability": round(float(probabilities[i]), 3), "status": str(statuses[i])}
+            for i, zone in enumerate(self.zone_names)
+        }
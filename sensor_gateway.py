@@ -0,0 +1,207 @@
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+import numpy as np
+
+# Header frame: magic, versi, id node, nomor urut, jumlah record, waktu kirim (ns)
+FRAME_MAGIC = b"HSGW"
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct("<4sHHIIQ")
+MAX_RECORDS_PER_FRAME = 65536
+
+# Satu pembacaan sensor dalam layout biner tetap (16 byte)
+SENSOR_RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("zone", "<u2"),
+    ("sensor", "u1"),
+    ("flags", "u1"),
+    ("value", "<f4"),
+])
+
+SENSOR_NAMES = ["pir", "magnetic", "vibration", "audio_db"]
+SENSOR_CODES = {name: code for code, name in enumerate(SENSOR_NAMES)}
+
+
+def encode_frame(node_id, seq, records):
+    """Encode satu batch record menjadi frame biner"""
+    records = np.ascontiguousarray(records, dtype=SENSOR_RECORD_DTYPE)
+    header = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, node_id, seq & 0xFFFFFFFF,
+                               len(records), time.time_ns())
+    return header + records.tobytes()
+
+
+def parse_address(address):
+    """Ubah alamat 'tcp://host:port' atau 'unix:///path' menjadi (family, alamat)"""
+    if address.startswith("unix://"):
+        return socket.AF_UNIX, address[len("unix://"):]
+    if address.startswith("tcp://"):
+        host, port = address[len("tcp://"):].rsplit(":", 1)
+        return socket.AF_INET, (host, int(port))
+    raise ValueError(f"Alamat gateway tidak dikenal: {address}")
+
+
+def _recv_exact(sock, view):
+    """Isi seluruh memoryview dari socket tanpa alokasi tambahan"""
+    while len(view):
+        received = sock.recv_into(view)
+        if received == 0:
+            raise ConnectionError("Koneksi node sensor terputus")
+        view = view[received:]
+
+
+class _GatewayHandler(socketserver.BaseRequestHandler):
+    """Terima frame dari satu node sensor ke buffer yang dialokasikan sekali"""
+
+    def handle(self):
+        gateway = self.server.gateway
+        header = bytearray(FRAME_HEADER.size)
+        header_view = memoryview(header)
+        buffer = np.empty(MAX_RECORDS_PER_FRAME, dtype=SENSOR_RECORD_DTYPE)
+        buffer_view = memoryview(buffer.view(np.uint8))
+
+        # Node yang tersambung ulang (mis. setelah reboot) boleh memulai nomor urut dari awal
+        first = True
+        try:
+            while True:
+                _recv_exact(self.request, header_view)
+                magic, version, node_id, seq, count, sent_ns = FRAME_HEADER.unpack(header)
+                if magic != FRAME_MAGIC or version != FRAME_VERSION or count > MAX_RECORDS_PER_FRAME:
+                    gateway.stats["bad_frames"] += 1
+                    return  # Stream tidak bisa disinkronkan ulang, putuskan koneksi
+                _recv_exact(self.request, buffer_view[:count * SENSOR_RECORD_DTYPE.itemsize])
+                gateway.dispatch(node_id, seq, sent_ns, buffer[:count], first)
+                first = False
+        except (ConnectionError, OSError):
+            pass
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+class SensorGatewayServer:
+    """Server gateway sensor: terima frame biner batch dari node sensor jarak jauh
+
+    Setiap batch diteruskan ke `on_batch(node_id, records)` sebagai view array
+    terstruktur; callback harus selesai memakai view sebelum kembali karena
+    buffer dipakai ulang untuk frame berikutnya.
+    """
+
+    def __init__(self, address, on_batch):
+        self.address = address
+        self.on_batch = on_batch
+        self.expected_seq = {}
+        self.stats = {"frames": 0, "records": 0, "gaps": 0, "restarts": 0, "bad_frames": 0}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        family, address = parse_address(self.address)
+        if family == socket.AF_UNIX:
+            if os.path.exists(address):
+                os.unlink(address)
+            self._server = _UnixServer(address, _GatewayHandler)
+        else:
+            self._server = _TCPServer(address, _GatewayHandler)
+        self._server.gateway = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="sensor-gateway",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def dispatch(self, node_id, seq, sent_ns, records, first=False):
+        """Periksa nomor urut per node lalu teruskan batch
+
+        Frame pertama sebuah koneksi atau nomor urut yang mundur dianggap node
+        memulai ulang, bukan celah data.
+        """
+        with self._lock:
+            expected = self.expected_seq.get(node_id)
+            if expected is not None and seq != expected:
+                gap = (seq - expected) & 0xFFFFFFFF
+                if first or gap >= 0x80000000:
+                    self.stats["restarts"] += 1
+                else:
+                    self.stats["gaps"] += gap
+            self.expected_seq[node_id] = (seq + 1) & 0xFFFFFFFF
+            self.stats["frames"] += 1
+            self.stats["records"] += len(records)
+            self.on_batch(node_id, records)
+
+
+class GatewayDevices:
+    """Adaptor perangkat untuk SecurityEngine dengan data dari gateway sensor
+
+    Nilai terbaru per (zona, sensor) disimpan dalam satu array dan diperbarui
+    per batch secara vektor. Perintah aktuator diteruskan ke `actuators`
+    (misalnya SecurityDevices) bila ada.
+    """
+
+    def __init__(self, zone_names, actuators=None):
+        self.zone_names = list(zone_names)
+        self.actuators = actuators
+        self.latest = np.zeros((len(self.zone_names), len(SENSOR_NAMES)), dtype=np.float32)
+        self.updated = np.zeros(len(self.zone_names), dtype=np.float64)
+        self._lock = threading.Lock()
+
+    def ingest(self, node_id, records):
+        """Terapkan satu batch record ke tabel nilai terbaru"""
+        valid = (records["zone"] < len(self.zone_names)) & (records["sensor"] < len(SENSOR_NAMES))
+        if not valid.all():
+            records = records[valid]
+        # Urutkan berdasarkan waktu agar nilai terakhir yang menang
+        if len(records) > 1 and np.any(np.diff(records["timestamp"]) < 0):
+            records = records[np.argsort(records["timestamp"], kind="stable")]
+        zones = records["zone"]
+        with self._lock:
+            self.latest[zones, records["sensor"]] = records["value"]
+            np.maximum.at(self.updated, zones, records["timestamp"])
+
+    def get_all_zone_readings(self):
+        with self._lock:
+            latest = self.latest.copy()
+        return {
+            zone: dict(zip(SENSOR_NAMES, row.tolist()), zone=zone)
+            for zone, row in zip(self.zone_names, latest)
+        }
+
+    def get_all_sensor_readings(self):
+        """Ringkasan semua zona: nilai maksimum per sensor"""
+        with self._lock:
+            peak = self.latest.max(axis=0) if len(self.zone_names) else self.latest.sum(axis=0)
+        return dict(zip(SENSOR_NAMES, peak.tolist()))
+
+    def get_all_actuator_status(self):
+        return self.actuators.get_all_actuator_status() if self.actuators else {}
+
+    def trigger_alarm(self):
+        if self.actuators is not None:
+            self.actuators.trigger_alarm()
+
+    def reset_alarm(self):
+        if self.actuators is not None:
+            self.actuators.reset_alarm()
+
+    def __getattr__(self, name):
+        # lock_door hanya tersedia jika backend aktuator mendukungnya, sehingga
+        # perintah grup melaporkan "unsupported" alih-alih gagal per pintu
+        if name == "lock_door":
+            actuators = self.__dict__.get("actuators")
+            if actuators is not None and hasattr(actuators, name):
+                return actuators.lock_door
+        raise AttributeError(f"{type(self).__name__} tidak mendukung {name}")
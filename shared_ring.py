@@ -0,0 +1,164 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from sensor_gateway import SENSOR_RECORD_DTYPE
+
+# Header ring di awal shared memory: magic, kapasitas, ukuran record, nomor urut tulis
+# dan nomor urut klaim (batas atas record yang sedang ditulis, pola seqlock)
+RING_MAGIC = 0x48535247  # "HSRG"
+RING_HEADER_DTYPE = np.dtype([
+    ("magic", "<u8"),
+    ("capacity", "<u8"),
+    ("record_size", "<u8"),
+    ("write_seq", "<u8"),
+    ("claim_seq", "<u8"),
+])
+RING_HEADER_SIZE = 64  # Dibulatkan ke satu cache line
+
+
+class SharedSensorRing:
+    """Ring buffer record sensor di shared memory (satu penulis, banyak pembaca)
+
+    Penulis lebih dulu menaikkan `claim_seq`, menyalin record, lalu menaikkan
+    `write_seq` di header; pembaca di proses lain memetakan buffer yang sama
+    dan membaca tanpa serialisasi. Pembaca mengambil batas data dari
+    `write_seq` dan memvalidasi terhadap `claim_seq`, sehingga slot yang
+    sedang ditimpa tidak pernah lolos validasi. Setiap pembaca menyimpan
+    kursornya sendiri lewat `RingReader`.
+    """
+
+    def __init__(self, shm, dtype=SENSOR_RECORD_DTYPE, owner=False):
+        self.shm = shm
+        self.dtype = np.dtype(dtype)
+        self.owner = owner
+        self.header = np.ndarray(1, dtype=RING_HEADER_DTYPE, buffer=shm.buf)[0]
+        if self.header["magic"] != RING_MAGIC:
+            raise ValueError(f"Shared memory {shm.name} bukan ring sensor")
+        if self.header["record_size"] != self.dtype.itemsize:
+            raise ValueError("Ukuran record ring tidak cocok dengan dtype")
+        self.capacity = int(self.header["capacity"])
+        self.records = np.ndarray(self.capacity, dtype=self.dtype, buffer=shm.buf,
+                                  offset=RING_HEADER_SIZE)
+
+    @classmethod
+    def create(cls, name=None, capacity=1 << 20, dtype=SENSOR_RECORD_DTYPE):
+        """Buat ring baru; proses pembuat bertanggung jawab memanggil unlink()"""
+        dtype = np.dtype(dtype)
+        shm = shared_memory.SharedMemory(name=name, create=True,
+                                         size=RING_HEADER_SIZE + capacity * dtype.itemsize)
+        header = np.ndarray(1, dtype=RING_HEADER_DTYPE, buffer=shm.buf)
+        header[0] = (RING_MAGIC, capacity, dtype.itemsize, 0, 0)
+        del header
+        return cls(shm, dtype, owner=True)
+
+    @classmethod
+    def attach(cls, name, dtype=SENSOR_RECORD_DTYPE):
+        """Petakan ring yang sudah dibuat proses lain"""
+        return cls(shared_memory.SharedMemory(name=name), dtype)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def write_seq(self):
+        return int(self.header["write_seq"])
+
+    @property
+    def claim_seq(self):
+        return int(self.header["claim_seq"])
+
+    def write(self, records):
+        """Tulis batch record (hanya dari satu proses penulis)"""
+        records = np.asarray(records, dtype=self.dtype)
+        seq = self.write_seq
+        if len(records) > self.capacity:
+            # Hanya satu putaran terakhir yang bisa disimpan
+            seq += len(records) - self.capacity
+            records = records[-self.capacity:]
+        count = len(records)
+        if count == 0:
+            return
+        # Klaim dinaikkan sebelum menyalin: slot untuk seq < klaim - kapasitas mulai ditimpa
+        self.header["claim_seq"] = seq + count
+        start = seq % self.capacity
+        first = min(count, self.capacity - start)
+        self.records[start:start + first] = records[:first]
+        self.records[:count - first] = records[first:]
+        # Nomor urut dinaikkan setelah data tersalin agar pembaca tidak melihat record setengah jadi
+        self.header["write_seq"] = seq + count
+
+    def reader(self, from_start=False):
+        return RingReader(self, from_start)
+
+    def close(self):
+        # Lepaskan semua view numpy sebelum menutup mapping
+        self.header = None
+        self.records = None
+        self.shm.close()
+
+    def unlink(self):
+        if self.owner:
+            self.shm.unlink()
+
+
+class RingReader:
+    """Kursor pembaca untuk SharedSensorRing dengan deteksi overrun"""
+
+    def __init__(self, ring, from_start=False):
+        self.ring = ring
+        self.cursor = max(0, ring.write_seq - ring.capacity) if from_start else ring.write_seq
+        self.overruns = 0
+        self.dropped = 0
+
+    def pending(self):
+        return self.ring.write_seq - self.cursor
+
+    def read_views(self, max_records=None):
+        """Ambil record baru sebagai view tanpa salinan
+
+        Mengembalikan (start_seq, [view, ...]); lebih dari satu view jika data
+        melewati ujung ring. Gunakan `valid(start_seq)` setelah memproses view
+        untuk memastikan penulis belum menimpa data tersebut.
+        """
+        ring = self.ring
+        write_seq = ring.write_seq
+        if write_seq - self.cursor > ring.capacity:
+            # Pembaca tertinggal lebih dari satu putaran, lompat ke data tertua yang masih ada
+            self.overruns += 1
+            self.dropped += write_seq - ring.capacity - self.cursor
+            self.cursor = write_seq - ring.capacity
+
+        count = write_seq - self.cursor
+        if max_records is not None:
+            count = min(count, max_records)
+        start_seq = self.cursor
+        if count <= 0:
+            return start_seq, []
+
+        start = start_seq % ring.capacity
+        first = min(count, ring.capacity - start)
+        views = [ring.records[start:start + first]]
+        if count > first:
+            views.append(ring.records[:count - first])
+        self.cursor = start_seq + count
+        return start_seq, views
+
+    def valid(self, start_seq):
+        """True jika data sejak start_seq belum tertimpa atau sedang ditimpa penulis"""
+        return self.ring.claim_seq - start_seq <= self.ring.capacity
+
+    def read(self, max_records=None):
+        """Ambil record baru sebagai salinan yang dijamin konsisten"""
+        start_seq, views = self.read_views(max_records)
+        if not views:
+            return np.empty(0, dtype=self.ring.dtype)
+        records = np.concatenate(views)
+        if not self.valid(start_seq):
+            # Sebagian data tertimpa selama disalin, buang bagian yang rusak
+            lost = self.ring.claim_seq - self.ring.capacity - start_seq
+            self.overruns += 1
+            self.dropped += min(lost, len(records))
+            records = records[lost:]
+        return records
@@ -0,0 +1,68 @@
+"""Perintah aktuator grup: hasil lewat done-callback dan panggilan yang tertahan terhitung"""
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from actuator_dispatcher import ActuatorDispatcher
+from detection_history import DetectionHistory
+from security_engine import SecurityEngine
+from zones import ZoneRegistry
+
+
+class DoorDevices:
+    """Kunci pintu; zona di `stuck` menunggu sampai `release` di-set"""
+
+    def __init__(self, stuck=()):
+        self.stuck = set(stuck)
+        self.release = threading.Event()
+
+    def get_all_sensor_readings(self):
+        return {}
+
+    def lock_door(self, zone):
+        if zone in self.stuck:
+            self.release.wait(5.0)
+        return True
+
+
+def test_timed_out_running_calls_are_tracked_until_they_return():
+    devices = DoorDevices(stuck=["Belakang"])
+    dispatcher = ActuatorDispatcher(devices)
+    try:
+        status = dispatcher.submit_group("lock_door", ["Depan", "Belakang"], timeout=0.1).result(timeout=5.0)
+        assert status["succeeded"] == 1 and status["timed_out"] == 1
+        assert status["hung"] == 1
+        assert dispatcher.stats()["hung_calls"] == 1
+
+        devices.release.set()
+        for _ in range(100):
+            if dispatcher.hung_calls == 0:
+                break
+            threading.Event().wait(0.01)
+        assert dispatcher.stats()["hung_calls"] == 0
+    finally:
+        devices.release.set()
+        dispatcher.stop()
+
+
+def test_lock_all_doors_emits_group_result_without_sensor_tick(tmp_path):
+    devices = DoorDevices()
+    engine = SecurityEngine(devices, history=DetectionHistory(str(tmp_path)), zones=ZoneRegistry())
+    received = threading.Event()
+    events = []
+
+    def listener(event):
+        if event["kind"] == "group_result":
+            events.append(event)
+            received.set()
+
+    engine.add_listener(listener)
+    try:
+        engine.lock_all_doors()
+        assert received.wait(5.0)
+        assert events[0]["status"]["succeeded"] == 4
+        assert events[0]["message"].startswith("✅ Kunci Semua Pintu: 4/4 berhasil")
+    finally:
+        engine.actuators.stop()
@@ -0,0 +1,58 @@
+"""Perekam kejadian: picu ulang terus-menerus dipecah per max_length, audio ikut menyelesaikan klip"""
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_recorder import EventRecorder
+
+
+def load_clips(recorder):
+    recorder.flush()
+    clips = []
+    for filepath, _, _ in recorder.drain_saved():
+        with np.load(filepath) as clip:
+            clips.append((json.loads(str(clip["metadata"])), clip["sensor_times"].copy()))
+    return sorted(clips, key=lambda clip: clip[0]["part"])
+
+
+def test_repeated_triggers_split_at_max_length(tmp_path):
+    start = 1_800_000_000.0
+    recorder = EventRecorder(str(tmp_path), pre_roll=2.0, post_roll=1.5, max_length=5.0)
+    try:
+        for step in range(41):
+            now = start + step * 0.5
+            recorder.add_sensor("Depan", {"pir": 0.9}, now)
+            if step >= 4 and step % 2 == 0:
+                recorder.trigger("Depan", "alarm", now)
+            if step >= 4:
+                # Hanya satu klip aktif, dengan data tidak lebih dari pre-roll + satu bagian
+                assert len(recorder.active) == 1
+                assert len(recorder.active[0].sensors) <= 15
+
+        clips = load_clips(recorder)
+        assert [meta["part"] for meta, _ in clips] == list(range(len(clips)))
+        assert len(clips) == 4
+        times = np.concatenate([sensor_times for _, sensor_times in clips])
+        # Bagian berurutan tanpa sampel hilang atau ganda
+        assert np.allclose(np.diff(times), 0.5)
+        assert times[0] == start + 0.0 and times[-1] == start + 20.0
+        assert all(meta["trigger_time"] == start + 2.0 for meta, _ in clips)
+    finally:
+        recorder.close()
+
+
+def test_audio_alone_finishes_clip(tmp_path):
+    start = 1_800_000_000.0
+    recorder = EventRecorder(str(tmp_path), pre_roll=2.0, post_roll=1.0)
+    try:
+        recorder.add_sensor("Depan", {"pir": 0.9}, start)
+        recorder.trigger("Depan", "alarm", start)
+        for step in range(1, 9):
+            recorder.add_audio("Depan", np.zeros(160), start + step * 0.25)
+        assert recorder.active == []
+    finally:
+        recorder.close()
@@ -0,0 +1,111 @@
+"""Fusi sensor: sistem diam tidak pernah alarm, pembacaan kuat alarm pada tick pertama"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_pipeline import AudioPipeline
+from detection_history import DetectionHistory
+from replay_driver import VirtualClock
+from security_engine import SecurityEngine
+from sensor_fusion import FUSION_SENSOR_NAMES, STATUS_ALARM, ZoneFusion
+from zones import ZoneRegistry
+
+
+class IdleDevices:
+    """Perangkat dengan semua sensor bernilai 0, perintah aktuator dihitung"""
+
+    def __init__(self, zones):
+        self.zones = zones
+        self.actuator_calls = {}
+
+    def get_all_zone_readings(self):
+        return {zone: {"zone": zone, "pir": 0.0, "magnetic": 0.0, "vibration": 0.0} for zone in self.zones}
+
+    def get_all_sensor_readings(self):
+        return {"pir": 0.0, "magnetic": 0.0, "vibration": 0.0}
+
+    def get_all_actuator_status(self):
+        return {"alarm": False}
+
+    def _count(self, action):
+        self.actuator_calls[action] = self.actuator_calls.get(action, 0) + 1
+
+    def trigger_alarm(self):
+        self._count("trigger_alarm")
+
+    def reset_alarm(self):
+        self._count("reset_alarm")
+
+    def lock_door(self, zone):
+        self._count("lock_door")
+
+
+def test_idle_fusion_never_alarms():
+    fusion = ZoneFusion(["Depan", "Belakang"], clock=lambda: 0.0)
+    idle = np.zeros((2, 5))
+    for tick in range(1, 361):
+        fusion.update(["Depan", "Belakang"], idle, now=tick * 10.0)
+    assert STATUS_ALARM not in fusion.statuses()
+
+
+def test_idle_engine_with_synthetic_audio_never_alarms(tmp_path):
+    clock = VirtualClock(1_800_000_000.0)
+    zones = ZoneRegistry(clock=clock)
+    devices = IdleDevices(zones.names())
+    # Sumber sintetis menyisipkan benturan dan teriakan; itu bukan bukti ancaman nyata
+    audio = AudioPipeline(zones.names(), synthetic=True)
+    engine = SecurityEngine(devices, history=DetectionHistory(str(tmp_path)), zones=zones,
+                            clock=clock, audio=audio)
+    statuses = set()
+    try:
+        # 10 menit simulasi: audio tiap 0,25 detik, sensor tiap 10 detik, keamanan tiap 5 detik
+        for step in range(1, 2401):
+            clock.advance_to(clock() + 0.25)
+            for _ in range(4):
+                audio.read_chunk()
+            engine.process_audio()
+            if step % 20 == 0:
+                engine.update_security()
+            if step % 40 == 0:
+                engine.check_sensors()
+                statuses.update(str(status) for status in engine.fusion.statuses())
+        engine.actuators.flush(timeout=5.0)
+    finally:
+        engine.actuators.stop()
+        audio.stop()
+
+    assert audio.chunks_analyzed > 0
+    assert STATUS_ALARM not in statuses
+    assert devices.actuator_calls.get("trigger_alarm", 0) == 0
+
+
+def ticks_to_alarm(readings, interval, max_ticks=60):
+    """Jumlah tick sensor sampai zona masuk ALARM, None jika tidak pernah"""
+    fusion = ZoneFusion(["Dalam"], clock=lambda: 0.0)
+    values = np.full((1, len(FUSION_SENSOR_NAMES)), np.nan)
+    for sensor, value in readings.items():
+        values[0, FUSION_SENSOR_NAMES.index(sensor)] = value
+    for tick in range(1, max_ticks + 1):
+        _, newly = fusion.update(["Dalam"], values, now=tick * interval)
+        if len(newly):
+            return tick
+    return None
+
+
+@pytest.mark.parametrize("interval", [1.0, 10.0, 60.0])
+@pytest.mark.parametrize("readings, expected", [
+    ({"pir": 1.0, "magnetic": 1.0, "vibration": 100.0}, 1),
+    ({"pir": 1.0}, 1),
+    ({"magnetic": 1.0}, 1),
+    ({"magnetic": 0.9}, 1),
+    ({"vibration": 100.0}, 1),
+    ({"pir": 0.75, "magnetic": 0.85}, 1),
+    ({"pir": 0.75}, None),
+    ({"pir": 0.0, "magnetic": 0.0, "vibration": 0.0}, None),
+])
+def test_ticks_to_alarm_independent_of_interval(readings, expected, interval):
+    assert ticks_to_alarm(readings, interval) == expected
@@ -0,0 +1,66 @@
+"""Ring shared memory: pembaca terpisah mengikuti penulis dan exporter menyalin record"""
+import os
+import sys
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ring_exporter import RingExporter, load_records
+from sensor_gateway import SENSOR_RECORD_DTYPE
+from shared_ring import SharedSensorRing
+
+
+def make_records(start, count, timestamp=1767600000.0):
+    records = np.zeros(count, dtype=SENSOR_RECORD_DTYPE)
+    records["timestamp"] = timestamp + np.arange(start, start + count)
+    records["zone"] = np.arange(start, start + count) % 4
+    records["value"] = np.arange(start, start + count)
+    return records
+
+
+def test_attached_reader_follows_writer_across_wraparound():
+    ring = SharedSensorRing.create(f"hsrg-test-{os.getpid()}", capacity=16)
+    attached = SharedSensorRing.attach(ring.name)
+    try:
+        reader = attached.reader()
+        ring.write(make_records(0, 10))
+        assert reader.read()["value"].tolist() == list(range(10))
+        ring.write(make_records(10, 12))
+        assert reader.read()["value"].tolist() == list(range(10, 22))
+        assert reader.overruns == 0
+
+        # Tertinggal lebih dari satu putaran: hanya isi ring terakhir yang tersisa
+        ring.write(make_records(22, 40))
+        assert reader.read()["value"].tolist() == list(range(46, 62))
+        assert reader.overruns == 1 and reader.dropped == 24
+    finally:
+        del reader
+        attached.close()
+        ring.close()
+        ring.unlink()
+
+
+def test_exporter_writes_ring_records_to_daily_partitions(tmp_path):
+    ring = SharedSensorRing.create(f"hsrg-export-{os.getpid()}", capacity=64)
+    attached = SharedSensorRing.attach(ring.name)
+    try:
+        exporter = RingExporter(attached, str(tmp_path))
+        written = make_records(0, 50, timestamp=1767600000.0)
+        ring.write(written[:30])
+        assert exporter.poll() == 30
+        ring.write(written[30:])
+
+        stop_event = threading.Event()
+        stop_event.set()
+        exporter.run(stop_event)
+        files = sorted(os.listdir(tmp_path))
+        exported = np.concatenate([load_records(os.path.join(tmp_path, name)) for name in files])
+        assert exported.tobytes() == written.tobytes()
+        assert exporter.stats() == {"exported": 50, "overruns": 0, "dropped": 0}
+    finally:
+        exporter.reader = None
+        attached.close()
+        ring.close()
+        ring.unlink()
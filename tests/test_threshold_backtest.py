@@ -0,0 +1,70 @@
+"""Backtest fusi: state vektor sama dengan ZoneFusion, tanpa label tidak ada pool"""
+import os
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detection_history import DetectionHistory
+from sensor_fusion import FUSION_SENSOR_NAMES, ZoneFusion
+from threshold_backtest import (excess_log2, fusion_parameters, hysteresis_state, run_backtest,
+                                unit_evidence)
+
+
+def test_vectorised_state_matches_zone_fusion():
+    rng = np.random.default_rng(7)
+    times = np.cumsum(rng.uniform(0.5, 20.0, 400))
+    values = np.column_stack([rng.uniform(0, 1, 400), rng.uniform(0, 1, 400), rng.uniform(0, 120, 400),
+                              np.full(400, np.nan), np.full(400, np.nan)])
+    fusion = ZoneFusion(["Depan"], clock=lambda: times[0])
+    live = []
+    for t, row in zip(times, values):
+        fusion.update(["Depan"], row[None, :], t)
+        live.append(bool(fusion.alarmed[0]))
+
+    params = fusion_parameters(fusion)
+    llr = np.asarray(params["weights"])[None, :] @ unit_evidence(
+        values, np.asarray(params["centres"]), np.asarray(params["scales"])).T
+    level = excess_log2(llr, times - times[0], fusion.half_life, 8.0 - fusion.prior)
+    state = hysteresis_state(level, np.log2(fusion.alarm_threshold - fusion.prior),
+                             np.log2(fusion.clear_threshold - fusion.prior))
+    assert any(live) and not all(live)
+    assert state[0].tolist() == live
+
+
+def record_ticks(history, start, rows):
+    for offset, zone, readings in rows:
+        history.record_readings(readings, zone=zone, timestamp=start + timedelta(seconds=offset))
+
+
+def test_backtest_without_labels_skips_readings(tmp_path):
+    history = DetectionHistory(str(tmp_path))
+    start = datetime(2026, 1, 5, 1, 0, 0)
+    record_ticks(history, start, [(i, "Depan", {"pir": 0.1}) for i in range(10)])
+    report = run_backtest(history, start, start + timedelta(hours=1), fusion_parameters(ZoneFusion()))
+    assert report["labels"] == 0
+    assert report["recommended"] is None and report["configurations"] == 0
+
+
+def test_backtest_scores_fusion_parameters_against_labels(tmp_path):
+    history = DetectionHistory(str(tmp_path))
+    start = datetime(2026, 1, 5, 1, 0, 0)
+    quiet = [(i * 10, zone, {"pir": 0.1, "magnetic": 0.0, "vibration": 5.0})
+             for i in range(300) for zone in ("Depan", "Belakang")]
+    # Pintu terbuka diikuti alarm manual operator di zona Belakang
+    intrusion = [(1500, "Belakang", {"pir": 0.9, "magnetic": 1.0, "vibration": 5.0})]
+    record_ticks(history, start, sorted(quiet + intrusion, key=lambda row: row[0]))
+    history.record("insiden", zone="Belakang", timestamp=start + timedelta(seconds=1505))
+
+    report = run_backtest(history, start, start + timedelta(hours=1), fusion_parameters(ZoneFusion()),
+                          workers=1)
+    assert report["labels"] == 1 and report["incidents"] == 1
+    assert report["zones"] == ["Belakang", "Depan"]
+    assert set(report["current"]["weights"]) == {"pir", "magnetic", "vibration"}
+    assert report["current"]["detection_rate"] == 1.0
+    assert report["current"]["false_alarms_per_day"] == 0.0
+    assert report["recommended"]["detection_rate"] == 1.0
+    assert report["configurations"] > 1
+    assert set(FUSION_SENSOR_NAMES) >= set(report["recommended"]["weights"])
@@ -0,0 +1,53 @@
+"""Zona: sensor tanpa binding tidak menjadi zona registry"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detection_history import DetectionHistory
+from replay_driver import VirtualClock
+from security_engine import UNKNOWN_ZONE, SecurityEngine
+from zones import ZoneRegistry
+
+
+class PlainDevices:
+    """Perangkat satu dict tanpa kunci "zone"; pintu belakang terikat, PIR tidak"""
+
+    def __init__(self):
+        self.doors = []
+
+    def get_all_sensor_readings(self):
+        return {"pir": 0.95, "magnetic_belakang": 0.0}
+
+    def get_all_actuator_status(self):
+        return {"alarm": False}
+
+    def trigger_alarm(self):
+        pass
+
+    def lock_door(self, zone):
+        self.doors.append(zone)
+        return True
+
+
+def test_unbound_sensor_counted_outside_registry(tmp_path):
+    clock = VirtualClock(1_800_000_000.0)
+    zones = ZoneRegistry([{"name": "Depan"}, {"name": "Belakang", "sensors": ["magnetic_belakang"]}],
+                         clock=clock)
+    devices = PlainDevices()
+    engine = SecurityEngine(devices, history=DetectionHistory(str(tmp_path)), zones=zones, clock=clock)
+    try:
+        readings = engine.read_zone_sensors()
+        assert readings[UNKNOWN_ZONE]["pir"] == 0.95
+        assert readings["Belakang"]["magnetic"] == 0.0
+
+        engine.check_sensors()
+        assert zones.names() == ["Depan", "Belakang"]
+        assert zones.unassigned_events == 1 and zones.unassigned_sensors == {"pir"}
+        assert engine.analyze_security_zones()["unassigned_sensors"] == ["pir"]
+
+        status = engine.lock_all_doors().result(timeout=5.0)
+        assert status["targets"] == 2
+        assert sorted(devices.doors) == ["Belakang", "Depan"]
+    finally:
+        engine.actuators.stop()
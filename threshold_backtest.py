@@ -0,0 +1,435 @@
+"""Backtest parameter fusi sensor (ZoneFusion) terhadap riwayat berlabel
+
+Yang diuji adalah parameter yang benar-benar memutuskan alarm: bobot per
+sensor, titik tengah bukti dan probabilitas alarm/clear. Label insiden
+berasal dari alarm manual operator ("insiden") dan permintaan bantuan
+("bantuan"); tanpa label backtest berhenti sebelum memuat pembacaan.
+Bukti asinkron (audio dan visi dari pipeline) tidak ada di riwayat
+pembacaan sehingga tidak ikut dimodelkan.
+
+Contoh:
+    python threshold_backtest.py --days 28 --workers 4 --output reports/backtest.json
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from sensor_fusion import FUSION_SENSOR_NAMES, LOG_ODDS_LIMIT, MISS_WEIGHT, ZoneFusion
+
+# Jenis kejadian riwayat yang dianggap insiden nyata (label). "penyusupan" dan
+# "korelasi" tidak dipakai karena mesin membuatnya dari deteksi yang sedang diuji
+LABEL_EVENT_TYPES = ["insiden", "bantuan"]
+
+# Pembacaan dalam rentang ini di sekitar label dihitung bagian insiden (detik sebelum, sesudah)
+LABEL_WINDOW = (120.0, 30.0)
+
+# Label tanpa zona berlaku untuk semua zona
+ALL_ZONE_LABELS = {"-", "semua"}
+
+# Grid konfigurasi: pengali bobot per sensor, geseran titik tengah (kelipatan
+# skala sensor) dan probabilitas alarm/clear
+WEIGHT_FACTORS = [0.5, 1.0, 1.5]
+CENTRE_SHIFTS = [-1.0, 0.0, 1.0]
+ALARM_PROBABILITIES = [0.8, 0.9, 0.95, 0.99]
+CLEAR_PROBABILITIES = [0.1, 0.2, 0.5]
+
+# Cakupan rekomendasi, ikut disimpan di laporan
+BACKTEST_SCOPE = "Parameter fusi sensor (bobot, titik tengah, probabilitas alarm/clear) yang memutuskan alarm"
+
+# Target alarm palsu per hari untuk memilih rekomendasi
+TARGET_FALSE_ALARMS_PER_DAY = 1.0
+
+# Batas porsi waktu normal dengan alarm menyala; mencegah konfigurasi yang "mengunci" alarm
+MAX_ALARM_FRACTION = 0.01
+
+# Ukuran sel (konfigurasi bobot x tick) per langkah worker, membatasi memori per worker
+CHUNK_CELLS = 4_000_000
+
+
+def fusion_parameters(fusion):
+    """Parameter ZoneFusion yang dipakai sebagai konfigurasi saat ini"""
+    return {
+        "prior": fusion.prior,
+        "half_life": fusion.half_life,
+        "centres": fusion.centres.tolist(),
+        "scales": fusion.scales.tolist(),
+        "weights": fusion.weights.tolist(),
+        "alarm_probability": round(float(1.0 / (1.0 + np.exp(-fusion.alarm_threshold))), 4),
+        "clear_probability": round(float(1.0 / (1.0 + np.exp(-fusion.clear_threshold))), 4)
+    }
+
+
+def load_labels(history, start, end, label_types=LABEL_EVENT_TYPES):
+    """Timestamp label per zona dari riwayat"""
+    labels = {}
+    for ts_text, zone, *_ in history.iter_rows(start, end, event_types=label_types):
+        labels.setdefault(zone, []).append(datetime.fromisoformat(ts_text).timestamp())
+    return labels
+
+
+def load_dataset(history, start, end, labels):
+    """Muat tick pembacaan per zona sebagai (waktu, matriks zona x FUSION_SENSORS, label)
+
+    Baris pembacaan satu record_many berbagi timestamp dan membentuk satu
+    tick; sensor yang tidak dibaca pada tick itu bernilai NaN, seperti
+    `readings_matrix`. Pembacaan tanpa zona tidak diuji.
+    """
+    columns = {name: i for i, name in enumerate(FUSION_SENSOR_NAMES)}
+    columns.update({f"{name}_db": i for i, name in enumerate(FUSION_SENSOR_NAMES)})
+    ticks = {}
+    last_text, last_ts = None, 0.0
+    for ts_text, zone, _, sensor, value, _ in history.iter_rows(start, end, event_types=["pembacaan"]):
+        column = columns.get(sensor)
+        if column is None or not value or zone in ALL_ZONE_LABELS:
+            continue
+        # Baris satu record_many berbagi teks timestamp, cukup di-parse sekali
+        if ts_text != last_text:
+            last_text, last_ts = ts_text, datetime.fromisoformat(ts_text).timestamp()
+        times, rows, cols, values = ticks.setdefault(zone, ([], [], [], []))
+        if not times or times[-1] != last_ts:
+            times.append(last_ts)
+        rows.append(len(times) - 1)
+        cols.append(column)
+        values.append(float(value))
+
+    shared = [ts for zone in ALL_ZONE_LABELS for ts in labels.get(zone, [])]
+    dataset = {}
+    for zone, (times, rows, cols, values) in ticks.items():
+        matrix = np.full((len(times), len(FUSION_SENSOR_NAMES)), np.nan)
+        matrix[rows, cols] = values
+        times = np.asarray(times)
+        order = np.argsort(times, kind="stable")
+        dataset[zone] = (times[order], matrix[order], np.asarray(sorted(labels.get(zone, []) + shared)))
+    return dataset
+
+
+def incident_segments(times, label_times, window=LABEL_WINDOW):
+    """Segmen sampel [awal, akhir) per insiden (label yang tumpang tindih digabung)"""
+    if len(label_times) == 0 or len(times) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    lows = label_times - window[0]
+    highs = label_times + window[1]
+    # Gabungkan interval yang tumpang tindih
+    breaks = np.flatnonzero(lows[1:] > np.maximum.accumulate(highs)[:-1]) + 1
+    lows = lows[np.concatenate([[0], breaks])]
+    highs = np.maximum.reduceat(highs, np.concatenate([[0], breaks]))
+    starts = np.searchsorted(times, lows, side="left")
+    ends = np.searchsorted(times, highs, side="right")
+    keep = ends > starts
+    return starts[keep], ends[keep]
+
+
+def unit_evidence(values, centres, scales):
+    """Bukti per sensor dengan bobot 1, sama seperti `ZoneFusion.evidence`; NaN = tanpa bukti"""
+    unit = np.tanh((values - centres) / scales)
+    unit = np.where(unit < 0, unit * MISS_WEIGHT, unit)
+    return np.nan_to_num(unit, nan=0.0)
+
+
+def excess_log2(llr, elapsed, half_life, limit):
+    """log2 kelebihan log-odds zona di atas prior per tick, tanpa loop waktu
+
+    Rekursi ZoneFusion e_t = max(e_{t-1} * 2^(-dt/h), L_t) sama dengan
+    2^(-T_t/h) * cummax(L_s * 2^(T_s/h)). Hanya bagian positif yang bisa
+    melewati ambang alarm/clear, dan LLR dipotong ke `limit` seperti
+    LOG_ODDS_LIMIT. Dihitung dalam domain log2 agar tidak overflow pada
+    riwayat panjang.
+    """
+    with np.errstate(divide="ignore"):
+        scaled = np.log2(np.clip(llr, 0.0, limit)) + elapsed / half_life
+    return np.maximum.accumulate(scaled, axis=1) - elapsed / half_life
+
+
+def hysteresis_state(level, alarm, clear):
+    """State alarm per tick: menyala jika level terakhir >= alarm lebih baru dari level terakhir < clear"""
+    index = np.arange(level.shape[1], dtype=np.int32)
+    last_on = np.maximum.accumulate(np.where(level >= alarm, index, -1), axis=1)
+    last_off = np.maximum.accumulate(np.where(level < clear, index, -1), axis=1)
+    return last_on > last_off
+
+
+def alarm_counts(state, in_incident, starts, ends):
+    """(insiden terdeteksi, alarm palsu, tick normal dengan alarm menyala) per baris state"""
+    rising = state.copy()
+    rising[:, 1:] &= ~state[:, :-1]
+    false_alarms = (rising & ~in_incident).sum(axis=1)
+    alarm_ticks = (state & ~in_incident).sum(axis=1)
+    if len(starts):
+        active = np.zeros((len(state), state.shape[1] + 1), dtype=np.int32)
+        np.cumsum(state, axis=1, out=active[:, 1:])
+        detected = ((active[:, ends] - active[:, starts]) > 0).sum(axis=1)
+    else:
+        detected = np.zeros(len(state), dtype=np.int64)
+    return detected, false_alarms, alarm_ticks
+
+
+def evaluate_zone(times, values, starts, ends, centres, scales, weights, half_life, limit,
+                  alarm_levels, clear_levels):
+    """Nilai semua konfigurasi bobot dan pasangan ambang untuk satu zona
+
+    `alarm_levels`/`clear_levels` adalah log2 kelebihan log-odds di atas
+    prior. Bobot diproses per potongan CHUNK_CELLS sel. Mengembalikan tiga
+    array (bobot x pasangan ambang) dari `alarm_counts` dan jumlah tick normal.
+    """
+    unit = unit_evidence(values, centres, scales)
+    elapsed = times - times[0]
+    incident = np.zeros(len(times) + 1, dtype=np.int32)
+    np.add.at(incident, starts, 1)
+    np.add.at(incident, ends, -1)
+    in_incident = np.cumsum(incident[:-1]) > 0
+
+    counts = [np.zeros((len(weights), len(alarm_levels)), dtype=np.int64) for _ in range(3)]
+    chunk = max(1, CHUNK_CELLS // max(len(times), 1))
+    for i in range(0, len(weights), chunk):
+        level = excess_log2(weights[i:i + chunk] @ unit.T, elapsed, half_life, limit)
+        for j, (alarm, clear) in enumerate(zip(alarm_levels, clear_levels)):
+            state = hysteresis_state(level, alarm, clear)
+            for total, part in zip(counts, alarm_counts(state, in_incident, starts, ends)):
+                total[i:i + chunk, j] = part
+    return counts[0], counts[1], counts[2], int((~in_incident).sum())
+
+
+def config_grid(present, current):
+    """Grid konfigurasi fusi; indeks 0 setiap sumbu adalah konfigurasi saat ini
+
+    Bobot sensor yang ada di riwayat dikalikan WEIGHT_FACTORS (produk
+    kartesius), sensor lain memakai bobot saat ini. Mengembalikan (bobot,
+    geseran titik tengah, pasangan probabilitas (alarm, clear) dengan clear < alarm).
+    """
+    factors = [row for row in itertools.product(WEIGHT_FACTORS, repeat=len(present)) if set(row) != {1.0}]
+    weights = np.tile(np.asarray(current["weights"], dtype=np.float64), (len(factors) + 1, 1))
+    weights[1:, present] *= np.asarray(factors).reshape(len(factors), len(present))
+    shifts = [0.0] + [shift for shift in CENTRE_SHIFTS if shift != 0.0]
+    pair = (current["alarm_probability"], current["clear_probability"])
+    pairs = [pair] + [(alarm, clear) for alarm in ALARM_PROBABILITIES for clear in CLEAR_PROBABILITIES
+                      if clear < alarm and (alarm, clear) != pair]
+    return weights, shifts, pairs
+
+
+def describe(weights, shifts, pairs, present, i):
+    """Parameter konfigurasi berindeks datar i (geseran, bobot, pasangan)"""
+    e, p = divmod(i, len(pairs))
+    s, w = divmod(e, len(weights))
+    return {
+        "weights": {FUSION_SENSOR_NAMES[k]: round(float(weights[w, k]), 3) for k in present},
+        "centre_shift": shifts[s],
+        "alarm_probability": pairs[p][0],
+        "clear_probability": pairs[p][1]
+    }
+
+
+def pareto_curve(configs, detection_rate, false_alarms):
+    """Titik kurva detection rate vs alarm palsu yang tidak didominasi konfigurasi lain"""
+    order = np.lexsort((-detection_rate, false_alarms))
+    curve = []
+    best = -1.0
+    for i in order:
+        if detection_rate[i] > best:
+            best = detection_rate[i]
+            curve.append(dict(configs(i), detection_rate=round(float(detection_rate[i]), 4),
+                              false_alarms_per_day=round(float(false_alarms[i]), 3)))
+    return curve
+
+
+def recommend(detection_rate, false_alarms, alarm_fraction, target=TARGET_FALSE_ALARMS_PER_DAY):
+    """Indeks konfigurasi terbaik: deteksi tertinggi dalam target alarm palsu
+
+    Jika tidak ada yang memenuhi target, pilih alarm palsu paling sedikit
+    tanpa menurunkan deteksi konfigurasi saat ini (indeks 0). Seri diputus
+    dengan alarm palsu lebih sedikit lalu indeks terkecil (paling dekat
+    dengan konfigurasi saat ini).
+    """
+    index = np.arange(len(detection_rate))
+    within = (false_alarms <= target) & (alarm_fraction <= MAX_ALARM_FRACTION)
+    if within.any():
+        candidates = np.flatnonzero(within)
+        keys = (index[candidates], false_alarms[candidates], -detection_rate[candidates])
+    else:
+        candidates = np.flatnonzero(detection_rate >= detection_rate[0])
+        keys = (index[candidates], -detection_rate[candidates], false_alarms[candidates])
+    return int(candidates[np.lexsort(keys)[0]])
+
+
+def run_backtest(history, start, end, current, workers=None, target=TARGET_FALSE_ALARMS_PER_DAY):
+    """Backtest grid parameter fusi `current` (lihat `fusion_parameters`) pada semua zona
+
+    Parameter fusi berlaku untuk semua zona, jadi hitungan deteksi dan
+    alarm palsu dijumlahkan antar zona. Setiap (zona, geseran titik tengah)
+    dinilai di process pool; tanpa label insiden tidak ada pool maupun
+    pemuatan pembacaan.
+    """
+    started = time.perf_counter()
+    days = max((end - start).total_seconds() / 86400.0, 1e-9)
+    report = {
+        "start": start.isoformat(timespec="seconds"),
+        "end": end.isoformat(timespec="seconds"),
+        "days": round(days, 2),
+        "target_false_alarms_per_day": target,
+        "scope": BACKTEST_SCOPE,
+        "labels": 0,
+        "incidents": 0,
+        "configurations": 0,
+        "current": None,
+        "recommended": None,
+        "curve": []
+    }
+    labels = load_labels(history, start, end)
+    report["labels"] = sum(len(times) for times in labels.values())
+    if not report["labels"]:
+        report["elapsed_s"] = round(time.perf_counter() - started, 2)
+        return report
+
+    dataset = load_dataset(history, start, end, labels)
+    report["load_s"] = round(time.perf_counter() - started, 2)
+    present = [k for k in range(len(FUSION_SENSOR_NAMES))
+               if any(not np.isnan(values[:, k]).all() for _, values, _ in dataset.values())]
+    if not present:
+        report["elapsed_s"] = round(time.perf_counter() - started, 2)
+        return report
+
+    weights, shifts, pairs = config_grid(present, current)
+    limit = LOG_ODDS_LIMIT - current["prior"]
+    alarm_levels = np.log2([np.log(a / (1.0 - a)) - current["prior"] for a, _ in pairs])
+    clear_levels = np.log2([np.log(c / (1.0 - c)) - current["prior"] for _, c in pairs])
+    centres = np.asarray(current["centres"])
+    scales = np.asarray(current["scales"])
+
+    shape = (len(shifts), len(weights), len(pairs))
+    detected, false_alarms, alarm_ticks = (np.zeros(shape, dtype=np.int64) for _ in range(3))
+    incidents = normal_ticks = 0
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        jobs = []
+        for zone, (times, values, label_times) in dataset.items():
+            starts, ends = incident_segments(times, label_times)
+            incidents += len(starts)
+            for s, shift in enumerate(shifts):
+                future = executor.submit(evaluate_zone, times, values, starts, ends,
+                                         centres + shift * scales, scales, weights,
+                                         current["half_life"], limit, alarm_levels, clear_levels)
+                jobs.append((s, future))
+        for s, future in jobs:
+            zone_detected, zone_false, zone_alarm, zone_normal = future.result()
+            detected[s] += zone_detected
+            false_alarms[s] += zone_false
+            alarm_ticks[s] += zone_alarm
+            if s == 0:
+                normal_ticks += zone_normal
+
+    detection_rate = (detected / incidents if incidents else np.full(shape, np.nan)).ravel()
+    false_per_day = (false_alarms / days).ravel()
+    alarm_fraction = (alarm_ticks / max(normal_ticks, 1)).ravel()
+
+    def summary(i):
+        return dict(describe(weights, shifts, pairs, present, i),
+                    detection_rate=round(float(detection_rate[i]), 4),
+                    false_alarms_per_day=round(float(false_per_day[i]), 3),
+                    alarm_fraction=round(float(alarm_fraction[i]), 4))
+
+    report.update({
+        "zones": sorted(dataset),
+        "samples": int(sum(len(times) for times, _, _ in dataset.values())),
+        "incidents": incidents,
+        "configurations": len(detection_rate),
+        "current": summary(0)
+    })
+    if incidents:
+        report["recommended"] = summary(recommend(detection_rate, false_per_day, alarm_fraction, target))
+        usable = np.flatnonzero(alarm_fraction <= MAX_ALARM_FRACTION)
+        report["curve"] = pareto_curve(lambda i: describe(weights, shifts, pairs, present, usable[i]),
+                                       detection_rate[usable], false_per_day[usable])
+    report["elapsed_s"] = round(time.perf_counter() - started, 2)
+    return report
+
+
+class BackgroundBacktest:
+    """Jalankan backtest berkala di thread latar dan simpan hasil terakhir
+
+    `poll` tidak pernah memblokir: ia memulai backtest baru bila hasil
+    terakhir lebih tua dari `interval` detik dan mengembalikan (hasil
+    terakhir, True jika hasil itu baru sejak poll sebelumnya). Parameter
+    saat ini dibaca dari `fusion` setiap kali backtest dimulai.
+    """
+
+    def __init__(self, history, fusion, days=28, interval=86400.0, workers=None, clock=time.time):
+        self.history = history
+        self.fusion = fusion
+        self.days = days
+        self.interval = interval
+        self.workers = workers
+        self.clock = clock
+        self.result = None
+        self.started = None
+        self._future = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fusion-backtest")
+
+    def poll(self):
+        now = self.clock()
+        fresh = False
+        if self._future is not None and self._future.done():
+            try:
+                self.result = self._future.result()
+                fresh = True
+            except Exception as e:
+                print(f"Error dalam backtest fusi sensor: {str(e)}")
+            self._future = None
+        if self._future is None and (self.started is None or now - self.started >= self.interval):
+            self.started = now
+            end = datetime.fromtimestamp(now)
+            self._future = self._executor.submit(
+                run_backtest, self.history, end - timedelta(days=self.days), end,
+                fusion_parameters(self.fusion), self.workers)
+        return self.result, fresh
+
+
+def main():
+    from detection_history import DetectionHistory
+
+    parser = argparse.ArgumentParser(description="Backtest parameter fusi sensor")
+    parser.add_argument("--history-dir", default="data/history")
+    parser.add_argument("--days", type=float, default=28, help="Panjang riwayat yang diuji (hari)")
+    parser.add_argument("--end", type=datetime.fromisoformat, default=None,
+                        help="Akhir rentang (default sekarang)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--target", type=float, default=TARGET_FALSE_ALARMS_PER_DAY,
+                        help="Target alarm palsu per hari")
+    parser.add_argument("--output", help="Simpan hasil lengkap sebagai JSON")
+    args = parser.parse_args()
+
+    end = args.end or datetime.now()
+    report = run_backtest(DetectionHistory(args.history_dir), end - timedelta(days=args.days), end,
+                          fusion_parameters(ZoneFusion()), args.workers, args.target)
+
+    print(f"Cakupan: {report['scope']}")
+    if not report["labels"]:
+        print("Tidak ada label insiden/bantuan di rentang ini; backtest tidak dijalankan")
+        return 0
+    print(f"{report['configurations']} konfigurasi, {report['days']} hari, {report['incidents']} insiden, "
+          f"{report['elapsed_s']} detik (muat data {report.get('load_s', 0.0)} detik)")
+    for name in ("current", "recommended"):
+        entry = report[name]
+        if entry is None:
+            continue
+        weights = ", ".join(f"{sensor} {weight:g}" for sensor, weight in entry["weights"].items())
+        print(f"{'Saat ini' if name == 'current' else 'Rekomendasi':<12}bobot [{weights}] "
+              f"geser tengah {entry['centre_shift']:+g}, alarm p {entry['alarm_probability']:.2f}, "
+              f"clear p {entry['clear_probability']:.2f}: deteksi {entry['detection_rate']:.1%}, "
+              f"alarm palsu {entry['false_alarms_per_day']:.2f}/hari")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
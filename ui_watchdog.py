@@ -0,0 +1,147 @@
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+from PyQt5.QtCore import QObject, QTimer, QEvent, QCoreApplication
+
+from latency_metrics import LatencyHistogram
+
+_HEARTBEAT_EVENT_TYPE = QEvent.Type(QEvent.registerEventType())
+
+
+class _HeartbeatEvent(QEvent):
+    """Event heartbeat yang diposting dari thread pengawas"""
+
+    def __init__(self, posted_ns):
+        super().__init__(_HEARTBEAT_EVENT_TYPE)
+        self.posted_ns = posted_ns
+
+
+class EventLoopWatchdog(QObject):
+    """Pengawas event loop Qt untuk mendeteksi stall pada thread GUI
+
+    Mengukur drift QTimer dan latensi pengiriman event heartbeat yang
+    diposting dari thread pengawas. Jika thread GUI tidak merespons melebihi
+    ambang batas, stack thread GUI diambil dari thread pengawas dan dicatat.
+    """
+
+    def __init__(self, interval_ms=100, stall_threshold_ms=250, max_stalls=100, parent=None):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.stall_threshold_ms = stall_threshold_ms
+        self.drift = LatencyHistogram()
+        self.delivery = LatencyHistogram()
+        self.stall_durations = LatencyHistogram()
+        self.stalls = deque(maxlen=max_stalls)
+        self.stall_count = 0
+
+        self._lock = threading.Lock()
+        self._main_ident = threading.main_thread().ident
+        self._last_beat_ns = time.perf_counter_ns()
+        self._last_timer_ns = self._last_beat_ns
+        self._pending_stall = None
+        self._paused = False
+        self._stop_event = threading.Event()
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._onTimer)
+        self._thread = threading.Thread(target=self._monitor, name="ui-watchdog", daemon=True)
+
+    def start(self):
+        """Mulai timer heartbeat dan thread pengawas"""
+        self._last_beat_ns = time.perf_counter_ns()
+        self._last_timer_ns = self._last_beat_ns
+        self.timer.start(self.interval_ms)
+        if not self._thread.is_alive():
+            self._thread.start()
+
+    def stop(self):
+        self.timer.stop()
+        self._stop_event.set()
+
+    def pause(self):
+        """Hentikan sementara pengukuran (misalnya saat jendela tersembunyi)"""
+        self._paused = True
+        self.timer.stop()
+        # Thread GUI sedang menjalankan pause, stall yang masih terbuka berakhir di sini
+        with self._lock:
+            self._close_stall(time.perf_counter_ns(), interrupted=True)
+
+    def resume(self):
+        """Lanjutkan pengukuran setelah pause"""
+        with self._lock:
+            now_ns = time.perf_counter_ns()
+            self._close_stall(now_ns, interrupted=True)
+            self._last_beat_ns = now_ns
+            self._last_timer_ns = now_ns
+        self._paused = False
+        self.timer.start(self.interval_ms)
+
+    def _close_stall(self, now_ns, interrupted=False):
+        """Tutup stall yang sedang berjalan dengan durasinya (dipanggil dengan lock)"""
+        stall = self._pending_stall
+        if stall is None:
+            return
+        stall["duration_ms"] = (now_ns - stall["start_ns"]) / 1e6
+        stall["interrupted"] = interrupted
+        self.stall_durations.record_ns(now_ns - stall["start_ns"])
+        self._pending_stall = None
+
+    def _beat(self, now_ns):
+        """Tandai thread GUI masih hidup dan tutup stall yang sedang berjalan"""
+        with self._lock:
+            self._close_stall(now_ns)
+            self._last_beat_ns = now_ns
+
+    def _onTimer(self):
+        now_ns = time.perf_counter_ns()
+        expected_ns = self.interval_ms * 1_000_000
+        self.drift.record_ns(max(0, now_ns - self._last_timer_ns - expected_ns))
+        self._last_timer_ns = now_ns
+        self._beat(now_ns)
+
+    def customEvent(self, event):
+        if event.type() == _HEARTBEAT_EVENT_TYPE:
+            now_ns = time.perf_counter_ns()
+            self.delivery.record_ns(now_ns - event.posted_ns)
+            self._beat(now_ns)
+
+    def _monitor(self):
+        """Loop thread pengawas: posting heartbeat dan sampling stack saat stall"""
+        threshold_ns = self.stall_threshold_ms * 1_000_000
+        while not self._stop_event.wait(self.interval_ms / 1000.0):
+            if self._paused:
+                continue
+            now_ns = time.perf_counter_ns()
+            QCoreApplication.postEvent(self, _HeartbeatEvent(now_ns))
+
+            with self._lock:
+                silent_ns = now_ns - self._last_beat_ns
+                if silent_ns < threshold_ns or self._pending_stall is not None:
+                    continue
+                frame = sys._current_frames().get(self._main_ident)
+                stack = traceback.format_stack(frame) if frame is not None else []
+                stall = {
+                    "timestamp": time.time() - silent_ns / 1e9,
+                    "start_ns": self._last_beat_ns,
+                    "duration_ms": None,
+                    "interrupted": False,
+                    "stack": stack
+                }
+                self._pending_stall = stall
+                self.stalls.append(stall)
+                self.stall_count += 1
+
+    def summary(self):
+        """Ringkasan metrik responsivitas UI"""
+        with self._lock:
+            stalls = list(self.stalls)
+        return {
+            "stall_count": self.stall_count,
+            "timer_drift": self.drift.summary(),
+            "event_delivery": self.delivery.summary(),
+            "stall_duration": self.stall_durations.summary(),
+            "recent_stalls": stalls
+        }
@@ -0,0 +1,156 @@
+import json
+import math
+import time
+
+import numpy as np
+
+DEFAULT_ZONES = ["Depan", "Belakang", "Samping", "Dalam"]
+
+# Waktu paruh skor ancaman zona (detik)
+THREAT_HALF_LIFE = 600.0
+
+
+class Zone:
+    """Satu zona keamanan beserta sensor dan kamera yang terikat padanya"""
+
+    def __init__(self, name, index, sensors=None, cameras=None, roi=None):
+        self.name = name
+        self.index = index
+        self.sensors = list(sensors or [])
+        # Tanpa konfigurasi kamera satu kamera default; daftar kosong berarti zona tanpa kamera
+        self.cameras = list(cameras) if cameras is not None else [f"Kamera Area {name}"]
+        # ROI per kamera: {kamera: (x0, y0, x1, y1)} relatif 0-1 terhadap frame
+        self.roi = dict(roi or {})
+
+
+class ZoneRegistry:
+    """Registry zona dengan binding sensor/kamera dan state per zona dalam array
+
+    State per zona (skor ancaman, jumlah kejadian, waktu kejadian terakhir)
+    disimpan dalam array NumPy yang diindeks nomor zona, sehingga pembaruan
+    dan analisis untuk ratusan zona tetap berupa operasi array.
+    """
+
+    def __init__(self, zones=None, clock=time.time):
+        self.clock = clock
+        self.zones = []
+        self.by_name = {}
+        self.sensor_zone = {}
+        self.threat = np.zeros(0, dtype=np.float32)
+        self.event_count = np.zeros(0, dtype=np.int64)
+        self.last_event = np.zeros(0, dtype=np.float64)
+        self.last_update = np.zeros(0, dtype=np.float64)
+        # Kejadian dari sensor yang tidak terikat ke zona mana pun, di luar state zona
+        self.unassigned_events = 0
+        self.unassigned_sensors = set()
+        for zone in zones if zones is not None else DEFAULT_ZONES:
+            if isinstance(zone, dict):
+                self.add_zone(zone["name"], zone.get("sensors"), zone.get("cameras"), zone.get("roi"))
+            else:
+                self.add_zone(zone)
+
+    @classmethod
+    def from_file(cls, path):
+        """Muat registry dari file JSON: [{"name", "sensors", "cameras", "roi"}, ...]"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.zones)
+
+    def __iter__(self):
+        return iter(self.zones)
+
+    def add_zone(self, name, sensors=None, cameras=None, roi=None):
+        """Tambahkan zona baru dan perbesar array state"""
+        if name in self.by_name:
+            raise ValueError(f"Zona sudah terdaftar: {name}")
+        zone = Zone(name, len(self.zones), sensors, cameras, roi)
+        self.zones.append(zone)
+        self.by_name[name] = zone
+        for sensor in zone.sensors:
+            self.sensor_zone[sensor] = zone.index
+
+        now = self.clock()
+        self.threat = np.append(self.threat, np.float32(0.0))
+        self.event_count = np.append(self.event_count, 0)
+        self.last_event = np.append(self.last_event, 0.0)
+        self.last_update = np.append(self.last_update, now)
+        return zone
+
+    def names(self):
+        return [zone.name for zone in self.zones]
+
+    def index(self, name):
+        """Indeks zona berdasarkan nama, None jika tidak dikenal"""
+        zone = self.by_name.get(name)
+        return zone.index if zone is not None else None
+
+    def zone_for_sensor(self, sensor_id):
+        index = self.sensor_zone.get(sensor_id)
+        return self.zones[index].name if index is not None else None
+
+    def cameras(self):
+        """Daftar (nama zona, id kamera) untuk semua zona"""
+        return [(zone.name, camera) for zone in self.zones for camera in zone.cameras]
+
+    def camera_zones(self):
+        """Zona utama setiap kamera"""
+        zones = {}
+        for zone, camera in self.cameras():
+            zones.setdefault(camera, zone)
+        return zones
+
+    def camera_rois(self):
+        """ROI per kamera untuk motion gate: {kamera: {zona: (x0, y0, x1, y1)}}"""
+        rois = {}
+        for zone in self.zones:
+            for camera, rect in zone.roi.items():
+                rois.setdefault(camera, {})[zone.name] = tuple(rect)
+        return rois
+
+    def _decay(self, indices, now):
+        elapsed = now - self.last_update[indices]
+        self.threat[indices] *= np.exp2(-elapsed / THREAT_HALF_LIFE).astype(np.float32)
+        self.last_update[indices] = now
+
+    def record_events(self, indices, weights=1.0):
+        """Catat kejadian untuk sekumpulan zona sekaligus"""
+        indices = np.asarray(indices, dtype=np.int64)
+        if indices.size == 0:
+            return
+        now = self.clock()
+        self._decay(indices, now)
+        np.add.at(self.threat, indices, np.float32(weights) if np.isscalar(weights)
+                  else np.asarray(weights, dtype=np.float32))
+        np.add.at(self.event_count, indices, 1)
+        self.last_event[indices] = now
+
+    def record_event(self, name, weight=1.0):
+        """Catat kejadian untuk satu zona berdasarkan nama"""
+        index = self.index(name)
+        if index is not None:
+            self.record_events([index], weight)
+
+    def record_unassigned(self, sensors):
+        """Catat kejadian dari sensor tanpa zona tanpa menambah zona ke registry"""
+        self.unassigned_events += 1
+        self.unassigned_sensors.update(sensors)
+
+    def risk_levels(self):
+        """Skor risiko 0-1 per zona dari skor ancaman yang meluruh"""
+        self._decay(np.arange(len(self.zones)), self.clock())
+        return self.threat / (self.threat + 5.0)
+
+    def summary(self):
+        """Ringkasan per zona untuk analisis dan tampilan"""
+        risks = self.risk_levels()
+        now = self.clock()
+        return {
+            zone.name: {
+                "risk_level": float(risks[zone.index]),
+                "events": int(self.event_count[zone.index]),
+                "idle_s": (now - self.last_event[zone.index]) if self.last_event[zone.index] else math.inf
+            }
+            for zone in self.zones
+        }